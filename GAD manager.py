@@ -15,13 +15,26 @@ import subprocess
 import zipfile
 import shutil
 import logging
+import json
+import csv
+import ipaddress
+import shlex
+import threading
+import heapq
+import hashlib
+import string
+import math
+import random
+from bisect import bisect_left, bisect_right
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Optional, Tuple
 from enum import Enum
 from PyQt5.QtWidgets import *
-from PyQt5.QtCore import Qt, QSize, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QFont, QIcon, QPalette, QColor
+from PyQt5.QtCore import Qt, QSize, QObject, QThread, pyqtSignal, QTimer, QRect, QEvent, QAbstractListModel, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QFont, QFontMetrics, QIcon, QKeySequence, QTextCursor, QPalette, QColor, QPainter, QPen
 
 # Konfigūruojame logging
 log_dir = os.path.join(os.path.expanduser("~"), ".gadmanager", "logs")
@@ -353,6 +366,7 @@ class StorageSystem:
     role: str
     rw_status: str
     instance: str
+    copy_percent: Optional[int] = None
 
 @dataclass
 class GADPair:
@@ -361,16 +375,627 @@ class GADPair:
     name: str
     left_storage: StorageSystem
     right_storage: StorageSystem
+    ctg: Optional[str] = None
+
+    @property
+    def pair_id(self) -> str:
+        """Unikalus poros identifikatorius"""
+        return f"{self.group}/{self.name}"
+
+# Operacijos, kurias galima atlikti su pora ar CTG
+PAIR_OPERATIONS = [
+    ("split_vsp1", "Split VSP1"),
+    ("split_vsp2", "Split VSP2"),
+    ("swap_p", "Swap P→S"),
+    ("swap_s", "Swap S→P"),
+    ("resync", "Resync")
+]
+
+# Būsenų kodai laiko eilutėms (255 - nežinoma būsena)
+STATUS_CODES = {'PAIR': 0, 'COPY': 1, 'INIT': 2, 'PSUS': 3, 'SSUS': 4, 'SSWS': 5, 'PSUE': 6}
+STATUS_NAMES = {code: status for status, code in STATUS_CODES.items()}
+UNKNOWN_STATUS_CODE = 255
+
+class PairSeries:
+    """Fiksuoto dydžio žiedinis buferis (laikas, %, būsenos kodas).
+
+    Masyvai auga dvigubėjimu iki capacity, todėl retai kintančios poros
+    užima tik kelis baitus, o atmintis niekada neviršija capacity ribos.
+    """
+    INITIAL_SIZE = 4
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        size = min(self.INITIAL_SIZE, capacity)
+        self.times = array('d', bytes(8 * size))
+        self.percents = array('b', bytes(size))
+        self.statuses = array('B', bytes(size))
+        self.start = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _grow(self):
+        """Padidina masyvus (tik kol buferis dar neapsisukęs, todėl start == 0)"""
+        extra = min(len(self.times), self.capacity - len(self.times))
+        self.times.extend(array('d', bytes(8 * extra)))
+        self.percents.extend(array('b', bytes(extra)))
+        self.statuses.extend(array('B', bytes(extra)))
+
+    def append(self, timestamp: float, percent: Optional[int], status: str):
+        """Prideda įrašą, perrašydamas seniausią kai buferis pilnas - amortizuotai O(1)"""
+        if self.count == len(self.times) and self.count < self.capacity:
+            self._grow()
+        index = (self.start + self.count) % self.capacity
+        self.times[index] = timestamp
+        self.percents[index] = -1 if percent is None else max(0, min(100, percent))
+        self.statuses[index] = STATUS_CODES.get(status, UNKNOWN_STATUS_CODE)
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def clear(self):
+        self.start = 0
+        self.count = 0
+
+    def index(self, i: int) -> int:
+        """Chronologinio indekso i pozicija masyvuose"""
+        if i < 0:
+            i += self.count
+        return (self.start + i) % self.capacity
+
+    def last(self) -> Optional[tuple]:
+        """Grąžina paskutinį įrašą (laikas, %, būsenos kodas)"""
+        if not self.count:
+            return None
+        index = self.index(-1)
+        return self.times[index], self.percents[index], self.statuses[index]
+
+    def __iter__(self):
+        for i in range(self.count):
+            index = (self.start + i) % self.capacity
+            yield self.times[index], self.percents[index], self.statuses[index]
+
+class PairHistory:
+    """Kiekvienos poros pusės būsenų ir % pokyčių laiko eilutės ribotoje atmintyje"""
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.series: Dict[str, PairSeries] = {}
+
+    @staticmethod
+    def series_id(pair: GADPair, side: str) -> str:
+        return f"{pair.pair_id}:{side}"
+
+    def record(self, pairs: List[GADPair], timestamp: Optional[float] = None) -> List[tuple]:
+        """Įrašo pasikeitusius porų pusių taškus; grąžina (laikas, pair_id, pusė, būsena, %) pokyčius"""
+        timestamp = timestamp or time.time()
+        seen = set()
+        changes = []
+        for pair in pairs:
+            for side, storage in (("L", pair.left_storage), ("R", pair.right_storage)):
+                series_id = self.series_id(pair, side)
+                series = self.series.get(series_id)
+                if series is None:
+                    series = self.series[series_id] = PairSeries(self.capacity)
+                # Įrašoma tik pasikeitusi būsena, todėl stabilios poros neužpildo buferio
+                last = series.last()
+                percent = -1 if storage.copy_percent is None else storage.copy_percent
+                if last is None or last[1] != percent or STATUS_NAMES.get(last[2]) != storage.status:
+                    series.append(timestamp, storage.copy_percent, storage.status)
+                    changes.append((timestamp, pair.pair_id, side, storage.status, percent))
+                seen.add(series_id)
+
+        # Nebeegzistuojančių porų eilutės atlaisvinamos
+        for series_id in list(self.series):
+            if series_id not in seen:
+                del self.series[series_id]
+        return changes
+
+    def get(self, pair: GADPair, side: str) -> Optional[PairSeries]:
+        return self.series.get(self.series_id(pair, side))
+
+class SnapshotStore:
+    """Porų būsenų pokyčių žurnalas diske (vienas failas kiekvienam site).
+
+    Eilutė: laikas, pair_id, pusė (L/R), būsena, % (-1 jei nėra), atskirta tabuliacija.
+    Viršijus MAX_BYTES failas pervadinamas į .1, todėl saugomi daugiausiai du failai.
+    """
+    MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def append(self, changes: List[tuple]):
+        if not changes:
+            return
+        lines = "".join(f"{timestamp:.0f}\t{pair_id}\t{side}\t{status}\t{percent}\n"
+                        for timestamp, pair_id, side, status, percent in changes)
+        with self.lock:
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) > self.MAX_BYTES:
+                    os.replace(self.path, self.path + ".1")
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+            except OSError as e:
+                logging.error(f"Failed to write snapshot history: {str(e)}")
+
+    def known_pairs(self) -> List[str]:
+        """Visi žurnale esantys pair_id (pirmo pasirodymo tvarka)"""
+        pair_ids = {}
+        for fields in self._read():
+            pair_ids.setdefault(fields[1], None)
+        return list(pair_ids)
+
+    def load(self, pair_ids: set, since: float = 0) -> Dict[str, List[Tuple[float, str, int]]]:
+        """Grąžina {pair_id:pusė: [(laikas, būsena, %)]}; pirmas taškas - būsena laiku since"""
+        series: Dict[str, List[Tuple[float, str, int]]] = {}
+        before: Dict[str, Tuple[float, str, int]] = {}
+        for fields in self._read():
+            if fields[1] not in pair_ids:
+                continue
+            try:
+                point = (float(fields[0]), fields[3], int(fields[4]))
+            except ValueError:
+                continue
+            key = f"{fields[1]}:{fields[2]}"
+            if point[0] < since:
+                before[key] = point
+            else:
+                series.setdefault(key, []).append(point)
+
+        # Būsena intervalo pradžioje imama iš paskutinio ankstesnio įrašo
+        for key, point in before.items():
+            series.setdefault(key, []).insert(0, (since, point[1], point[2]))
+        return series
+
+    def _read(self):
+        for path in (self.path + ".1", self.path):
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        fields = line.rstrip('\n').split('\t')
+                        if len(fields) == 5:
+                            yield fields
+            except OSError as e:
+                logging.error(f"Failed to read snapshot history: {str(e)}")
+
+class StateTimeline:
+    """Vienos poros pusės būsenų atkarpos ir % taškai, paruošti piešimui"""
+    def __init__(self, points: List[Tuple[float, str, int]], end: float):
+        self.segments = self.run_length(points, end)
+        self.starts = [segment[0] for segment in self.segments]
+        self.percent_runs = self.split_percent_runs(points)
+
+    @staticmethod
+    def run_length(points: List[Tuple[float, str, int]], end: float) -> List[Tuple[float, float, str]]:
+        """Sujungia iš eilės einančias vienodas būsenas į (pradžia, pabaiga, būsena) atkarpas"""
+        segments = []
+        for timestamp, status, _ in points:
+            if segments and segments[-1][2] == status:
+                continue
+            if segments:
+                segments[-1] = (segments[-1][0], timestamp, segments[-1][2])
+            segments.append((timestamp, end, status))
+        return segments
+
+    @staticmethod
+    def split_percent_runs(points: List[Tuple[float, str, int]]) -> List[List[Tuple[float, float]]]:
+        """% taškai, suskaidyti ten, kur % nežinomas"""
+        runs, current = [], []
+        for timestamp, _, percent in points:
+            if percent < 0:
+                if current:
+                    runs.append(current)
+                current = []
+            else:
+                current.append((timestamp, float(percent)))
+        if current:
+            runs.append(current)
+        return runs
+
+    def status_at(self, timestamp: float) -> Optional[str]:
+        index = bisect_right(self.starts, timestamp) - 1
+        if index < 0 or timestamp > self.segments[index][1]:
+            return None
+        return self.segments[index][2]
+
+    def bucket_segments(self, start: float, end: float, buckets: int) -> List[Tuple[int, int, str]]:
+        """Atkarpos pikselių stulpeliuose: siauresnės nei pikselis sujungiamos į blogiausią būseną"""
+        if end <= start or buckets <= 0:
+            return []
+        scale = buckets / (end - start)
+        severity = GADController.STATUS_SEVERITY
+        worst_rank = max(severity.values()) + 1
+        result = []
+        for segment_start, segment_end, status in self.segments:
+            if segment_end < start or segment_start > end:
+                continue
+            x0 = max(0, int((segment_start - start) * scale))
+            x1 = min(buckets, max(x0 + 1, int((segment_end - start) * scale)))
+            if result and result[-1][1] > x0:
+                # Bendri pikseliai atitenka blogesnei būsenai
+                previous_x0, previous_x1, previous_status = result[-1]
+                if severity.get(status, worst_rank) > severity.get(previous_status, worst_rank):
+                    if x0 > previous_x0:
+                        result[-1] = (previous_x0, x0, previous_status)
+                    else:
+                        result.pop()
+                else:
+                    x0 = previous_x1
+                    if x0 >= x1:
+                        continue
+            if result and result[-1][2] == status and result[-1][1] == x0:
+                result[-1] = (result[-1][0], x1, status)
+            else:
+                result.append((x0, x1, status))
+        return result
+
+    def sampled_percents(self, start: float, end: float, threshold: int) -> List[List[Tuple[float, float]]]:
+        """% linijos intervale, sumažintos LTTB iki maždaug threshold taškų"""
+        runs = [[point for point in run if start <= point[0] <= end] for run in self.percent_runs]
+        runs = [run for run in runs if run]
+        total = sum(len(run) for run in runs)
+        return [self.lttb(run, max(3, threshold * len(run) // max(total, 1))) for run in runs]
+
+    @staticmethod
+    def lttb(points: List[Tuple[float, float]], threshold: int) -> List[Tuple[float, float]]:
+        """Largest-Triangle-Three-Buckets: išlaiko vizualiai svarbiausius taškus"""
+        count = len(points)
+        if threshold >= count or threshold < 3:
+            return list(points)
+
+        sampled = [points[0]]
+        every = (count - 2) / (threshold - 2)
+        selected = 0
+        for i in range(threshold - 2):
+            average_start = int((i + 1) * every) + 1
+            average_end = min(int((i + 2) * every) + 1, count)
+            span = points[average_start:average_end] or [points[-1]]
+            average_x = sum(point[0] for point in span) / len(span)
+            average_y = sum(point[1] for point in span) / len(span)
+
+            anchor_x, anchor_y = points[selected]
+            best_area, best = -1.0, int(i * every) + 1
+            for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+                area = abs((anchor_x - average_x) * (points[j][1] - anchor_y) -
+                           (anchor_x - points[j][0]) * (average_y - anchor_y))
+                if area > best_area:
+                    best_area, best = area, j
+            sampled.append(points[best])
+            selected = best
+        sampled.append(points[-1])
+        return sampled
+
+class PairIndex:
+    """Iš anksto sudaryti porų indeksai paieškai ir filtravimui.
+
+    Kiekvienam laukui laikomas žodynas reikšmė -> porų pozicijos ir surūšiuotas
+    reikšmių sąrašas, todėl prefikso atitikmenys randami per bisect.
+    """
+    FIELDS = ('group', 'name', 'serial', 'ldev', 'status', 'rw', 'port', 'ctg')
+    ALIASES = {'g': 'group', 'n': 'name', 'sn': 'serial', 'seq': 'serial',
+               'st': 'status', 'r/w': 'rw', 'host': 'port'}
+    # Laukai, kuriuose ieškoma kai laukas nenurodytas
+    DEFAULT_FIELDS = ('name', 'group')
+
+    def __init__(self, pairs: List[GADPair]):
+        self.size = len(pairs)
+        self.postings: Dict[str, Dict[str, List[int]]] = {field_name: {} for field_name in self.FIELDS}
+        for position, pair in enumerate(pairs):
+            self._add('group', pair.group, position)
+            self._add('name', pair.name, position)
+            if pair.ctg is not None:
+                self._add('ctg', pair.ctg, position)
+            for storage in (pair.left_storage, pair.right_storage):
+                self._add('serial', storage.serial_number, position)
+                self._add('ldev', storage.ldev_number, position)
+                self._add('status', storage.status, position)
+                self._add('rw', storage.rw_status, position)
+                if storage.host:
+                    # (CL8-F-8, 0,   5) -> CL8-F-8
+                    self._add('port', storage.host.strip('()').split(',')[0].strip(), position)
+        self.keys = {field_name: sorted(values) for field_name, values in self.postings.items()}
+
+    def _add(self, field_name: str, value: str, position: int):
+        positions = self.postings[field_name].setdefault(value.lower(), [])
+        # Abi poros pusės dažnai turi tą pačią reikšmę
+        if not positions or positions[-1] != position:
+            positions.append(position)
+
+    def lookup(self, field_name: str, prefix: str) -> set:
+        """Porų pozicijos, kurių lauko reikšmė prasideda prefix"""
+        keys = self.keys[field_name]
+        prefix = prefix.lower()
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + '\uffff', start)
+        postings = self.postings[field_name]
+        result = set()
+        for key in keys[start:end]:
+            result.update(postings[key])
+        return result
+
+    @classmethod
+    def parse_query(cls, query: str) -> List[Tuple[Tuple[str, ...], str]]:
+        """Išskaido užklausą į (laukai, prefiksas) sąlygas; laukas:reikšmė arba laisvas tekstas"""
+        terms = []
+        for token in query.split():
+            field_name, separator, value = token.partition(':')
+            field_name = cls.ALIASES.get(field_name.lower(), field_name.lower())
+            if separator and field_name in cls.FIELDS:
+                if value:
+                    terms.append(((field_name,), value))
+            else:
+                terms.append((cls.DEFAULT_FIELDS, token))
+        return terms
+
+    def search(self, query: str) -> Optional[List[int]]:
+        """Grąžina atitinkančių porų pozicijas didėjimo tvarka (None - filtras tuščias)"""
+        terms = self.parse_query(query)
+        if not terms:
+            return None
+
+        matches = []
+        for fields, value in terms:
+            found = set()
+            for field_name in fields:
+                found |= self.lookup(field_name, value)
+            if not found:
+                return []
+            matches.append(found)
+
+        matches.sort(key=len)
+        result = matches[0]
+        for found in matches[1:]:
+            result = result & found
+        return sorted(result)
 
 class GADController:
     """GAD porų valdymo kontroleris"""
-    def __init__(self):
-        self.pairs = []
-        self.copy_controller = CopyProgress()
+    # Būsenų svarba: didesnė reikšmė - blogesnė būsena
+    STATUS_SEVERITY = {
+        'PAIR': 0,
+        'COPY': 1,
+        'INIT': 1,
+        'PSUS': 2,
+        'SSUS': 2,
+        'SSWS': 3,
+        'PSUE': 4
+    }
+
+    # R/W būsenų svarba: B/B - jokios prieigos
+    RW_SEVERITY = {
+        'L/L': 0,
+        'L/M': 1,
+        'B/B': 2
+    }
 
-    def update_pairs(self, new_pairs: List[GADPair]):
-        """Atnaujina porų informaciją"""
+    # Rūšiavimo stulpeliai: (raktas, pavadinimas)
+    SORT_COLUMNS = [
+        ("order", "Pairdisplay order"),
+        ("worst", "Worst state first"),
+        ("group", "Group"),
+        ("name", "Name"),
+        ("serial", "Serial"),
+        ("ldev", "LDEV"),
+        ("status", "Status"),
+        ("rw", "R/W"),
+        ("port", "Port")
+    ]
+
+    def __init__(self, capacity_cache: Optional['LdevCapacityCache'] = None,
+                 snapshot_store: Optional[SnapshotStore] = None):
+        self.pairs = []
+        self.pair_index: Optional[PairIndex] = None
+        self.ctg_index: Dict[str, List[GADPair]] = {}
+        self.capacity_cache = capacity_cache or LdevCapacityCache(
+            os.path.join(os.path.expanduser("~"), ".gadmanager", "ldev_capacity.json"))
+        self.copy_controller = CopyProgress(capacity_cache=self.capacity_cache)
+        self.history = PairHistory()
+        self.snapshot_store = snapshot_store
+
+    def update_pairs(self, new_pairs: List[GADPair], refreshed: Optional[set] = None):
+        """Atnaujina porų informaciją; refreshed - grupės, kurių būsena ką tik nuskaityta
+        (None - visos). Kitų grupių kopijavimo greičiui nauji taškai neįrašomi."""
         self.pairs = new_pairs
+        # Paieškos indeksas sudaromas tik prireikus
+        self.pair_index = None
+        self.rebuild_ctg_index()
+        self.copy_controller.update_from_pairs(new_pairs, groups=refreshed)
+        changes = self.history.record(new_pairs)
+        if self.snapshot_store is not None:
+            self.snapshot_store.append(changes)
+
+    def merge_groups(self, group_pairs: Dict[str, List[GADPair]]) -> List[str]:
+        """Pakeičia apklaustų grupių porų rinkinius (dingusios poros pašalinamos);
+        grąžina tik tikrai pasikeitusias grupes"""
+        current: Dict[str, List[GADPair]] = {}
+        for pair in self.pairs:
+            current.setdefault(pair.group, []).append(pair)
+        changed = [group for group, pairs in group_pairs.items() if current.get(group, []) != pairs]
+        if changed:
+            self.replace_groups([pair for group in changed for pair in group_pairs[group]], groups=changed)
+        return changed
+
+    def replace_groups(self, group_pairs: List[GADPair], groups: Optional[List[str]] = None):
+        """Pakeičia nurodytų grupių poras, išlaikant grupių tvarką; groups - grupės, kurių
+        poros be group_pairs pašalinamos"""
+        replaced = {group: [] for group in groups or ()}
+        for pair in group_pairs:
+            replaced.setdefault(pair.group, []).append(pair)
+
+        new_pairs = []
+        for pair in self.pairs:
+            if pair.group not in replaced:
+                new_pairs.append(pair)
+            elif replaced[pair.group] is not None:
+                new_pairs.extend(replaced[pair.group])
+                replaced[pair.group] = None
+        new_pairs.extend(p for pairs in replaced.values() if pairs for p in pairs)
+        self.update_pairs(new_pairs, refreshed=set(replaced))
+
+    def rebuild_ctg_index(self):
+        """Sugrupuoja poras pagal CTG"""
+        self.ctg_index = {}
+        for pair in self.pairs:
+            if pair.ctg is not None:
+                self.ctg_index.setdefault(pair.ctg, []).append(pair)
+
+    def get_pair_index(self) -> PairIndex:
+        if self.pair_index is None:
+            self.pair_index = PairIndex(self.pairs)
+        return self.pair_index
+
+    def filter_pairs(self, query: str) -> List[GADPair]:
+        """Grąžina užklausą atitinkančias poras pradine tvarka"""
+        if not query.strip():
+            return self.pairs
+        positions = self.get_pair_index().search(query)
+        if positions is None:
+            return self.pairs
+        return [self.pairs[position] for position in positions]
+
+    def sort_pairs(self, pairs: List[GADPair], column: str) -> List[GADPair]:
+        """Surūšiuoja poras pagal stulpelį (stabiliai, lygios eina pradine tvarka)"""
+        def ldev_number(storage: StorageSystem) -> int:
+            return int(storage.ldev_number) if storage.ldev_number.isdigit() else -1
+
+        keys = {
+            "worst": lambda p: -self.status_severity(self.pair_worst_status(p)),
+            "group": lambda p: p.group,
+            "name": lambda p: p.name,
+            "serial": lambda p: p.left_storage.serial_number,
+            "ldev": lambda p: ldev_number(p.left_storage),
+            "status": lambda p: p.left_storage.status,
+            "rw": lambda p: p.left_storage.rw_status,
+            "port": lambda p: p.left_storage.host
+        }
+        key = keys.get(column)
+        if key is None:
+            return pairs
+        return sorted(pairs, key=key)
+
+    def status_severity(self, status: str) -> int:
+        """Grąžina būsenos svarbą (nežinoma būsena laikoma blogiausia)"""
+        return self.STATUS_SEVERITY.get(status, max(self.STATUS_SEVERITY.values()) + 1)
+
+    def pair_worst_status(self, pair: GADPair) -> str:
+        """Grąžina blogesnę iš abiejų poros pusių būsenų"""
+        return max(pair.left_storage.status, pair.right_storage.status,
+                   key=self.status_severity)
+
+    @staticmethod
+    def get_available_operations(pair: GADPair) -> set:
+        """Nustato kurios operacijos galimos esamoje poros būsenoje"""
+        left, right = pair.left_storage, pair.right_storage
+        operations = set()
+
+        is_synchronized = left.status == 'PAIR' and right.status == 'PAIR'
+        if is_synchronized:
+            operations.update({"split_vsp1", "split_vsp2"})
+            if left.role == 'P-VOL' and right.role == 'S-VOL':
+                operations.add("swap_p")
+            if left.role == 'S-VOL' and right.role == 'P-VOL':
+                operations.add("swap_s")
+
+        can_resync = (
+            (right.role == 'S-VOL' and right.status == 'SSWS' and
+             left.role == 'P-VOL' and left.status == 'PSUS') or
+            (left.role == 'S-VOL' and left.status == 'SSWS' and
+             right.role == 'P-VOL' and right.status == 'PSUS') or
+            (left.role == 'P-VOL' and left.status == 'PSUS' and
+             right.role == 'S-VOL' and right.status == 'SSUS') or
+            (right.status == 'SSWS' and right.role == 'P-VOL' and
+             left.status == 'PSUS' and left.role == 'S-VOL')
+        )
+        if can_resync:
+            operations.add("resync")
+
+        return operations
+
+    def rw_severity(self, rw_status: str) -> int:
+        """Grąžina R/W būsenos svarbą (nežinoma laikoma blogiausia)"""
+        return self.RW_SEVERITY.get(rw_status, max(self.RW_SEVERITY.values()) + 1)
+
+    def get_group_summaries(self, pairs: List[GADPair]) -> Dict[str, dict]:
+        """Apskaičiuoja kiekvienos grupės būsenų suvestinę vienu praėjimu (grupių tvarka išlaikoma)"""
+        summaries = {}
+        for pair in pairs:
+            summary = summaries.get(pair.group)
+            if summary is None:
+                summary = summaries[pair.group] = {
+                    'group': pair.group,
+                    'pairs': 0,
+                    'counts': {},
+                    'worst_status': None,
+                    'worst_rw': None
+                }
+            summary['pairs'] += 1
+            status = self.pair_worst_status(pair)
+            summary['counts'][status] = summary['counts'].get(status, 0) + 1
+            if (summary['worst_status'] is None or
+                    self.status_severity(status) > self.status_severity(summary['worst_status'])):
+                summary['worst_status'] = status
+            for rw_status in (pair.left_storage.rw_status, pair.right_storage.rw_status):
+                if summary['worst_rw'] is None or self.rw_severity(rw_status) > self.rw_severity(summary['worst_rw']):
+                    summary['worst_rw'] = rw_status
+        return summaries
+
+    def get_ctg_summary(self, ctg: str) -> dict:
+        """Apskaičiuoja CTG būsenų suvestinę"""
+        pairs = self.ctg_index.get(ctg, [])
+        counts = {}
+        worst = None
+        for pair in pairs:
+            status = self.pair_worst_status(pair)
+            counts[status] = counts.get(status, 0) + 1
+            if worst is None or self.status_severity(status) > self.status_severity(worst):
+                worst = status
+        return {
+            'ctg': ctg,
+            'pairs': len(pairs),
+            'groups': sorted({pair.group for pair in pairs}),
+            'counts': counts,
+            'worst_status': worst
+        }
+
+    def get_ctg_operations(self, ctg: str) -> set:
+        """Operacijos, galimos visoms CTG poroms vienu metu"""
+        pairs = self.ctg_index.get(ctg, [])
+        if not pairs:
+            return set()
+        operations = self.get_available_operations(pairs[0])
+        for pair in pairs[1:]:
+            operations &= self.get_available_operations(pair)
+            if not operations:
+                break
+        return operations
+
+    def get_ctg_command(self, ctg: str, operation: str) -> str:
+        """Generuoja CTG komandas: po vieną kiekvienai grupei, kurioje yra CTG porų"""
+        pairs = self.ctg_index.get(ctg, [])
+        if not pairs:
+            return f"# CTG {ctg} not found"
+        if operation not in self.get_ctg_operations(ctg):
+            return f"# Cannot perform {operation} on CTG {ctg} - not all pairs are in a valid state"
+
+        # CCI komanda su -g apima visas grupės poras, todėl užtenka vienos poros grupei
+        representatives = {}
+        for pair in pairs:
+            representatives.setdefault(pair.group, pair)
+
+        lines = [f"# CTG {ctg}: {len(pairs)} pairs in {len(representatives)} group(s)"]
+        if len(representatives) > 1:
+            # CCI komandos adresuoja grupę, ne CTG, todėl vienos komandos visam CTG nėra
+            lines.append("# CCI has no single command for a CTG that spans several groups - run one per group")
+        for pair in representatives.values():
+            lines.append(self.get_command_for_operation(pair, operation))
+        return "\n".join(lines)
         
     def get_command_for_operation(self, pair: GADPair, operation: str) -> str:
         """Generuoja komandą pagal operacijos tipą"""
@@ -384,55 +1009,262 @@ class GADController:
         return commands.get(operation, "Unknown command")
 
     def get_resync_command(self, pair: GADPair) -> str:
-        """Generuoja resync komandą"""
+        """Generuoja resync komandą (per grupę aprašančias instancijas)"""
+        left, right = pair.left_storage.instance, pair.right_storage.instance
         if (pair.right_storage.role == 'S-VOL' and
             pair.right_storage.status == 'SSWS' and
             pair.left_storage.role == 'P-VOL' and
             pair.left_storage.status == 'PSUS'):
-            return (f"pairresync -g {pair.group} -swaps -IH20\n"
-                   f"pairresync -g {pair.group} -swaps -IH10")
+            return (f"pairresync -g {pair.group} -swaps {right}\n"
+                   f"pairresync -g {pair.group} -swaps {left}")
         elif (pair.left_storage.role == 'S-VOL' and
               pair.left_storage.status == 'SSWS' and
               pair.right_storage.role == 'P-VOL' and
               pair.right_storage.status == 'PSUS'):
-            return (f"pairresync -g {pair.group} -swaps -IH10\n"
-                   f"pairresync -g {pair.group} -IH10")
+            return (f"pairresync -g {pair.group} -swaps {left}\n"
+                   f"pairresync -g {pair.group} {left}")
         elif (pair.left_storage.role == 'P-VOL' and
               pair.left_storage.status == 'PSUS' and
               pair.right_storage.role == 'S-VOL' and
               pair.right_storage.status == 'SSUS'):
-            return f"pairresync -g {pair.group} -IH10"
+            return f"pairresync -g {pair.group} {left}"
         else:
             return "# Cannot perform resync - invalid pair state"
 
+class RaidcomLdevParser:
+    """raidcom get ldev -ldev_id ... išvesties analizatorius"""
+    LINE_PATTERN = re.compile(r'^\s*([\w#()/]+)\s*:\s*(.*?)\s*$')
+    BLOCK_SIZE = 512
+
+    def parse(self, text: str, require_capacity: bool = True) -> List[dict]:
+        """Grąžina LDEV sąrašą: serial, ldev (dešimtainis), capacity_bytes, name"""
+        required = {'serial', 'ldev', 'capacity_bytes'} if require_capacity else {'serial', 'ldev'}
+        ldevs = []
+        current = {}
+        for line in text.splitlines():
+            match = self.LINE_PATTERN.match(line)
+            if not match:
+                continue
+            key, value = match.groups()
+            if key == 'Serial#':
+                # Kiekvienas LDEV blokas prasideda Serial# eilute
+                self._finish(current, ldevs, required)
+                current = {'serial': value}
+            elif key == 'LDEV' and value:
+                current['ldev'] = value.split()[0]
+            elif key == 'LDEV_NAMING':
+                current['name'] = value
+            elif key == 'VOL_Capacity(BLK)' and value.isdigit():
+                current['capacity_bytes'] = int(value) * self.BLOCK_SIZE
+            elif key == 'VOL_Capacity(MB)' and value.isdigit() and 'capacity_bytes' not in current:
+                current['capacity_bytes'] = int(value) * 1024 ** 2
+            elif key == 'VOL_Capacity(GB)' and 'capacity_bytes' not in current:
+                try:
+                    current['capacity_bytes'] = int(float(value) * 1024 ** 3)
+                except ValueError:
+                    pass
+        self._finish(current, ldevs, required)
+        return ldevs
+
+    @staticmethod
+    def _finish(current: dict, ldevs: list, required: set):
+        if required <= current.keys():
+            ldev = current['ldev']
+            # raidcom gali rodyti LDEV ir CU:LDEV formatu (pvz. 00:1A)
+            if ':' in ldev:
+                cu, number = ldev.split(':', 1)
+                ldev = str(int(cu, 16) * 256 + int(number, 16))
+            current['ldev'] = ldev
+            ldevs.append(current)
+
+class LdevCapacityCache:
+    """LDEV talpų podėlis pagal (serial, LDEV), saugomas diske"""
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.capacities: Dict[Tuple[str, str], int] = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.capacities = {tuple(key.split('/', 1)): value for key, value in data.items()}
+        except Exception as e:
+            logging.error(f"Failed to load LDEV capacity cache: {str(e)}", exc_info=True)
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            data = {f"{serial}/{ldev}": value for (serial, ldev), value in self.capacities.items()}
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except Exception as e:
+            logging.error(f"Failed to save LDEV capacity cache: {str(e)}", exc_info=True)
+
+    def get(self, serial: str, ldev: str) -> Optional[int]:
+        return self.capacities.get((serial, ldev))
+
+    def update_from_text(self, text: str) -> int:
+        """Įkelia talpas iš raidcom išvesties, grąžina įkeltų LDEV skaičių"""
+        ldevs = RaidcomLdevParser().parse(text)
+        with self.lock:
+            for ldev in ldevs:
+                self.capacities[(ldev['serial'], ldev['ldev'])] = ldev['capacity_bytes']
+        if ldevs:
+            self.save()
+        return len(ldevs)
+
+    def missing_commands(self, pairs: List[GADPair]) -> List[str]:
+        """raidcom komandos LDEV, kurių talpa dar nežinoma"""
+        commands = []
+        for pair in pairs:
+            for storage in (pair.left_storage, pair.right_storage):
+                if self.get(storage.serial_number, storage.ldev_number) is None:
+                    commands.append(f"raidcom get ldev -ldev_id {storage.ldev_number} {storage.instance}")
+        return list(dict.fromkeys(commands))
+
 class CopyProgress:
-    """Klasė kopijavimo progreso valdymui"""
-    def __init__(self):
+    """Kopijavimo greičio (EWMA) ir pabaigos laiko vertinimas"""
+    COPY_STATUSES = ('COPY', 'INIT')
+
+    def __init__(self, window: int = 20, alpha: float = 0.3, capacity_cache=None):
+        self.window = window
+        self.alpha = alpha
+        self.capacity_cache = capacity_cache
         self.progress = {}
 
-    def update_progress(self, pair_id: str, progress: int):
+    def update_from_pairs(self, pairs: List[GADPair], now: Optional[datetime] = None,
+                          groups: Optional[set] = None):
+        """Įrašo % reikšmes iš pairdisplay analizės rezultatų.
+
+        groups - tik šių grupių poros ką tik nuskaitytos. Kitų grupių poroms taškas laiku now
+        su nepakitusiu % įrašytų 0 %/s greitį į EWMA, todėl jos praleidžiamos.
+        """
+        now = now or datetime.now()
+        seen = set()
+        present = set()
+        for pair in pairs:
+            if groups is not None and pair.group not in groups:
+                present.add(pair.pair_id)
+                continue
+            storages = (pair.left_storage, pair.right_storage)
+            if not any(s.status in self.COPY_STATUSES for s in storages):
+                continue
+            percents = [s.copy_percent for s in storages if s.copy_percent is not None]
+            if not percents:
+                continue
+            seen.add(pair.pair_id)
+            self.update_progress(pair.pair_id, min(percents), group=pair.group, now=now)
+            pvol = pair.right_storage if pair.right_storage.role == 'P-VOL' else pair.left_storage
+            self.progress[pair.pair_id]['capacity_key'] = (pvol.serial_number, pvol.ldev_number)
+
+        # Poros, kurios baigė kopijuoti arba dingo iš išvesties
+        for pair_id, entry in list(self.progress.items()):
+            if pair_id in seen:
+                continue
+            if groups is None or entry['group'] in groups or pair_id not in present:
+                del self.progress[pair_id]
+
+    def update_progress(self, pair_id: str, progress: int, group: str = "", now: Optional[datetime] = None):
         """Atnaujina kopijavimo progresą konkrečiai porai"""
-        self.progress[pair_id] = {
-            'progress': progress,
-            'time': datetime.now()
-        }
+        now = now or datetime.now()
+        entry = self.progress.get(pair_id)
+        if entry is None or progress < entry['progress']:
+            # Nauja arba iš naujo pradėta kopija
+            entry = {'group': group, 'samples': PairSeries(self.window), 'rate': None}
+            self.progress[pair_id] = entry
+
+        samples = entry['samples']
+        if samples:
+            last_time, last_progress, _ = samples.last()
+            elapsed = now.timestamp() - last_time
+            if elapsed <= 0:
+                return
+            rate = (progress - last_progress) / elapsed
+            entry['rate'] = rate if entry['rate'] is None else (
+                self.alpha * rate + (1 - self.alpha) * entry['rate'])
+
+        samples.append(now.timestamp(), progress, 'COPY')
+        entry['progress'] = progress
+        entry['time'] = now
+
+    def get_rate(self, pair_id: str) -> Optional[float]:
+        """Grąžina kopijavimo greitį %/s"""
+        entry = self.progress.get(pair_id)
+        if entry is None or len(entry['samples']) < 2:
+            return None
+        return entry['rate']
 
     def get_estimated_end_time(self, pair_id: str) -> Optional[datetime]:
         """Apskaičiuoja numatomą kopijavimo pabaigos laiką"""
-        if pair_id not in self.progress:
+        rate = self.get_rate(pair_id)
+        if not rate or rate <= 0:
             return None
 
         current = self.progress[pair_id]
-        if len(self.progress) < 2:
+        remaining_progress = 100 - current['progress']
+        return current['time'] + timedelta(seconds=remaining_progress / rate)
+
+    def _estimate(self, pair_ids: List[str]) -> Optional[dict]:
+        """Bendras porų rinkinio greitis ir ETA.
+
+        Jei visų porų talpa žinoma, likutis ir greitis skaičiuojami baitais,
+        kitaip - procentais (kiekviena pora vienodo svorio).
+        """
+        entries = [(pair_id, self.progress[pair_id]) for pair_id in pair_ids]
+        if not entries:
             return None
 
-        rate = current['progress'] / (datetime.now() - current['time']).seconds
-        remaining_progress = 100 - current['progress']
+        capacities = [self.capacity_cache.get(*e['capacity_key'])
+                      if self.capacity_cache and e.get('capacity_key') else None
+                      for _, e in entries]
+        # None - talpa nežinoma; 0 yra tikra (tuščio LDEV) talpa
+        weighted = all(capacity is not None for capacity in capacities) and sum(capacities) > 0
+        weights = capacities if weighted else [100] * len(entries)
+
+        remaining = sum(w * (100 - e['progress']) / 100 for w, (_, e) in zip(weights, entries))
+        throughput = sum(w * max(self.get_rate(pair_id) or 0, 0) / 100
+                         for w, (pair_id, _) in zip(weights, entries))
+        last_time = max(e['time'] for _, e in entries)
+        return {
+            'pairs': len(entries),
+            'weighted': weighted,
+            'remaining_bytes': remaining if weighted else None,
+            'throughput_mbps': throughput / 1024 ** 2 if weighted else None,
+            'estimated_end_time': last_time + timedelta(seconds=remaining / throughput)
+                                  if throughput > 0 else None
+        }
 
-        if rate > 0:
-            remaining_time = remaining_progress / rate
-            return datetime.now() + timedelta(seconds=remaining_time)
-        return None
+    def _group_pair_ids(self) -> Dict[str, List[str]]:
+        groups = {}
+        for pair_id, entry in self.progress.items():
+            groups.setdefault(entry['group'], []).append(pair_id)
+        return groups
+
+    def get_group_estimate(self, group: str) -> Optional[dict]:
+        """Grupės ETA pagal bendrą greitį (įskaitant eilėje laukiančias poras)"""
+        return self._estimate(self._group_pair_ids().get(group, []))
+
+    def get_group_estimates(self) -> Dict[str, dict]:
+        """Visų kopijuojamų grupių ETA vienu praėjimu"""
+        return {group: self._estimate(pair_ids) for group, pair_ids in self._group_pair_ids().items()}
+
+    def get_site_estimate(self) -> Optional[dict]:
+        """Viso site (visų kopijuojamų porų) ETA"""
+        return self._estimate(list(self.progress))
+
+    def get_group_estimated_end_time(self, group: str) -> Optional[datetime]:
+        estimate = self.get_group_estimate(group)
+        return estimate['estimated_end_time'] if estimate else None
+
+    def get_copying_groups(self) -> List[str]:
+        """Grupės, kuriose vyksta kopijavimas"""
+        return sorted({e['group'] for e in self.progress.values()})
 
     def get_copy_status(self, pair_id: str) -> dict:
         """Gauna detalią kopijavimo būsenos informaciją"""
@@ -440,6 +1272,7 @@ class CopyProgress:
             return {
                 'status': 'UNKNOWN',
                 'progress': 0,
+                'rate': None,
                 'estimated_end_time': None
             }
 
@@ -447,9 +1280,59 @@ class CopyProgress:
         return {
             'status': 'COPYING' if progress < 100 else 'COMPLETED',
             'progress': progress,
+            'rate': self.get_rate(pair_id),
             'estimated_end_time': self.get_estimated_end_time(pair_id)
         }
 
+class SparklineWidget(QWidget):
+    """Mažas % ir būsenų istorijos grafikas, piešiamas tiesiai iš žiedinio buferio"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.series: Optional[PairSeries] = None
+        self.setFixedHeight(18)
+        self.setMinimumWidth(60)
+
+    def set_series(self, series: Optional[PairSeries]):
+        self.series = series
+        visible = series is not None and len(series) > 1
+        if self.isHidden() == visible:
+            self.setVisible(visible)
+        self.update()
+
+    def paintEvent(self, event):
+        series = self.series
+        if series is None or len(series) < 2:
+            return
+
+        painter = QPainter(self)
+        width, height = self.width(), self.height()
+        count = len(series)
+        step = width / (count - 1)
+        band = 3
+
+        # Būsenų juosta apačioje
+        for i in range(count):
+            index = series.index(i)
+            status = STATUS_NAMES.get(series.statuses[index], '')
+            painter.fillRect(int(i * step), height - band, max(1, int(step) + 1), band,
+                             QColor(ProStyle.STATUS_COLORS.get(status, '#9da5b4')))
+
+        # % linija
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(QColor(ProStyle.STATUS_COLORS['COPY']), 1))
+        plot_height = height - band - 2
+        previous = None
+        for i in range(count):
+            percent = series.percents[series.index(i)]
+            if percent < 0:
+                previous = None
+                continue
+            point = (i * step, 1 + plot_height * (1 - percent / 100))
+            if previous:
+                painter.drawLine(int(previous[0]), int(previous[1]), int(point[0]), int(point[1]))
+            previous = point
+        painter.end()
+
 class StorageView(QFrame):
     """Saugyklos informacijos atvaizdavimo komponentas"""
     def __init__(self, storage_num, storage: StorageSystem = None):
@@ -464,17 +1347,17 @@ class StorageView(QFrame):
 
         # Header
         self.header = QLabel(f"VSP {num}")
-        self.header.setStyleSheet("font-size: 13px; font-weight: bold; color: #1a1f36;")
+        self.header.setProperty("role", "subtitle")
         layout.addWidget(self.header, 0, 0, 1, 2)
 
         # Status indicators
         self.status = QLabel("● PAIR")
-        self.status.setStyleSheet(f"color: {ProStyle.STATUS_COLORS['PAIR']}; font-weight: 500;")
+        ProStyle.set_state(self.status, role="status", state="PAIR")
         layout.addWidget(self.status, 1, 0)
 
         # Latest data indicator
         self.latest_data = QLabel()
-        self.latest_data.setStyleSheet("font-weight: bold; color: #00875a;")
+        self.latest_data.setProperty("role", "latest")
         layout.addWidget(self.latest_data, 1, 1, Qt.AlignRight)
 
         # Info grid
@@ -482,17 +1365,22 @@ class StorageView(QFrame):
         self.values = {}
         info_fields = ["LDEV:", "Role:", "R/W:", "Instance:"]
 
-        for row, field in enumerate(info_fields, start=2):
-            label = QLabel(field)
-            label.setStyleSheet("color: #666;")
+        for row, info_field in enumerate(info_fields, start=2):
+            label = QLabel(info_field)
+            label.setProperty("role", "muted")
             value = QLabel("-")
-            value.setStyleSheet("color: #1a1f36; font-weight: 500;")
+            value.setProperty("role", "rw" if info_field == "R/W:" else "value")
 
             layout.addWidget(label, row, 0)
             layout.addWidget(value, row, 1)
 
-            self.labels[field] = label
-            self.values[field] = value
+            self.labels[info_field] = label
+            self.values[info_field] = value
+
+        # Būsenų ir % istorija
+        self.sparkline = SparklineWidget()
+        self.sparkline.setVisible(False)
+        layout.addWidget(self.sparkline, len(info_fields) + 2, 0, 1, 2)
 
         if self.storage:
             self.update_storage(self.storage)
@@ -522,9 +1410,8 @@ class StorageView(QFrame):
         self.header.setText(f"VSP ({storage.serial_number})")
 
         # Atnaujina statusą su spalva
-        status_color = ProStyle.STATUS_COLORS.get(storage.status, '#666')
         self.status.setText(f"● {storage.status}")
-        self.status.setStyleSheet(f"color: {status_color}; font-weight: 500;")
+        ProStyle.set_state(self.status, state=storage.status)
 
         # Atnaujina "Latest Data" indikatorių
         has_latest = self.determine_latest_data(storage)
@@ -533,21 +1420,24 @@ class StorageView(QFrame):
                 self.latest_data.setText("✓ Synced Data")
             else:
                 self.latest_data.setText("✓ Latest Data")
-            self.latest_data.setVisible(True)
-        else:
-            self.latest_data.setVisible(False)
+        # setVisible kviečiamas tik pasikeitus, nes jis perskaičiuoja išdėstymą
+        if self.latest_data.isHidden() == has_latest:
+            self.latest_data.setVisible(has_latest)
 
         # Atnaujina kitus laukus
         self.values["LDEV:"].setText(storage.ldev_number)
         self.values["Role:"].setText(storage.role)
 
         # R/W statusas su spalva
-        rw_color = ProStyle.RW_STATUS_COLORS.get(storage.rw_status, '#666')
         self.values["R/W:"].setText(storage.rw_status)
-        self.values["R/W:"].setStyleSheet(f"color: {rw_color}; font-weight: 500;")
+        ProStyle.set_state(self.values["R/W:"], state=storage.rw_status)
 
         self.values["Instance:"].setText(storage.instance)
 
+    def set_history(self, series: Optional[PairSeries]):
+        """Nustato šios pusės istorijos eilutę sparkline grafikui"""
+        self.sparkline.set_series(series)
+
 class GadPairPanel(QFrame):
     """GAD poros valdymo panelis"""
     def __init__(self, pair: GADPair = None):
@@ -562,9 +1452,15 @@ class GadPairPanel(QFrame):
 
         # Header with pair name
         self.header = QLabel(self.pair.name if self.pair else "GAD Pair")
-        self.header.setStyleSheet("font-size: 14px; font-weight: bold; color: #1a1f36;")
+        self.header.setProperty("role", "title")
         layout.addWidget(self.header)
 
+        # Kopijavimo progresas (rodomas tik COPY/INIT poroms)
+        self.copy_label = QLabel()
+        ProStyle.set_state(self.copy_label, role="status", state="COPY")
+        self.copy_label.setVisible(False)
+        layout.addWidget(self.copy_label)
+
         # Storage views in horizontal layout
         storage_layout = QHBoxLayout()
         storage_layout.setSpacing(4)
@@ -579,17 +1475,11 @@ class GadPairPanel(QFrame):
         self.button_layout.setSpacing(2)
         self.buttons = {}
 
-        button_configs = [
-            ("split_vsp1", "Split VSP1"),
-            ("split_vsp2", "Split VSP2"),
-            ("swap_p", "Swap P→S"),
-            ("swap_s", "Swap S→P"),
-            ("resync", "Resync")
-        ]
-
-        for btn_id, text in button_configs:
+        for btn_id, text in PAIR_OPERATIONS:
             btn = QPushButton(text)
             btn.setEnabled(False)
+            btn.setProperty("role", "action")
+            btn.setProperty("active", False)
             self.buttons[btn_id] = btn
             self.button_layout.addWidget(btn)
 
@@ -606,107 +1496,1102 @@ class GadPairPanel(QFrame):
         self.right_storage.update_storage(pair.right_storage)
         self.update_button_states()
 
+    def set_history(self, history: PairHistory):
+        """Prijungia abiejų pusių istorijos eilutes"""
+        if not self.pair:
+            return
+        self.left_storage.set_history(history.get(self.pair, "L"))
+        self.right_storage.set_history(history.get(self.pair, "R"))
+
+    def set_copy_status(self, copy_status: dict):
+        """Parodo kopijavimo progresą ir numatomą pabaigos laiką"""
+        if copy_status['status'] != 'COPYING':
+            if not self.copy_label.isHidden():
+                self.copy_label.setVisible(False)
+            return
+
+        text = f"Copy progress: {copy_status['progress']}%"
+        if copy_status['rate']:
+            text += f"  ({copy_status['rate'] * 60:.2f} %/min)"
+        eta = copy_status['estimated_end_time']
+        text += f"  ETA: {eta.strftime('%Y-%m-%d %H:%M')}" if eta else "  ETA: calculating..."
+        self.copy_label.setText(text)
+        if self.copy_label.isHidden():
+            self.copy_label.setVisible(True)
+
     def update_button_states(self):
         if not self.pair:
             return
 
-        # Reset buttons
-        for btn in self.buttons.values():
-            btn.setEnabled(False)
-            btn.setProperty("class", "")
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #f7f9fc;
-                    border: 1px solid #d0d5dd;
-                    border-radius: 4px;
-                    color: #344054;
-                    padding: 6px 12px;
-                    font-weight: 500;
-                }
-                QPushButton:hover {
-                    background-color: #ffffff;
-                    border-color: #9da5b4;
-                }
-            """)
+        # Stilius keičiamas tik per dinamines savybes, kai būsena pasikeičia
+        available = GADController.get_available_operations(self.pair)
+        for btn_id, btn in self.buttons.items():
+            enabled = btn_id in available
+            btn.setEnabled(enabled)
+            ProStyle.set_state(btn, active=enabled)
 
-        # Check pair synchronization state
-        is_synchronized = (
-            self.pair.left_storage.status == 'PAIR' and
-            self.pair.right_storage.status == 'PAIR'
-        )
+class PairListModel(QAbstractListModel):
+    """Plokščias GAD porų modelis virtualizuotam sąrašui"""
+    PairRole = Qt.UserRole + 1
 
-        # Split buttons
-        if is_synchronized:
-            self.buttons["split_vsp1"].setEnabled(True)
-            self.buttons["split_vsp2"].setEnabled(True)
-            self._set_active_button_style(self.buttons["split_vsp1"])
-            self._set_active_button_style(self.buttons["split_vsp2"])
-
-        # Swap buttons
-        can_swap_p_to_s = (is_synchronized and
-                          self.pair.left_storage.role == 'P-VOL' and
-                          self.pair.right_storage.role == 'S-VOL')
-        can_swap_s_to_p = (is_synchronized and
-                          self.pair.left_storage.role == 'S-VOL' and
-                          self.pair.right_storage.role == 'P-VOL')
-
-        if can_swap_p_to_s:
-            self.buttons["swap_p"].setEnabled(True)
-            self._set_active_button_style(self.buttons["swap_p"])
-        if can_swap_s_to_p:
-            self.buttons["swap_s"].setEnabled(True)
-            self._set_active_button_style(self.buttons["swap_s"])
-
-        # Resync button
-        can_resync = (
-            (self.pair.right_storage.role == 'S-VOL' and
-             self.pair.right_storage.status == 'SSWS' and
-             self.pair.left_storage.role == 'P-VOL' and
-             self.pair.left_storage.status == 'PSUS') or
-            (self.pair.left_storage.role == 'S-VOL' and
-             self.pair.left_storage.status == 'SSWS' and
-             self.pair.right_storage.role == 'P-VOL' and
-             self.pair.right_storage.status == 'PSUS') or
-            (self.pair.left_storage.role == 'P-VOL' and
-             self.pair.left_storage.status == 'PSUS' and
-             self.pair.right_storage.role == 'S-VOL' and
-             self.pair.right_storage.status == 'SSUS') or
-            (self.pair.right_storage.status == 'SSWS' and
-             self.pair.right_storage.role == 'P-VOL' and
-             self.pair.left_storage.status == 'PSUS' and
-             self.pair.left_storage.role == 'S-VOL')
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pairs: List[GADPair] = []
+
+    def set_pairs(self, pairs: List[GADPair]):
+        self.beginResetModel()
+        self.pairs = list(pairs)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.pairs)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.pairs):
+            return None
+        pair = self.pairs[index.row()]
+        if role == self.PairRole:
+            return pair
+        if role == Qt.DisplayRole:
+            return f"{pair.group} - {pair.name}"
+        if role == Qt.ToolTipRole:
+            return self.tooltip(pair)
+        return None
+
+    @staticmethod
+    def tooltip(pair: GADPair) -> str:
+        return (f"{pair.group} - {pair.name}\n"
+                f"VSP {pair.left_storage.serial_number}: {pair.left_storage.ldev_number} "
+                f"{pair.left_storage.role} {pair.left_storage.status} {pair.left_storage.rw_status}\n"
+                f"VSP {pair.right_storage.serial_number}: {pair.right_storage.ldev_number} "
+                f"{pair.right_storage.role} {pair.right_storage.status} {pair.right_storage.rw_status}")
+
+class PairItemDelegate(QStyledItemDelegate):
+    """Piešia poros eilutę ir jos mygtukus be atskirų widget'ų"""
+    operation_clicked = pyqtSignal(object, str)
+
+    ROW_HEIGHT = 52
+    NAME_WIDTH = 240
+    SIDE_WIDTH = 320
+    BUTTON_WIDTH = 100
+    BUTTON_HEIGHT = 26
+
+    def __init__(self, controller: GADController, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self.pressed = None
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(self.NAME_WIDTH + 2 * self.SIDE_WIDTH + len(PAIR_OPERATIONS) * self.BUTTON_WIDTH,
+                     self.ROW_HEIGHT)
+
+    def button_rects(self, rect: QRect) -> List[Tuple[str, str, QRect]]:
+        """Mygtukų vietos eilutėje"""
+        x = rect.left() + self.NAME_WIDTH + 2 * self.SIDE_WIDTH
+        y = rect.top() + (rect.height() - self.BUTTON_HEIGHT) // 2
+        rects = []
+        for btn_id, text in PAIR_OPERATIONS:
+            rects.append((btn_id, text, QRect(x, y, self.BUTTON_WIDTH - 4, self.BUTTON_HEIGHT)))
+            x += self.BUTTON_WIDTH
+        return rects
+
+    def paint(self, painter: QPainter, option, index):
+        pair = index.data(PairListModel.PairRole)
+        if pair is None:
+            return
+
+        painter.save()
+        rect = option.rect.adjusted(4, 2, -4, -2)
+        background = QColor("#eef4ff") if option.state & QStyle.State_Selected else QColor("white")
+        painter.fillRect(rect, background)
+        painter.setPen(QColor("#e4e7ec"))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+
+        # Poros pavadinimas ir kopijavimo progresas
+        painter.setPen(QColor("#1a1f36"))
+        bold = QFont(option.font)
+        bold.setBold(True)
+        painter.setFont(bold)
+        name_rect = QRect(rect.left() + 8, rect.top() + 4, self.NAME_WIDTH - 12, 20)
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         QFontMetrics(bold).elidedText(pair.name, Qt.ElideRight, name_rect.width()))
+        painter.setFont(option.font)
+        painter.setPen(QColor("#666"))
+        sub_text = pair.group + (f"  CTG {pair.ctg}" if pair.ctg else "")
+        copy_status = self.controller.copy_controller.get_copy_status(pair.pair_id)
+        if copy_status['status'] == 'COPYING':
+            sub_text += f"  {copy_status['progress']}%"
+        painter.drawText(QRect(rect.left() + 8, rect.top() + 24, self.NAME_WIDTH - 12, 20),
+                         Qt.AlignLeft | Qt.AlignVCenter, sub_text)
+
+        # Abiejų pusių informacija
+        x = rect.left() + self.NAME_WIDTH
+        for storage in (pair.left_storage, pair.right_storage):
+            self.paint_storage(painter, option, QRect(x, rect.top(), self.SIDE_WIDTH - 8, rect.height()), storage)
+            x += self.SIDE_WIDTH
+
+        # Mygtukai
+        available = GADController.get_available_operations(pair)
+        for btn_id, text, btn_rect in self.button_rects(rect):
+            enabled = btn_id in available
+            painter.fillRect(btn_rect, QColor("#0052cc" if enabled else "#f7f9fc"))
+            painter.setPen(QColor("#0052cc" if enabled else "#d0d5dd"))
+            painter.drawRect(btn_rect.adjusted(0, 0, -1, -1))
+            painter.setPen(QColor("white" if enabled else "#9da5b4"))
+            if enabled and self.pressed == (index.row(), btn_id):
+                painter.fillRect(btn_rect, QColor("#0747a6"))
+                painter.setPen(QColor("white"))
+            painter.drawText(btn_rect, Qt.AlignCenter, text)
+
+        painter.restore()
+
+    def paint_storage(self, painter: QPainter, option, rect: QRect, storage: StorageSystem):
+        """Piešia vienos VSP pusės būseną"""
+        status_color = QColor(ProStyle.STATUS_COLORS.get(storage.status, '#666'))
+        rw_color = QColor(ProStyle.RW_STATUS_COLORS.get(storage.rw_status, '#666'))
+
+        painter.setPen(QColor("#1a1f36"))
+        header = f"VSP ({storage.serial_number})  LDEV {storage.ldev_number}  {storage.role}"
+        painter.drawText(QRect(rect.left(), rect.top() + 4, rect.width(), 20), Qt.AlignLeft | Qt.AlignVCenter,
+                         option.fontMetrics.elidedText(header, Qt.ElideRight, rect.width()))
+
+        painter.setPen(status_color)
+        painter.drawText(QRect(rect.left(), rect.top() + 24, 90, 20), Qt.AlignLeft | Qt.AlignVCenter,
+                         f"● {storage.status}")
+        painter.setPen(rw_color)
+        painter.drawText(QRect(rect.left() + 90, rect.top() + 24, 60, 20), Qt.AlignLeft | Qt.AlignVCenter,
+                         storage.rw_status)
+        painter.setPen(QColor("#666"))
+        painter.drawText(QRect(rect.left() + 150, rect.top() + 24, rect.width() - 150, 20),
+                         Qt.AlignLeft | Qt.AlignVCenter, storage.instance)
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        """Apdoroja nupieštų mygtukų paspaudimus"""
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return False
+        pair = index.data(PairListModel.PairRole)
+        if pair is None:
+            return False
+
+        rect = option.rect.adjusted(4, 2, -4, -2)
+        hit = next((btn_id for btn_id, _, btn_rect in self.button_rects(rect)
+                    if btn_rect.contains(event.pos())), None)
+        if hit is None or hit not in GADController.get_available_operations(pair):
+            self.pressed = None
+            return False
+
+        if event.type() == QEvent.MouseButtonPress:
+            self.pressed = (index.row(), hit)
+        else:
+            if self.pressed == (index.row(), hit):
+                self.operation_clicked.emit(pair, hit)
+            self.pressed = None
+        return True
+
+class PairListView(QListView):
+    """Virtualizuotas porų sąrašas: piešiamos tik matomos eilutės"""
+    def __init__(self, controller: GADController, parent=None):
+        super().__init__(parent)
+        self.pair_model = PairListModel(self)
+        self.delegate = PairItemDelegate(controller, self)
+        self.setModel(self.pair_model)
+        self.setItemDelegate(self.delegate)
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setFrameShape(QFrame.NoFrame)
+
+    def set_pairs(self, pairs: List[GADPair]):
+        self.pair_model.set_pairs(pairs)
+
+    def scroll_to_pair(self, pair_id: str) -> bool:
+        """Pažymi porą ir paslenka sąrašą iki jos"""
+        for row, pair in enumerate(self.pair_model.pairs):
+            if pair.pair_id == pair_id:
+                index = self.pair_model.index(row)
+                self.setCurrentIndex(index)
+                self.scrollTo(index, QAbstractItemView.PositionAtCenter)
+                return True
+        return False
+
+class PairHeatMap(QWidget):
+    """Visų porų būsenų žemėlapis: viena ląstelė - viena pora, piešiama vienu praėjimu"""
+    pair_clicked = pyqtSignal(object)
+
+    CELL = 10
+    GAP = 2
+    HEADER_HEIGHT = 18
+    MARGIN = 8
+
+    def __init__(self, controller: GADController, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self.grouping = "group"
+        self.source_pairs: List[GADPair] = []
+        self.pairs: List[GADPair] = []
+        self.colors: List[QColor] = []
+        self.section_ranges: List[Tuple[str, int, int]] = []
+        self.sections: List[Tuple[str, int, int, int]] = []
+        self.section_tops: List[int] = []
+        self.columns = 1
+        self.setMouseTracking(True)
+
+    def set_grouping(self, grouping: str):
+        """Grupavimas pagal grupę ('group') arba P-VOL masyvą ('array')"""
+        self.grouping = grouping
+        self.set_pairs(self.source_pairs)
+
+    def section_key(self, pair: GADPair) -> str:
+        if self.grouping == "array":
+            pvol = pair.right_storage if pair.right_storage.role == 'P-VOL' else pair.left_storage
+            return f"VSP {pvol.serial_number}"
+        return pair.group
+
+    def set_pairs(self, pairs: List[GADPair]):
+        self.source_pairs = pairs
+        sections = {}
+        for pair in pairs:
+            sections.setdefault(self.section_key(pair), []).append(pair)
+
+        self.pairs = []
+        self.section_ranges = []
+        for title, members in sections.items():
+            self.section_ranges.append((title, len(self.pairs), len(members)))
+            self.pairs.extend(members)
+
+        # Spalvos apskaičiuojamos iš anksto, kad piešimas būtų tik fillRect
+        palette = {}
+        self.colors = []
+        for pair in self.pairs:
+            status = self.controller.pair_worst_status(pair)
+            color = palette.get(status)
+            if color is None:
+                color = palette[status] = QColor(ProStyle.STATUS_COLORS.get(status, '#9da5b4'))
+            self.colors.append(color)
+
+        self.relayout()
+        self.update()
+
+    def relayout(self):
+        """Apskaičiuoja sekcijų padėtis pagal dabartinį plotį"""
+        pitch = self.CELL + self.GAP
+        self.columns = max(1, (self.width() - 2 * self.MARGIN + self.GAP) // pitch)
+        top = self.MARGIN
+        self.sections = []
+        self.section_tops = []
+        for title, first, count in self.section_ranges:
+            self.sections.append((title, first, count, top))
+            self.section_tops.append(top)
+            rows = (count + self.columns - 1) // self.columns
+            top += self.HEADER_HEIGHT + rows * pitch + self.GAP
+        self.setMinimumHeight(top + self.MARGIN)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        pitch = self.CELL + self.GAP
+        if max(1, (self.width() - 2 * self.MARGIN + self.GAP) // pitch) != self.columns:
+            self.relayout()
+
+    def paintEvent(self, event):
+        if not self.sections:
+            return
+        painter = QPainter(self)
+        clip = event.rect()
+        pitch = self.CELL + self.GAP
+        columns = self.columns
+        painter.setPen(QColor("#1a1f36"))
+
+        # Piešiamos tik matomos sekcijos ir eilutės
+        start = max(0, bisect_right(self.section_tops, clip.top()) - 1)
+        for title, first, count, top in self.sections[start:]:
+            if top > clip.bottom():
+                break
+            painter.drawText(QRect(self.MARGIN, top, self.width() - 2 * self.MARGIN, self.HEADER_HEIGHT),
+                             Qt.AlignLeft | Qt.AlignVCenter, f"{title} ({count})")
+            cells_top = top + self.HEADER_HEIGHT
+            rows = (count + columns - 1) // columns
+            first_row = max(0, (clip.top() - cells_top) // pitch)
+            last_row = min(rows - 1, (clip.bottom() - cells_top) // pitch)
+            for row in range(first_row, last_row + 1):
+                y = cells_top + row * pitch
+                offset = first + row * columns
+                for column in range(min(columns, count - row * columns)):
+                    painter.fillRect(self.MARGIN + column * pitch, y, self.CELL, self.CELL,
+                                     self.colors[offset + column])
+        painter.end()
+
+    def pair_at(self, x: int, y: int) -> Optional[GADPair]:
+        """Grąžina porą, kurios ląstelė yra taške (x, y)"""
+        section = bisect_right(self.section_tops, y) - 1
+        if section < 0:
+            return None
+        title, first, count, top = self.sections[section]
+        pitch = self.CELL + self.GAP
+        x -= self.MARGIN
+        y -= top + self.HEADER_HEIGHT
+        if x < 0 or y < 0 or x % pitch >= self.CELL or y % pitch >= self.CELL:
+            return None
+        column, row = x // pitch, y // pitch
+        index = row * self.columns + column
+        if column >= self.columns or index >= count:
+            return None
+        return self.pairs[first + index]
+
+    def mouseMoveEvent(self, event):
+        pair = self.pair_at(event.pos().x(), event.pos().y())
+        if pair is None:
+            QToolTip.hideText()
+        else:
+            QToolTip.showText(event.globalPos(), PairListModel.tooltip(pair), self)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            pair = self.pair_at(event.pos().x(), event.pos().y())
+            if pair is not None:
+                self.pair_clicked.emit(pair)
+
+class TimelineWidget(QWidget):
+    """Porų būsenų laiko juosta: po eilutę kiekvienai porai (viršuje VSP1, apačioje VSP2)"""
+    LABEL_WIDTH = 220
+    ROW_HEIGHT = 30
+    AXIS_HEIGHT = 22
+    MARGIN = 8
+    TICKS = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows: List[Tuple[str, Optional[StateTimeline], Optional[StateTimeline]]] = []
+        self.start = 0.0
+        self.end = 0.0
+        # Eilučių atkarpos ir % taškai, sumažinti iki esamo pločio
+        self.cache: Dict[Tuple[int, int], tuple] = {}
+        self.colors: Dict[str, QColor] = {}
+        self.setMouseTracking(True)
+
+    def set_rows(self, rows: List[Tuple[str, Optional[StateTimeline], Optional[StateTimeline]]],
+                 start: float, end: float):
+        self.rows = rows
+        self.start = start
+        self.end = end
+        self.cache = {}
+        self.setMinimumHeight(self.AXIS_HEIGHT + len(rows) * self.ROW_HEIGHT + self.MARGIN)
+        self.update()
+
+    def plot_width(self) -> int:
+        return max(1, self.width() - self.LABEL_WIDTH - self.MARGIN)
+
+    def color(self, status: str) -> QColor:
+        color = self.colors.get(status)
+        if color is None:
+            color = self.colors[status] = QColor(ProStyle.STATUS_COLORS.get(status, '#9da5b4'))
+        return color
+
+    def row_geometry(self, row: int, width: int) -> tuple:
+        key = (row, width)
+        geometry = self.cache.get(key)
+        if geometry is None:
+            _, left, right = self.rows[row]
+            geometry = tuple(
+                None if timeline is None else
+                (timeline.bucket_segments(self.start, self.end, width),
+                 timeline.sampled_percents(self.start, self.end, width))
+                for timeline in (left, right))
+            self.cache[key] = geometry
+        return geometry
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.cache = {}
+
+    def paintEvent(self, event):
+        if not self.rows or self.end <= self.start:
+            return
+        painter = QPainter(self)
+        clip = event.rect()
+        width = self.plot_width()
+        span = self.end - self.start
+        scale = width / span
+
+        # Laiko ašis
+        painter.setPen(QColor("#666"))
+        time_format = '%m-%d %H:%M' if span > 2 * 86400 else '%H:%M'
+        for tick in range(self.TICKS + 1):
+            x = self.LABEL_WIDTH + int(width * tick / self.TICKS)
+            label = datetime.fromtimestamp(self.start + span * tick / self.TICKS).strftime(time_format)
+            align = Qt.AlignLeft if tick == 0 else Qt.AlignRight if tick == self.TICKS else Qt.AlignHCenter
+            left = x if tick == 0 else x - 100 if tick == self.TICKS else x - 50
+            painter.drawText(QRect(left, 0, 100, self.AXIS_HEIGHT), align | Qt.AlignVCenter, label)
+            painter.drawLine(x, self.AXIS_HEIGHT - 4, x, self.AXIS_HEIGHT)
+
+        # Piešiamos tik matomos eilutės
+        band = (self.ROW_HEIGHT - 6) // 2
+        first = max(0, (clip.top() - self.AXIS_HEIGHT) // self.ROW_HEIGHT)
+        last = min(len(self.rows) - 1, (clip.bottom() - self.AXIS_HEIGHT) // self.ROW_HEIGHT)
+        percent_pen = QPen(QColor("#1a1f36"), 1)
+        for row in range(first, last + 1):
+            y = self.AXIS_HEIGHT + row * self.ROW_HEIGHT
+            label = self.rows[row][0]
+            painter.setPen(QColor("#1a1f36"))
+            painter.drawText(QRect(0, y, self.LABEL_WIDTH - 6, self.ROW_HEIGHT), Qt.AlignRight | Qt.AlignVCenter,
+                             self.fontMetrics().elidedText(label, Qt.ElideLeft, self.LABEL_WIDTH - 6))
+
+            for side, geometry in enumerate(self.row_geometry(row, width)):
+                if geometry is None:
+                    continue
+                segments, percent_runs = geometry
+                band_y = y + 2 + side * (band + 1)
+                for x0, x1, status in segments:
+                    painter.fillRect(self.LABEL_WIDTH + x0, band_y, x1 - x0, band, self.color(status))
+
+                # % linija per visą eilutės aukštį
+                painter.setPen(percent_pen)
+                plot_height = 2 * band
+                for run in percent_runs:
+                    previous = None
+                    for timestamp, percent in run:
+                        point = (self.LABEL_WIDTH + int((timestamp - self.start) * scale),
+                                 y + 2 + int(plot_height * (1 - percent / 100)))
+                        if previous:
+                            painter.drawLine(previous[0], previous[1], point[0], point[1])
+                        previous = point
+        painter.end()
+
+    def mouseMoveEvent(self, event):
+        row = (event.pos().y() - self.AXIS_HEIGHT) // self.ROW_HEIGHT
+        x = event.pos().x() - self.LABEL_WIDTH
+        if not self.rows or row < 0 or row >= len(self.rows) or x < 0 or self.end <= self.start:
+            QToolTip.hideText()
+            return
+        timestamp = self.start + (self.end - self.start) * x / self.plot_width()
+        label, left, right = self.rows[row]
+        lines = [label, datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')]
+        for name, timeline in (("VSP1", left), ("VSP2", right)):
+            status = timeline.status_at(timestamp) if timeline else None
+            lines.append(f"{name}: {status or '-'}")
+        QToolTip.showText(event.globalPos(), "\n".join(lines), self)
+
+class CTGSummaryPanel(QFrame):
+    """Consistency grupės (CTG) suvestinės ir operacijų panelis"""
+    def __init__(self, summary: dict, operations: set):
+        super().__init__()
+        self.summary = None
+        self.operations = None
+        self.init_ui()
+        self.update_summary(summary, operations)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(4)
+        layout.setContentsMargins(8, 4, 8, 4)
+
+        self.header = QLabel()
+        self.header.setProperty("role", "title")
+        layout.addWidget(self.header)
+
+        # Būsenų suvestinė ir blogiausia būsena
+        info_layout = QHBoxLayout()
+        self.worst_label = QLabel()
+        self.worst_label.setProperty("role", "status")
+        info_layout.addWidget(self.worst_label)
+
+        self.counts_label = QLabel()
+        self.counts_label.setProperty("role", "muted")
+        info_layout.addWidget(self.counts_label)
+        info_layout.addStretch(1)
+        layout.addLayout(info_layout)
+
+        # CTG lygio operacijos
+        button_layout = QHBoxLayout()
+        button_layout.setSpacing(2)
+        self.buttons = {}
+        for btn_id, text in PAIR_OPERATIONS:
+            btn = QPushButton(f"CTG {text}")
+            btn.setProperty("role", "action")
+            self.buttons[btn_id] = btn
+            button_layout.addWidget(btn)
+        layout.addLayout(button_layout)
+
+    def update_summary(self, summary: dict, operations: set):
+        """Atnaujina suvestinę tik jei ji pasikeitė"""
+        if summary == self.summary and operations == self.operations:
+            return
+        self.summary = summary
+        self.operations = operations
+
+        groups = ", ".join(summary['groups'])
+        self.header.setText(f"CTG {summary['ctg']} - {groups} ({summary['pairs']} pairs)")
+
+        worst = summary['worst_status'] or '-'
+        self.worst_label.setText(f"Worst: ● {worst}")
+        ProStyle.set_state(self.worst_label, state=worst)
+
+        self.counts_label.setText("   ".join(f"{status}: {count}" for status, count
+                                            in sorted(summary['counts'].items())))
+
+        for btn_id, btn in self.buttons.items():
+            enabled = btn_id in operations
+            btn.setEnabled(enabled)
+            ProStyle.set_state(btn, active=enabled)
+
+class GroupSummaryPanel(QFrame):
+    """Vienos grupės suvestinės eilutė; porų paneliai kuriami tik išskleidus"""
+    toggled = pyqtSignal(str, bool)
+
+    def __init__(self, summary: dict, expanded: bool = False):
+        super().__init__()
+        self.group = summary['group']
+        self.summary = None
+        self.pair_panels: Dict[str, GadPairPanel] = {}
+        self.init_ui(expanded)
+        self.update_summary(summary)
+
+    def init_ui(self, expanded: bool):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(4)
+        layout.setContentsMargins(8, 4, 8, 4)
+
+        header_layout = QHBoxLayout()
+        self.expand_button = QToolButton()
+        self.expand_button.setCheckable(True)
+        self.expand_button.setChecked(expanded)
+        self.expand_button.setArrowType(Qt.DownArrow if expanded else Qt.RightArrow)
+        self.expand_button.setAutoRaise(True)
+        self.expand_button.toggled.connect(self.on_toggled)
+        header_layout.addWidget(self.expand_button)
+
+        self.header = QLabel()
+        self.header.setProperty("role", "title")
+        header_layout.addWidget(self.header)
+
+        self.worst_label = QLabel()
+        self.worst_label.setProperty("role", "status")
+        header_layout.addWidget(self.worst_label)
+
+        self.rw_label = QLabel()
+        self.rw_label.setProperty("role", "rw")
+        header_layout.addWidget(self.rw_label)
+
+        self.counts_label = QLabel()
+        self.counts_label.setProperty("role", "muted")
+        header_layout.addWidget(self.counts_label)
+        header_layout.addStretch(1)
+        layout.addLayout(header_layout)
+
+        # Porų paneliai
+        self.body = QWidget()
+        self.pairs_layout = QVBoxLayout(self.body)
+        self.pairs_layout.setSpacing(4)
+        self.pairs_layout.setContentsMargins(16, 0, 0, 0)
+        self.body.setVisible(expanded)
+        layout.addWidget(self.body)
+
+    def is_expanded(self) -> bool:
+        return self.expand_button.isChecked()
+
+    def on_toggled(self, expanded: bool):
+        self.expand_button.setArrowType(Qt.DownArrow if expanded else Qt.RightArrow)
+        self.body.setVisible(expanded)
+        self.toggled.emit(self.group, expanded)
+
+    def update_summary(self, summary: dict):
+        """Atnaujina suvestinę tik jei ji pasikeitė"""
+        if summary == self.summary:
+            return
+        self.summary = summary
+
+        self.header.setText(f"{summary['group']} ({summary['pairs']} pairs)")
+        worst = summary['worst_status'] or '-'
+        self.worst_label.setText(f"Worst: ● {worst}")
+        ProStyle.set_state(self.worst_label, state=worst)
+        worst_rw = summary['worst_rw'] or '-'
+        self.rw_label.setText(f"R/W: {worst_rw}")
+        ProStyle.set_state(self.rw_label, state=worst_rw)
+        self.counts_label.setText("   ".join(f"{status}: {count}" for status, count
+                                            in sorted(summary['counts'].items())))
+
+    def clear_pairs(self):
+        """Atlaisvina suskleistos grupės porų panelius"""
+        for panel in self.pair_panels.values():
+            self.pairs_layout.removeWidget(panel)
+            panel.deleteLater()
+        self.pair_panels = {}
+
+class PairdisplayParser:
+    """pairdisplay -CLI išvesties analizatorius (be UI priklausomybių)"""
+    STATUSES = ['PAIR', 'PSUS', 'SSUS', 'SSWS', 'PSUE', 'COPY', 'INIT']
+    # LDEV#.P/S Status Fence , % P-LDEV# M CTG
+    COLUMNS_PATTERN = re.compile(r'\d+\.[PS]-VOL\s+\w+\s+\w+\s*,\s*(\S+)\s+\S+\s+\S+\s+(\S+)')
+    SMPL_PATTERN = re.compile(r'\d+\.SMPL\b')
+
+    def __init__(self, log=None):
+        self.log = log or (lambda msg: None)
+
+    def parse(self, text: str, instances: Tuple[str, str] = ('-IH10', '-IH20'),
+              reversed_sides: bool = False) -> List[GADPair]:
+        """instances - VSP1 ir VSP2 instancijos; reversed_sides - išvestis gauta per VSP2 instanciją,
+        todėl (L) eilutė yra VSP2 pusė"""
+        lines = [line.strip() for line in text.split('\n') 
+              if line.strip() and not line.startswith('Group')]
+        
+        pairs = []
+        for i in range(0, len(lines), 2):
+            if i + 1 >= len(lines):
+                break
+                
+            left_line = lines[i]
+            right_line = lines[i + 1]
+            # Ištrinta pora (SMPL) nebėra GAD pora
+            if self.SMPL_PATTERN.search(left_line) and self.SMPL_PATTERN.search(right_line):
+                continue
+            if reversed_sides:
+                left_line, right_line = right_line, left_line
+            
+            try:
+                match = re.match(r'(\w+)\s+([\w_]+)', lines[i])
+                group, name = match.groups()
+                
+                left_serial = re.search(r'(\d{6})', left_line).group(1)
+                right_serial = re.search(r'(\d{6})', right_line).group(1)
+                
+                left_ldev = re.search(r'(\d+)\.(P|S)-VOL', left_line)
+                right_ldev = re.search(r'(\d+)\.(P|S)-VOL', right_line)
+                
+                left_status = next(s for s in left_line.split() if s in self.STATUSES)
+                right_status = next(s for s in right_line.split() if s in self.STATUSES)
+                
+                left_rw = re.search(r'([BL]/[BLM])', left_line).group(1)
+                right_rw = re.search(r'([BL]/[BLM])', right_line).group(1)
+
+                left_storage = StorageSystem(
+                    serial_number=left_serial,
+                    host=self._extract_port_info(left_line) or '',
+                    ldev_number=left_ldev.group(1),
+                    status=left_status, 
+                    role=f"{left_ldev.group(2)}-VOL",
+                    rw_status=left_rw,
+                    instance=instances[0],
+                    copy_percent=self._extract_percent(left_line)
+                )
+
+                right_storage = StorageSystem(
+                    serial_number=right_serial,
+                    host=self._extract_port_info(right_line) or '',
+                    ldev_number=right_ldev.group(1),
+                    status=right_status,
+                    role=f"{right_ldev.group(2)}-VOL",
+                    rw_status=right_rw,
+                    instance=instances[1],
+                    copy_percent=self._extract_percent(right_line)
+                )
+
+                pairs.append(GADPair(group=group, name=name,
+                         left_storage=left_storage, right_storage=right_storage,
+                         ctg=self._extract_ctg(lines[i])))
+                
+            except Exception as e:
+                raise ValueError(f"Parsing error: {str(e)}\nLeft: {left_line}\nRight: {right_line}")
+
+        return pairs
+
+    HEADER = ("Group   PairVol(L/R) (Port#,TID, LU),Seq#,LDEV#.P/S,Status,Fence,   %,P-LDEV# M CTG JID AP EM"
+              "       E-Seq# E-LDEV# R/W QM DM P PR CS D_Status ST ELV PGID           CT(s) LUT")
+
+    @classmethod
+    def format_pairs(cls, pairs: List[GADPair], reversed_sides: bool = False) -> str:
+        """Suformuoja poras pairdisplay -CLI formatu (naudojama simuliacijai).
+        reversed_sides - kaip per VSP2 instanciją: (L) eilutė yra VSP2 pusė"""
+        lines = [cls.HEADER]
+        for pair in pairs:
+            local, remote = ((pair.right_storage, pair.left_storage) if reversed_sides
+                             else (pair.left_storage, pair.right_storage))
+            sides = (("L", local, remote), ("R", remote, local))
+            for side, storage, partner in sides:
+                port = storage.host or "(CL1-A-0, 0,   0)"
+                lines.append(
+                    f"{pair.group}    {pair.name}({side}) {port}{storage.serial_number}  "
+                    f"{storage.ldev_number}.{storage.role} {storage.status} NEVER ,  "
+                    f"{storage.copy_percent if storage.copy_percent is not None else 100}  "
+                    f"{partner.ldev_number} -   {pair.ctg or '-'}   0  4  -            -       - "
+                    f"{storage.rw_status} -  D  N D   3 -         - -      -               - -"
+                )
+        return "\n".join(lines)
+
+    def _extract_ctg(self, line: str) -> Optional[str]:
+        """Ištraukia CTG stulpelį ('-' reiškia, kad pora nepriklauso CTG)"""
+        match = self.COLUMNS_PATTERN.search(line)
+        if not match or match.group(2) == '-':
+            return None
+        return match.group(2)
+
+    def _extract_percent(self, line: str) -> Optional[int]:
+        """Ištraukia kopijavimo % stulpelį"""
+        match = self.COLUMNS_PATTERN.search(line)
+        if not match or not match.group(1).isdigit():
+            return None
+        return int(match.group(1))
+
+    def _extract_port_info(self, line: str) -> str:
+        start = line.find('(CL')
+        if start == -1:
+            self.log("CL port start mark not found")
+            return None
+        end = line.find(')', start)
+        if end == -1:
+            self.log("Port end mark not found")
+            return None
+        port_info = line[start:end+1]
+        self.log(f"Extracted port info: {port_info}")
+        return port_info
+
+class CCIRunner:
+    """Vykdo CCI komandas lokaliame arba per ssh nutolusiame HORCM serveryje"""
+    def __init__(self, timeout: int = 120, host: str = ""):
+        self.timeout = timeout
+        self.host = host
+
+    def argv(self, command: str) -> List[str]:
+        if self.host:
+            # Komandą išskaido nutolusio serverio apvalkalas
+            return ['ssh', '-o', 'BatchMode=yes', self.host, command]
+        return shlex.split(command, posix=(os.name != 'nt'))
+
+    def run(self, command: str) -> Tuple[int, str]:
+        """Įvykdo vieną komandą ir grąžina (return code, išvestis)"""
+        logging.info(f"CCI{' @' + self.host if self.host else ''}: {command}")
+        try:
+            result = subprocess.run(
+                self.argv(command),
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+            )
+            return result.returncode, result.stdout + result.stderr
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logging.error(f"CCI command failed: {command}: {str(e)}")
+            return -1, str(e)
+
+@dataclass
+class SiteConnection:
+    """Site HORCM serveris (tuščias - lokalus) ir jo VSP1/VSP2 instancijos"""
+    host: str = ""
+    primary_instance: int = 10
+    secondary_instance: int = 20
+
+    @property
+    def instances(self) -> Tuple[str, str]:
+        return f"-IH{self.primary_instance}", f"-IH{self.secondary_instance}"
+
+    def describe(self) -> str:
+        return f"{self.host or 'local'} -IH{self.primary_instance}/-IH{self.secondary_instance}"
+
+    @property
+    def site_id(self) -> str:
+        """Stabilus unikalus site raktas (pvz. istorijos failui): serveris ir instancijos.
+        Maiša atskiria serverius, kurių vardai sutampa pakeitus neleistinus simbolius"""
+        host = self.host.lower()
+        digest = hashlib.sha1(f"{host}|{self.primary_instance}|{self.secondary_instance}".encode()).hexdigest()
+        readable = re.sub(r'[^\w.-]', '_', host or 'local')
+        return f"{readable}-{self.primary_instance}-{self.secondary_instance}-{digest[:8]}"
+
+    def conflicts_with(self, other: 'SiteConnection') -> bool:
+        """Ar abu site naudotų tą pačią HORCM instanciją"""
+        return (self.host.lower() == other.host.lower() and
+                bool({self.primary_instance, self.secondary_instance} &
+                     {other.primary_instance, other.secondary_instance}))
+
+    def runner(self, timeout: int = 120) -> CCIRunner:
+        return CCIRunner(timeout=timeout, host=self.host)
+
+class FakeCCI:
+    """CCI simuliatorius orkestravimo bandymams be tikrų masyvų.
+    Instancijos pusė nustatoma pagal porų instancijas; pairdisplay išvestis orientuota kaip tikros komandos"""
+
+    RAIDQRY_OUTPUT = ("No  Group    Hostname     HORCM_ver   Uid   Serial#   Micro_ver     Cache(MB)\n"
+                      " 1  ---   localhost  01-50-03/00   0   811111  90-08-01/00   1048576\n")
+
+    def __init__(self, pairs: List[GADPair], latency: float = 0.0, fail_groups: Optional[set] = None,
+                 jitter: float = 0.0):
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_groups = set(fail_groups or ())
+        self.history = []
+        self.groups: Dict[str, List[GADPair]] = {}
+        self.instance_sides: Dict[str, str] = {}
+        for pair in pairs:
+            self.instance_sides.setdefault(pair.left_storage.instance, 'left')
+            self.instance_sides.setdefault(pair.right_storage.instance, 'right')
+            copied = GADPair(
+                group=pair.group,
+                name=pair.name,
+                left_storage=StorageSystem(**vars(pair.left_storage)),
+                right_storage=StorageSystem(**vars(pair.right_storage)),
+                ctg=pair.ctg
+            )
+            self.groups.setdefault(pair.group, []).append(copied)
+
+    def run(self, command: str) -> Tuple[int, str]:
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+        tokens = command.split()
+        if tokens and tokens[0] == 'raidqry':
+            with self.lock:
+                self.history.append(command)
+            return 0, self.RAIDQRY_OUTPUT
+        if '-g' not in tokens or tokens.index('-g') + 1 >= len(tokens):
+            return 1, f"Invalid command: {command}"
+        group = tokens[tokens.index('-g') + 1]
+        instance = next((t for t in tokens if t.startswith('-IH')), None)
+        side = self.instance_sides.get(instance)
+
+        with self.lock:
+            self.history.append(command)
+            pairs = self.groups.get(group)
+            if pairs is None:
+                return 239, f"[EX_ENOGRP] No such group: {group}"
+            if side is None or instance not in (pairs[0].left_storage.instance, pairs[0].right_storage.instance):
+                return 239, f"[EX_ENOGRP] Group {group} is not defined in instance {instance}"
+            if tokens[0] == 'pairdisplay':
+                return 0, PairdisplayParser.format_pairs(pairs, reversed_sides=(side == 'right'))
+            if group in self.fail_groups:
+                return 1, f"[EX_CMDRJE] Command rejected for group {group}"
+
+            for pair in pairs:
+                local = pair.left_storage if side == 'left' else pair.right_storage
+                remote = pair.right_storage if side == 'left' else pair.left_storage
+                if tokens[0] == 'pairsplit' and '-RS' in tokens:
+                    local.status, local.rw_status = 'SSWS', 'L/L'
+                    remote.status, remote.rw_status = 'PSUS', 'B/B'
+                elif tokens[0] == 'pairsplit':
+                    pvol, svol = (local, remote) if local.role == 'P-VOL' else (remote, local)
+                    pvol.status, pvol.rw_status = 'PSUS', 'L/L'
+                    svol.status, svol.rw_status = 'SSUS', 'B/B'
+                elif tokens[0] == 'pairresync':
+                    if '-swaps' in tokens:
+                        local.role, remote.role = 'P-VOL', 'S-VOL'
+                    for storage in (local, remote):
+                        storage.status, storage.rw_status = 'PAIR', 'L/L'
+                else:
+                    return 1, f"Unsupported command: {tokens[0]}"
+            return 0, ""
+
+@dataclass
+class FailoverStep:
+    """Vienos grupės failover žingsnis"""
+    stage: int
+    group: str
+    target: str
+    operation: str
+    commands: List[str]
+    verify_command: str
+    arrays: Tuple[str, ...]
+    # VSP1 ir VSP2 instancijos; tikrinama per tikslinės pusės instanciją
+    instances: Tuple[str, str] = ('-IH10', '-IH20')
+    reason: str = ""
+    status: str = "pending"
+    message: str = ""
+    verified_pairs: List[GADPair] = field(default_factory=list)
+
+class FailoverPlanner:
+    """Sudaro site failover planą pagal esamą grupių būseną"""
+    def __init__(self, controller: GADController):
+        self.controller = controller
+
+    @staticmethod
+    def target_storage(pair: GADPair, target: str) -> StorageSystem:
+        return pair.right_storage if target == 'VSP2' else pair.left_storage
+
+    @classmethod
+    def is_failed_over(cls, pair: GADPair, target: str) -> bool:
+        """Ar tikslinė pusė jau aktyvi (P-VOL PAIR arba SSWS)"""
+        storage = cls.target_storage(pair, target)
+        return storage.status == 'SSWS' or (storage.role == 'P-VOL' and storage.status == 'PAIR')
+
+    def plan(self, target: str, mode: str, order: List[List[str]]) -> List[FailoverStep]:
+        """Suskirsto grupes į etapus nurodyta tvarka ir parenka operaciją kiekvienai"""
+        groups: Dict[str, List[GADPair]] = {}
+        for pair in self.controller.pairs:
+            groups.setdefault(pair.group, []).append(pair)
+
+        stages = []
+        listed = set()
+        for stage_groups in order:
+            stage = [g for g in stage_groups if g in groups and g not in listed]
+            listed.update(stage)
+            if stage:
+                stages.append(stage)
+        remaining = [g for g in groups if g not in listed]
+        if remaining:
+            stages.append(remaining)
+
+        steps = []
+        for stage_no, stage_groups in enumerate(stages, start=1):
+            for group in stage_groups:
+                steps.append(self.plan_group(stage_no, group, groups[group], target, mode))
+        return steps
+
+    def plan_group(self, stage: int, group: str, pairs: List[GADPair], target: str, mode: str) -> FailoverStep:
+        """Parenka grupės operaciją: swap (planned), split -RS (emergency) arba praleidžia"""
+        instance = self.target_storage(pairs[0], target).instance
+        step = FailoverStep(
+            stage=stage,
+            group=group,
+            target=target,
+            operation="skip",
+            commands=[],
+            verify_command=f"pairdisplay -g {group} -CLI {instance}",
+            arrays=tuple(sorted({pairs[0].left_storage.serial_number,
+                                 pairs[0].right_storage.serial_number})),
+            instances=(pairs[0].left_storage.instance, pairs[0].right_storage.instance)
         )
 
-        if can_resync:
-            self.buttons["resync"].setEnabled(True)
-            self._set_active_button_style(self.buttons["resync"])
+        statuses = {s.status for p in pairs for s in (p.left_storage, p.right_storage)}
+        targets = [self.target_storage(p, target) for p in pairs]
+
+        if all(self.is_failed_over(p, target) for p in pairs):
+            step.reason = f"Already active on {target}"
+        elif statuses & {'COPY', 'INIT'}:
+            step.operation = "blocked"
+            step.reason = "Copy in progress - data on target is not consistent"
+        elif any(s.role != 'S-VOL' for s in targets):
+            step.operation = "blocked"
+            step.reason = "Target side is not S-VOL - resync the group first"
+        elif mode == 'planned' and statuses == {'PAIR'}:
+            step.operation = "swap"
+            step.commands = [f"pairresync -g {group} -swaps {instance}"]
+            step.reason = "Pair synchronized - swap roles"
+        else:
+            step.operation = "split"
+            step.commands = [f"pairsplit -g {group} -RS {instance}"]
+            step.reason = "Split with S-VOL write access (SSWS)"
+        return step
+
+class FailoverOrchestrator:
+    """Vykdo failover planą etapais, lygiagrečiai su apribojimais kiekvienam masyvui"""
+    def __init__(self, runner, max_workers: int = 8, per_array_limit: int = 2,
+                 verify_timeout: float = 300, verify_interval: float = 5,
+                 stop_on_failure: bool = True, executor: Optional[ThreadPoolExecutor] = None):
+        self.runner = runner
+        self.max_workers = max_workers
+        # Bendras fondas (jei perduotas); lygiagretumą tada riboja worker_slots
+        self.executor = executor
+        self.worker_slots = threading.BoundedSemaphore(max_workers)
+        self.per_array_limit = per_array_limit
+        self.verify_timeout = verify_timeout
+        self.verify_interval = verify_interval
+        self.stop_on_failure = stop_on_failure
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def execute(self, steps: List[FailoverStep], on_progress=None) -> bool:
+        """Vykdo visus žingsnius. Etapai vykdomi griežta tvarka, grupės etape - lygiagrečiai"""
+        positions = {id(step): i for i, step in enumerate(steps)}
+
+        def report(step: FailoverStep, status: str, message: str = ""):
+            step.status, step.message = status, message
+            if on_progress:
+                on_progress(positions[id(step)], status, message)
+
+        semaphores = {}
+        for step in steps:
+            for serial in step.arrays:
+                semaphores.setdefault(serial, threading.BoundedSemaphore(self.per_array_limit))
+
+        stages: Dict[int, List[FailoverStep]] = {}
+        for step in steps:
+            stages.setdefault(step.stage, []).append(step)
+
+        success = True
+        pool = self.executor or ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            for stage in sorted(stages):
+                if self.cancel_event.is_set() or (not success and self.stop_on_failure):
+                    for step in stages[stage]:
+                        report(step, "cancelled", "Not started")
+                    continue
+
+                futures = []
+                for step in stages[stage]:
+                    if step.operation == "skip":
+                        report(step, "skipped", step.reason)
+                    elif step.operation == "blocked":
+                        report(step, "failed", step.reason)
+                        success = False
+                    else:
+                        futures.append(pool.submit(self._run_step, step, semaphores, report))
+
+                for future in futures:
+                    if not future.result():
+                        success = False
+        finally:
+            if pool is not self.executor:
+                pool.shutdown()
+
+        return success and not self.cancel_event.is_set()
+
+    def _run_step(self, step: FailoverStep, semaphores: dict, report) -> bool:
+        # Užraktai imami visada ta pačia tvarka (vieta fonde, tada masyvai), kad nebūtų deadlock
+        locks = [self.worker_slots] + [semaphores[serial] for serial in step.arrays]
+        for lock in locks:
+            lock.acquire()
+        try:
+            if self.cancel_event.is_set():
+                report(step, "cancelled", "Cancelled")
+                return False
 
-    def _set_active_button_style(self, button: QPushButton):
-        """Sets the active (primary) style for enabled buttons"""
-        button.setStyleSheet("""
-            QPushButton {
-                background-color: #0052cc;
-                border: 1px solid #0052cc;
-                border-radius: 4px;
-                color: white;
-                padding: 6px 12px;
-                font-weight: 500;
-            }
-            QPushButton:hover {
-                background-color: #0747a6;
-                border-color: #0747a6;
-            }
-            QPushButton:pressed {
-                background-color: #0747a6;
-            }
-        """)
+            report(step, "running", "; ".join(step.commands))
+            for command in step.commands:
+                returncode, output = self.runner.run(command)
+                if returncode != 0:
+                    report(step, "failed", f"{command}: rc={returncode} {output.strip()}")
+                    return False
+
+            report(step, "verifying", step.verify_command)
+            deadline = time.monotonic() + self.verify_timeout
+            while True:
+                returncode, output = self.runner.run(step.verify_command)
+                if returncode == 0:
+                    # Per VSP2 instanciją (L) eilutė yra VSP2 pusė
+                    pairs = PairdisplayParser().parse(output, step.instances,
+                                                      reversed_sides=(step.target == 'VSP2'))
+                    if pairs and all(FailoverPlanner.is_failed_over(p, step.target) for p in pairs):
+                        step.verified_pairs = pairs
+                        report(step, "done", f"{len(pairs)} pairs active on {step.target}")
+                        return True
+                if self.cancel_event.is_set():
+                    report(step, "cancelled", "Cancelled during verification")
+                    return False
+                if time.monotonic() >= deadline:
+                    report(step, "failed", "State verification timed out")
+                    return False
+                self.cancel_event.wait(self.verify_interval)
+
+        except Exception as e:
+            logging.error(f"Failover step failed for {step.group}: {str(e)}", exc_info=True)
+            report(step, "failed", str(e))
+            return False
+        finally:
+            for lock in reversed(locks):
+                lock.release()
 
 class OutputParserFrame(QWidget):
     """Output parser widget"""
-    def __init__(self, parent=None, callback=None):
+    # Kiek įklijuoto teksto rodoma peržiūroje; didesni duomenys laikomi atskirai
+    PREVIEW_LINES = 20
+    PREVIEW_CHARS = 4000
+
+    def __init__(self, parent=None, callback=None, capacity_callback=None):
         super().__init__(parent)
         self.callback = callback
+        self.capacity_callback = capacity_callback
         self.cmd_output = None
+        # Pilnas įklijuotas tekstas, kai laukelyje rodoma tik jo pradžia
+        self.payload: Optional[str] = None
+        self.instances = ('-IH10', '-IH20')
         self.init_ui()
         self.debug = True
 
@@ -715,20 +2600,23 @@ class OutputParserFrame(QWidget):
         layout.setSpacing(2)
         layout.setContentsMargins(0, 0, 0, 0)
 
-        self.input_field = QTextEdit()
+        self.input_field = QPlainTextEdit()
         self.input_field.setPlaceholderText("To get the required output:\n"
                                      "1. SSH into your server\n"
                                      "2. Run command (click button to copy):\n"
                                      "3. Replace GROUP with your GAD group name\n"
                                      "4. Paste pairdisplay output here...")
         self.input_field.setMaximumHeight(80)
+        self.input_field.setLineWrapMode(QPlainTextEdit.NoWrap)
+        # Vartotojui redaguojant laukelį, paslėptas pilnas tekstas nebegalioja
+        self.input_field.textChanged.connect(self.discard_payload)
         layout.addWidget(self.input_field)
 
         button_layout = QHBoxLayout()
         button_layout.addStretch(1)
         
         # Komanda ir Copy mygtukas
-        cmd_label = QLabel("pairdisplay -g GROUP -CLI -IH10")
+        self.cmd_label = cmd_label = QLabel(self.pairdisplay_command())
         cmd_label.setStyleSheet("font-family: monospace; padding: 4px; color: #0052cc;")
         button_layout.addWidget(cmd_label)
         
@@ -745,19 +2633,32 @@ class OutputParserFrame(QWidget):
         button_layout.addWidget(help_btn)
 
         parse_btn = QPushButton("📝 Parse Input")
-        parse_btn.clicked.connect(lambda: self.parse_output(self.input_field.toPlainText()))
+        parse_btn.clicked.connect(lambda: self.parse_output(self.current_input()))
         button_layout.addWidget(parse_btn)
 
         paste_btn = QPushButton("📋 Parse from Clipboard")
         paste_btn.setProperty("class", "primary")
         paste_btn.clicked.connect(lambda: self.parse_clipboard(True))
         button_layout.addWidget(paste_btn)
+
+        capacity_btn = QPushButton("📦 Parse LDEV Capacity")
+        capacity_btn.setToolTip("Parse 'raidcom get ldev -ldev_id ...' output from the clipboard")
+        capacity_btn.clicked.connect(self.parse_capacity_clipboard)
+        button_layout.addWidget(capacity_btn)
         
         button_layout.addStretch(1)
         layout.addLayout(button_layout)
 
+    def pairdisplay_command(self) -> str:
+        return f"pairdisplay -g GROUP -CLI {self.instances[0]}"
+
+    def set_instances(self, instances: Tuple[str, str]):
+        """Site VSP1/VSP2 instancijos: įklijuota išvestis gauta per VSP1 instanciją"""
+        self.instances = instances
+        self.cmd_label.setText(self.pairdisplay_command())
+
     def copy_command(self):
-        QApplication.clipboard().setText("pairdisplay -g GROUP -CLI -IH10")
+        QApplication.clipboard().setText(self.pairdisplay_command())
         QMessageBox.information(self, "Success", "Command copied to clipboard!")
 
     def set_command_output(self, cmd_output):
@@ -791,100 +2692,77 @@ HDID2    GAD_TEST_HA2(R) (CL8-F-12, 0,   5)822222  6002.S-VOL PAIR NEVER ,  100
         if self.debug:
             print(f"DEBUG: {msg}")
 
+    def current_input(self) -> str:
+        """Pilnas analizuojamas tekstas: paslėptas įklijuotas arba laukelio turinys"""
+        if self.payload is not None:
+            return self.payload
+        return self.input_field.toPlainText()
+
+    def discard_payload(self):
+        self.payload = None
+
+    def show_preview(self, text: str):
+        """Rodo tik teksto pradžią; ilgas tekstas laikomas self.payload ir nekopijuojamas į laukelį"""
+        limit = min(len(text), self.PREVIEW_CHARS)
+        end = 0
+        for _ in range(self.PREVIEW_LINES):
+            end = text.find('\n', end, limit) + 1
+            if not end:
+                end = limit
+                break
+
+        if end >= len(text):
+            preview, payload = text, None
+        else:
+            hidden_lines = text.count('\n', end) + (0 if text.endswith('\n') else 1)
+            preview = (text[:end].rstrip('\n') + f"\n... {hidden_lines} more line(s), "
+                       f"{len(text) / 1024:.0f} KB total - full text kept for parsing")
+            payload = text
+
+        self.input_field.blockSignals(True)
+        self.input_field.setPlainText(preview)
+        self.input_field.blockSignals(False)
+        self.payload = payload
+
     def parse_clipboard(self, clear_input=False):
-        clipboard = QApplication.clipboard()
-        text = clipboard.text().strip()
-        if not text:
+        # Tekstas perduodamas analizatoriui tiesiai, be strip() kopijos
+        text = QApplication.clipboard().text()
+        if not text or text.isspace():
             QMessageBox.warning(self, "Error", "Clipboard is empty")
             return
         if clear_input:
-            self.input_field.setText(text)
+            self.show_preview(text)
         self.parse_output(text)
 
-    def parse_output(self, text: str):
+    def parse_capacity_clipboard(self):
+        text = QApplication.clipboard().text().strip()
         if not text:
-            QMessageBox.warning(self, "Error", "Please enter pairdisplay output")
-            return
-
-        try:
-            self.log(f"Starting text analysis:\n{text}")
-            pairs = self._parse_pairdisplay(text)
-            if self.callback:
-                self.callback(pairs)
-            QMessageBox.information(self, "Success", "Output successfully analyzed")
-        except Exception as e:
-            logging.error(f"Klaida atnaujinimo metu: {str(e)}", exc_info=True)
-            self.log(f"Error analyzing:\n{str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to analyze output: {str(e)}")
-
-    def _parse_pairdisplay(self, text: str) -> List[GADPair]:
-        lines = [line.strip() for line in text.split('\n') 
-              if line.strip() and not line.startswith('Group')]
-        
-        pairs = []
-        for i in range(0, len(lines), 2):
-            if i + 1 >= len(lines):
-                break
-                
-            left_line = lines[i]
-            right_line = lines[i + 1]
-            
-            try:
-                match = re.match(r'(\w+)\s+([\w_]+)', left_line)
-                group, name = match.groups()
-                
-                left_serial = re.search(r'(\d{6})', left_line).group(1)
-                right_serial = re.search(r'(\d{6})', right_line).group(1)
-                
-                left_ldev = re.search(r'(\d+)\.(P|S)-VOL', left_line)
-                right_ldev = re.search(r'(\d+)\.(P|S)-VOL', right_line)
-                
-                left_status = next(s for s in left_line.split() if s in ['PAIR', 'PSUS', 'SSUS', 'SSWS', 'PSUE', 'COPY'])
-                right_status = next(s for s in right_line.split() if s in ['PAIR', 'PSUS', 'SSUS', 'SSWS', 'PSUE', 'COPY'])
-                
-                left_rw = re.search(r'([BL]/[BLM])', left_line).group(1)
-                right_rw = re.search(r'([BL]/[BLM])', right_line).group(1)
-
-                left_storage = StorageSystem(
-                    serial_number=left_serial,
-                    host=self._extract_port_info(left_line) or '',
-                    ldev_number=left_ldev.group(1),
-                    status=left_status, 
-                    role=f"{left_ldev.group(2)}-VOL",
-                    rw_status=left_rw,
-                    instance='-IH10'
-                )
-
-                right_storage = StorageSystem(
-                    serial_number=right_serial,
-                    host=self._extract_port_info(right_line) or '',
-                    ldev_number=right_ldev.group(1),
-                    status=right_status,
-                    role=f"{right_ldev.group(2)}-VOL",
-                    rw_status=right_rw,
-                    instance='-IH20'
-                )
-
-                pairs.append(GADPair(group=group, name=name,
-                         left_storage=left_storage, right_storage=right_storage))
-                
-            except Exception as e:
-                raise ValueError(f"Parsing error: {str(e)}\nLeft: {left_line}\nRight: {right_line}")
+            QMessageBox.warning(self, "Error", "Clipboard is empty")
+            return
+        if self.capacity_callback:
+            self.capacity_callback(text)
 
-        return pairs
+    def parse_output(self, text: str):
+        if not text:
+            QMessageBox.warning(self, "Error", "Please enter pairdisplay output")
+            return
 
-    def _extract_port_info(self, line: str) -> str:
-        start = line.find('(CL')
-        if start == -1:
-            self.log("CL port start mark not found")
-            return None
-        end = line.find(')', start)
-        if end == -1:
-            self.log("Port end mark not found")
-            return None
-        port_info = line[start:end+1]
-        self.log(f"Extracted port info: {port_info}")
-        return port_info
+        try:
+            lines = text.count('\n') + 1
+            self.log(f"Starting text analysis: {len(text)} chars, {lines} lines")
+            pairs = self._parse_pairdisplay(text)
+            if self.callback:
+                self.callback(pairs)
+            QMessageBox.information(self, "Success", "Output successfully analyzed")
+        except Exception as e:
+            logging.error(f"Klaida atnaujinimo metu: {str(e)}", exc_info=True)
+            self.log(f"Error analyzing:\n{str(e)}")
+            QMessageBox.critical(self, "Error", f"Failed to analyze output: {str(e)}")
+
+    def _parse_pairdisplay(self, text: str) -> List[GADPair]:
+        # Didelėms išvestims eilučių lygio derinimo pranešimai nerašomi
+        log = self.log if len(text) <= self.PREVIEW_CHARS else None
+        return PairdisplayParser(log=log).parse(text, self.instances)
 
 class CommandOutput(QWidget):
     """Komandų išvesties komponentas"""
@@ -991,6 +2869,41 @@ class HelpDialog(QDialog):
         <h4>Resync Operation</h4>
         <p><b>Resync:</b> Resynchronizes a suspended pair</p>
         
+        <h4>CTG Operations</h4>
+        <p>Pairs that belong to a consistency group (CTG) are summarized per CTG. 
+        Split, swap and resync are offered for the whole CTG when every pair in it is in a valid state.</p>
+        
+        <h4>Site Failover</h4>
+        <p><b>Operations → Site Failover:</b> plans a swap (planned) or split -RS (emergency) for every group, 
+        runs the stages in the given order with groups inside a stage in parallel, and re-checks each group 
+        with pairdisplay. Use <i>Simulate</i> to rehearse the plan against a fake CCI.</p>
+        
+        <h4>State Timeline</h4>
+        <p><b>Operations → State Timeline:</b> every state or % change is stored per site under 
+        ~/.gadmanager/history. The timeline shows a group or pair over the chosen range; unchanged states are 
+        merged into segments and long % series are downsampled before drawing.</p>
+        
+        <h4>Sites</h4>
+        <p><b>Sites → Add Site:</b> opens another site tab with its own pairs, filters and polling. 
+        Each site has its own HORCM server (empty for local, or user@host to run CCI over ssh) and VSP1/VSP2
+        instances; two sites cannot use the same instance on the same server. <b>Sites → Site Settings</b>
+        changes them. All worker pools are shared by the sites and bounded: polling uses one pool, while failover,
+        HORCM config loading, the MON latency probe and the config preview each have their own, so a long
+        verification does not stall polling. The LDEV capacity cache is shared.</p>
+        
+        <h4>Live Polling</h4>
+        <p><b>Live poll every N s:</b> runs pairdisplay for the loaded groups in the background. 
+        Each group's result replaces its pairs, so deleted pairs disappear, and the view is redrawn at most <i>Max refresh</i> times per second.</p>
+        
+        <h4>Filter and Sort</h4>
+        <p><b>Filter:</b> plain words match the start of pair or group names; <i>field:value</i> matches the start 
+        of group, name, serial, ldev, status, rw, port or ctg on either side. All terms must match.</p>
+        <p><b>Sort:</b> orders pairs by a column; <i>Worst state first</i> puts PSUE/SSWS pairs on top.</p>
+        <p><b>View → Groups:</b> one row per group with status counts, worst state and worst R/W. 
+        Pair panels are created only when a group is expanded and released when it is collapsed.</p>
+        <p><b>View → Heat map:</b> every pair is one colored cell, grouped by group or P-VOL array. 
+        Hover a cell for details, click it to jump to the pair in the list view.</p>
+        
         <h3>Status Indicators</h3>
         <p><b>PAIR:</b> Volumes are synchronized</p>
         <p><b>PSUS:</b> Pair suspended from primary side</p>
@@ -1030,6 +2943,57 @@ class HelpDialog(QDialog):
             <li><b>horcm20.conf:</b> Secondary instance configuration</li>
         </ul>
         
+        <h4>Bulk LUN Import</h4>
+        <p>LUNs are edited in a table. Use <b>Import...</b> or <b>Paste</b> (Ctrl+V in the table) to add many rows at once
+        from CSV/TSV text (columns group, name, ldev; an optional header row may reorder them) or from
+        <code>raidcom get ldev</code> output, where the name is taken from LDEV_NAMING.</p>
+        
+        <h4>LDEV Ranges and Name Templates</h4>
+        <p>One row can describe many devices. The LDEV column accepts a decimal number or range
+        (<code>52735-53734</code>) or a CU:LDEV value or range (<code>0x00:0x1A-0x01:0xFF</code>, written to the
+        file as <code>00:1A</code>). A range needs a name template such as <code>GAD_DB_{n:03}</code>, where
+        <code>{n}</code> counts from 1 and <code>{ldev}</code> is the decimal LDEV number.</p>
+        <h4>Instance Sharding</h4>
+        <p><b>Instance pairs</b> spreads device groups by LDEV count over several HORCM instance pairs
+        (horcm10/horcm20, horcm11/horcm21, ... with services 5010/5020, 5011/5021, ...) so CCI commands for
+        different groups can run in parallel. <b>CMD LDEVs</b> lists the command devices of each array; they are
+        shared round-robin, <b>CMD devices per instance</b> at a time. Without CMD LDEVs the first LDEV of each
+        instance is used as before. Saving fewer instance pairs than before offers to remove the leftover
+        horcm*.conf files of the instances that are no longer generated.</p>
+        <h4>Instance Parameters</h4>
+        <p>MON poll and timeout (in 10 ms units), the service base (service = base + instance number), MU# and the
+        command device syntax (Windows <code>\\\\.\\CMD-serial-ldev</code> or Linux
+        <code>\\\\.\\CMD-serial-ldev:/dev/sd</code>) apply to every generated instance.</p>
+        <p><b>Tune MON...</b> times <code>raidqry -l</code> and <code>raidqry -r &lt;group&gt;</code> round-trips
+        for each generated instance (at most 4 instances at a time, 5 s per command; a command that times out
+        counts as a failure, or a fake CCI with random latency in simulate mode), shows the latency
+        percentiles and histogram, and recommends poll = 20 &times; p50 (500-6000) and
+        timeout = max(5 &times; p99, 2 &times; max) (1000-60000), rounded up to 100. <b>Apply to Generator</b>
+        writes the recommended values into the HORCM_MON section of each measured instance until they are cleared.</p>
+        
+        <h4>Existing Configurations</h4>
+        <p><b>Load Existing...</b> reads a hand-maintained horcmNN.conf (HORCM_MON, HORCM_CMD, HORCM_LDEV and
+        HORCM_INST or HORCM_INSTP) and its partner instance from the same directory into the editor. The lower
+        instance becomes VSP1 and CU:LDEV values stay in CU:LDEV form. MON poll and timeout, the service base,
+        MU# and the command device syntax are taken from the loaded file.
+        <b>Operations &gt; Load HORCM Configs...</b> indexes a whole directory for the active site in the
+        background. Its groups then become the list that Live poll queries, each through the instance that
+        defines it.</p>
+        <p>The table is checked after every edit. Rows with duplicate LDEVs, duplicate device names within a group,
+        group names that differ only by case or invalid names are highlighted, and the tooltip shows the problem.
+        Preview and Save list every problem with its row number.</p>
+        
+        <h4>Cross-check with Pairs</h4>
+        <p><b>Operations &gt; Cross-check HORCM vs Pairs...</b> compares the generator's devices with the pairs
+        parsed in the active site, matching on serial and LDEV. It lists devices that are configured but not paired,
+        pairs on the configured arrays that are missing from the conf, and pairs whose group, name or partner LDEV
+        differ from the conf.</p>
+        
+        <h4>Live Preview</h4>
+        <p>With <b>Live preview</b> on, the preview is regenerated in the background 300 ms after the last edit.
+        Only the sections that changed are replaced. If the input has problems, the preview keeps its last
+        content and the line below it shows the first problem.</p>
+        
         <h4>Shortcuts</h4>
         <ul>
             <li><b>Ctrl+S:</b> Save configuration files</li>
@@ -1168,6 +3132,462 @@ class AboutDialog(QDialog):
         button_box.accepted.connect(self.accept)
         layout.addWidget(button_box)
 
+class PairUpdateBatcher(QObject):
+    """Sujungia dažnus grupių atnaujinimus iš darbinių gijų į vieną paketą per kadrą"""
+    batch_ready = pyqtSignal(dict)
+    wake = pyqtSignal()
+
+    def __init__(self, max_rate: float = 5.0, parent=None):
+        super().__init__(parent)
+        self.lock = threading.Lock()
+        self.pending: Dict[str, List[GADPair]] = {}
+        self.submitted = 0
+        self.scheduled = False
+        self.last_flush = 0.0
+        self.set_max_rate(max_rate)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+        # Iš kitos gijos išsiųstas signalas pristatomas per UI gijos eilę
+        self.wake.connect(self.schedule)
+
+    def set_max_rate(self, max_rate: float):
+        """Nustato kiek kartų per sekundę daugiausiai atnaujinamas vaizdas"""
+        self.min_interval = 1.0 / max(max_rate, 0.1)
+
+    def submit(self, group: str, pairs: List[GADPair]):
+        """Įdeda visas grupės poras į buferį; naujesnis grupės rezultatas pakeičia ankstesnį
+        (galima kviesti iš bet kurios gijos)"""
+        with self.lock:
+            self.pending[group] = pairs
+            self.submitted += 1
+            if self.scheduled:
+                return
+            self.scheduled = True
+        self.wake.emit()
+
+    def schedule(self):
+        """Suplanuoja paketo pritaikymą neviršijant maksimalaus dažnio"""
+        wait = self.last_flush + self.min_interval - time.monotonic()
+        self.timer.start(max(0, int(wait * 1000)))
+
+    def flush(self):
+        """Atiduoda sukauptas poras vienu paketu"""
+        with self.lock:
+            batch = self.pending
+            submitted = self.submitted
+            self.pending = {}
+            self.submitted = 0
+            self.scheduled = False
+        self.last_flush = time.monotonic()
+        if batch:
+            logging.debug(f"Group updates coalesced: {submitted} -> {len(batch)}")
+            self.batch_ready.emit(batch)
+
+class PairdisplayPoller(QObject):
+    """Periodiškai vykdo pairdisplay per bendrą darbinių gijų fondą ir perduoda poras buferiui.
+    targets - (grupė, (VSP1 instancija, VSP2 instancija)); užklausa vykdoma per VSP1 instanciją"""
+    failed = pyqtSignal(str)
+    round_done = pyqtSignal()
+
+    def __init__(self, runner, targets: List[Tuple[str, Tuple[str, str]]], batcher: PairUpdateBatcher,
+                 executor: ThreadPoolExecutor, interval: float = 5.0, parent=None):
+        super().__init__(parent)
+        self.runner = runner
+        self.targets = targets
+        self.batcher = batcher
+        self.executor = executor
+        self.interval = interval
+        self.parser = PairdisplayParser()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.stopped = True
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.poll)
+        # Kitas ratas planuojamas tik pasibaigus ankstesniam, todėl užklausos nesikaupia
+        self.round_done.connect(self.schedule_next)
+
+    def start(self):
+        self.stopped = False
+        self.poll()
+
+    def stop(self):
+        self.stopped = True
+        self.timer.stop()
+
+    def poll(self):
+        """Pateikia po vieną užduotį kiekvienai komandai"""
+        if self.stopped:
+            return
+        with self.lock:
+            self.in_flight = len(self.targets)
+        for group, instances in self.targets:
+            self.executor.submit(self.poll_group, group, instances)
+
+    def poll_group(self, group: str, instances: Tuple[str, str]):
+        command = f"pairdisplay -g {group} -CLI {instances[0]}"
+        try:
+            if self.stopped:
+                return
+            code, output = self.runner.run(command)
+            if self.stopped:
+                return
+            if code != 0:
+                self.failed.emit(f"{command}: {output.strip()}")
+                return
+            # Tuščias rezultatas taip pat perduodamas - grupės poros pašalinamos
+            self.batcher.submit(group, self.parser.parse(output, instances))
+        except ValueError as e:
+            self.failed.emit(f"{command}: {str(e)}")
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+                done = self.in_flight == 0
+            if done and not self.stopped:
+                self.round_done.emit()
+
+    def schedule_next(self):
+        if not self.stopped:
+            self.timer.start(int(self.interval * 1000))
+
+class TimelineDialog(QDialog):
+    """Grupės ar poros būsenų istorijos peržiūra iš išsaugotų pokyčių"""
+    RANGES = [
+        ("Last hour", 3600),
+        ("Last 24 hours", 86400),
+        ("Last 7 days", 7 * 86400),
+        ("Last 30 days", 30 * 86400),
+        ("All history", None)
+    ]
+
+    pairs_loaded = pyqtSignal(list)
+    timeline_loaded = pyqtSignal(int, object, float, float, float)
+
+    def __init__(self, controller: GADController, parent=None, executor: Optional[ThreadPoolExecutor] = None):
+        super().__init__(parent)
+        self.controller = controller
+        self.store = controller.snapshot_store
+        # Žurnalas skaitomas fone; be fondo - atskiroje gijoje
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="timeline")
+        self.generation = 0
+        self.pairs_loaded.connect(self.fill_targets)
+        self.timeline_loaded.connect(self.show_timeline)
+        self.setWindowTitle("State Timeline")
+        self.setMinimumSize(1000, 600)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        form = QHBoxLayout()
+        form.addWidget(QLabel("Show:"))
+        self.target_combo = QComboBox()
+        self.target_combo.setMinimumWidth(320)
+        form.addWidget(self.target_combo, 1)
+        form.addWidget(QLabel("Range:"))
+        self.range_combo = QComboBox()
+        for label, seconds in self.RANGES:
+            self.range_combo.addItem(label, seconds)
+        self.range_combo.setCurrentIndex(1)
+        form.addWidget(self.range_combo)
+        self.show_btn = show_btn = QPushButton("Show")
+        show_btn.setProperty("class", "primary")
+        show_btn.setEnabled(False)
+        show_btn.clicked.connect(self.load_timeline)
+        form.addWidget(show_btn)
+        layout.addLayout(form)
+
+        self.timeline = TimelineWidget()
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        scroll_area.setWidget(self.timeline)
+        layout.addWidget(scroll_area, 1)
+
+        self.info_label = QLabel()
+        self.info_label.setProperty("role", "muted")
+        layout.addWidget(self.info_label)
+
+        # Į sąrašą įtraukiamos ir poros, kurių dabartinėje išvestyje nebėra
+        self.info_label.setText("Reading state history...")
+        current = [pair.pair_id for pair in self.controller.pairs]
+        self.executor.submit(self.read_in_background, self.read_known_pairs, current)
+
+    def read_in_background(self, function, *args):
+        """Vykdo žurnalo skaitymą fone; uždarius langą rezultatas atmetamas"""
+        try:
+            function(*args)
+        except RuntimeError:
+            pass
+        except Exception as e:
+            logging.error(f"State history read failed: {str(e)}", exc_info=True)
+
+    def read_known_pairs(self, current: List[str]):
+        known = self.store.known_pairs() if self.store else []
+        self.pairs_loaded.emit(list(dict.fromkeys(current + known)))
+
+    def fill_targets(self, pair_ids: List[str]):
+        groups = list(dict.fromkeys(pair_id.split('/', 1)[0] for pair_id in pair_ids))
+        for group in groups:
+            self.target_combo.addItem(f"Group {group}", [pair_id for pair_id in pair_ids
+                                                         if pair_id.split('/', 1)[0] == group])
+        for pair_id in pair_ids:
+            self.target_combo.addItem(f"Pair {pair_id}", [pair_id])
+        self.info_label.setText(f"{len(pair_ids)} pairs with history")
+        self.show_btn.setEnabled(True)
+
+    def load_timeline(self):
+        if self.store is None or self.target_combo.currentData() is None:
+            QMessageBox.warning(self, "Error", "No state history recorded yet")
+            return
+
+        pair_ids = self.target_combo.currentData()
+        seconds = self.range_combo.currentData()
+        end = time.time()
+        since = end - seconds if seconds else 0
+        # Vėlesnis užklausimas pakeičia ankstesnį, dar nebaigtą
+        self.generation += 1
+        self.info_label.setText("Loading...")
+        self.executor.submit(self.read_in_background, self.read_timeline, self.generation, pair_ids,
+                             since, end, time.perf_counter())
+
+    def read_timeline(self, generation: int, pair_ids: List[str], since: float, end: float, started: float):
+        """Skaito žurnalą ir sudaro būsenų atkarpas (fone)"""
+        series = self.store.load(set(pair_ids), since)
+        if not since:
+            since = min((points[0][0] for points in series.values() if points), default=end)
+        rows = []
+        points = 0
+        for pair_id in pair_ids:
+            timelines = []
+            for side in ("L", "R"):
+                side_points = series.get(f"{pair_id}:{side}")
+                points += len(side_points or ())
+                timelines.append(StateTimeline(side_points, end) if side_points else None)
+            rows.append((pair_id, timelines[0], timelines[1]))
+        self.timeline_loaded.emit(generation, (rows, points), since, end, started)
+
+    def show_timeline(self, generation: int, result: tuple, since: float, end: float, started: float):
+        if generation != self.generation:
+            return
+        rows, points = result
+        self.timeline.set_rows(rows, since, end)
+
+        segments = sum(len(timeline.segments) for row in rows for timeline in row[1:] if timeline)
+        self.info_label.setText(f"{len(rows)} pairs, {points} stored points merged into {segments} state segments "
+                                f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+class FailoverWorker(QThread):
+    """Vykdo failover planą atskiroje gijoje"""
+    progress = pyqtSignal(int, str, str)
+    finished = pyqtSignal(bool)
+
+    def __init__(self, orchestrator: FailoverOrchestrator, steps: List[FailoverStep]):
+        super().__init__()
+        self.orchestrator = orchestrator
+        self.steps = steps
+
+    def run(self):
+        try:
+            success = self.orchestrator.execute(self.steps, self.progress.emit)
+        except Exception as e:
+            logging.error(f"Failover failed: {str(e)}", exc_info=True)
+            success = False
+        self.finished.emit(success)
+
+class FailoverDialog(QDialog):
+    """Site failover planavimo ir vykdymo langas"""
+    pairs_verified = pyqtSignal(list)
+
+    STATUS_COLORS = {
+        'pending': '#666',
+        'running': '#0052cc',
+        'verifying': '#0052cc',
+        'done': '#00875a',
+        'skipped': '#9da5b4',
+        'failed': '#de350b',
+        'cancelled': '#ff8800'
+    }
+
+    def __init__(self, controller: GADController, parent=None, executor: Optional[ThreadPoolExecutor] = None,
+                 max_parallel: int = 8, connection: Optional['SiteConnection'] = None):
+        super().__init__(parent)
+        self.controller = controller
+        # Lygiagretumas neviršija fondo dydžio, kitaip užduotys tik lauktų eilėje
+        self.executor = executor
+        self.max_parallel = max_parallel
+        self.connection = connection or SiteConnection()
+        self.steps: List[FailoverStep] = []
+        self.worker = None
+        self.orchestrator = None
+        self.setWindowTitle("Site Failover")
+        self.setMinimumSize(900, 600)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        form = QFormLayout()
+        self.target_combo = QComboBox()
+        # Instancija imama iš kiekvienos grupės porų, todėl čia nerodoma
+        self.target_combo.addItem("VSP2 (right side)", "VSP2")
+        self.target_combo.addItem("VSP1 (left side)", "VSP1")
+        form.addRow("Fail over to:", self.target_combo)
+
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("Planned - swap synchronized groups", "planned")
+        self.mode_combo.addItem("Emergency - split -RS all groups", "emergency")
+        form.addRow("Mode:", self.mode_combo)
+
+        self.order_field = QPlainTextEdit()
+        self.order_field.setPlaceholderText("One stage per line, groups separated by commas.\n"
+                                            "Groups not listed run in the last stage.")
+        self.order_field.setMaximumHeight(80)
+        form.addRow("Group order:", self.order_field)
+
+        limits_layout = QHBoxLayout()
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, self.max_parallel)
+        self.workers_spin.setValue(self.max_parallel)
+        limits_layout.addWidget(QLabel("Parallel groups:"))
+        limits_layout.addWidget(self.workers_spin)
+        self.array_limit_spin = QSpinBox()
+        self.array_limit_spin.setRange(1, 32)
+        self.array_limit_spin.setValue(2)
+        limits_layout.addWidget(QLabel("Per-array limit:"))
+        limits_layout.addWidget(self.array_limit_spin)
+        self.simulate_check = QCheckBox("Simulate (fake CCI)")
+        self.simulate_check.setChecked(True)
+        limits_layout.addWidget(self.simulate_check)
+        limits_layout.addStretch(1)
+        form.addRow("Execution:", limits_layout)
+        layout.addLayout(form)
+
+        self.table = QTableWidget(0, 6)
+        self.table.setHorizontalHeaderLabels(["Stage", "Group", "Operation", "Commands", "Status", "Message"])
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch(1)
+        self.plan_btn = QPushButton("Build Plan")
+        self.plan_btn.clicked.connect(self.build_plan)
+        button_layout.addWidget(self.plan_btn)
+
+        self.execute_btn = QPushButton("Execute")
+        self.execute_btn.setProperty("class", "primary")
+        self.execute_btn.setEnabled(False)
+        self.execute_btn.clicked.connect(self.execute_plan)
+        button_layout.addWidget(self.execute_btn)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_execution)
+        button_layout.addWidget(self.cancel_btn)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.reject)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def parse_order(self) -> List[List[str]]:
+        """Nuskaito etapų tvarką iš teksto lauko"""
+        order = []
+        for line in self.order_field.toPlainText().splitlines():
+            groups = [g.strip() for g in line.split(',') if g.strip()]
+            if groups:
+                order.append(groups)
+        return order
+
+    def build_plan(self):
+        """Sudaro planą ir parodo jį lentelėje"""
+        if not self.controller.pairs:
+            QMessageBox.warning(self, "Error", "No GAD pairs loaded")
+            return
+
+        planner = FailoverPlanner(self.controller)
+        self.steps = planner.plan(
+            self.target_combo.currentData(),
+            self.mode_combo.currentData(),
+            self.parse_order()
+        )
+
+        self.table.setRowCount(len(self.steps))
+        for row, step in enumerate(self.steps):
+            values = [str(step.stage), step.group, step.operation,
+                      "\n".join(step.commands), step.status, step.reason]
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+        self.table.resizeColumnsToContents()
+        self.execute_btn.setEnabled(any(s.operation in ("swap", "split") for s in self.steps))
+
+    def execute_plan(self):
+        """Paleidžia plano vykdymą"""
+        if not self.steps:
+            return
+        simulate = self.simulate_check.isChecked()
+        if not simulate:
+            response = QMessageBox.question(
+                self,
+                "Confirm Failover",
+                f"Execute site failover for {len(self.steps)} groups on the real arrays?",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if response != QMessageBox.Yes:
+                return
+
+        runner = FakeCCI(self.controller.pairs, latency=0.2) if simulate else self.connection.runner()
+        self.orchestrator = FailoverOrchestrator(
+            runner,
+            max_workers=self.workers_spin.value(),
+            per_array_limit=self.array_limit_spin.value(),
+            verify_interval=0.5 if simulate else 5,
+            executor=self.executor
+        )
+        self.worker = FailoverWorker(self.orchestrator, self.steps)
+        self.worker.progress.connect(self.update_step)
+        self.worker.finished.connect(lambda success: self.execution_finished(success, simulate))
+
+        self.plan_btn.setEnabled(False)
+        self.execute_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.worker.start()
+
+    def update_step(self, row: int, status: str, message: str):
+        """Atnaujina žingsnio eilutę vykdymo metu"""
+        color = QColor(self.STATUS_COLORS.get(status, '#666'))
+        status_item = QTableWidgetItem(status)
+        status_item.setForeground(color)
+        self.table.setItem(row, 4, status_item)
+        self.table.setItem(row, 5, QTableWidgetItem(message))
+
+    def cancel_execution(self):
+        if self.orchestrator:
+            self.orchestrator.cancel()
+        self.cancel_btn.setEnabled(False)
+
+    def execution_finished(self, success: bool, simulate: bool):
+        self.plan_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        if not simulate:
+            verified = [pair for step in self.steps for pair in step.verified_pairs]
+            if verified:
+                self.pairs_verified.emit(verified)
+        if success:
+            QMessageBox.information(self, "Failover", "Site failover completed successfully")
+        else:
+            QMessageBox.warning(self, "Failover", "Site failover did not complete - check the step status")
+
+    def reject(self):
+        if self.worker and self.worker.isRunning():
+            QMessageBox.warning(self, "Failover", "Failover is still running - cancel it first")
+            return
+        super().reject()
+
 class ServerParametersGroup(QGroupBox):
     """HORCM serverio parametrų grupė"""
     def __init__(self, parent=None):
@@ -1215,6 +3635,12 @@ class VSPParametersGroup(QGroupBox):
         
         layout.addRow("Serial Number:", self.serial_entry)
         layout.addRow("IP Address:", self.ip_entry)
+
+        self.cmd_entry = QLineEdit()
+        self.cmd_entry.setPlaceholderText("optional, e.g. 65280, 65281")
+        self.cmd_entry.setToolTip("Command device LDEVs (numbers, CU:LDEV or ranges). They are shared\n"
+                                  "round-robin between instances. If empty, the first LDEV of each instance is used.")
+        layout.addRow("CMD LDEVs:", self.cmd_entry)
         
         self.setLayout(layout)
         
@@ -1227,98 +3653,288 @@ class VSPParametersGroup(QGroupBox):
         if self.is_empty():
             return {
                 'serial': self.serial_entry.placeholderText(),
-                'ip': self.ip_entry.placeholderText()
+                'ip': self.ip_entry.placeholderText(),
+                'cmd_ldevs': self.cmd_entry.text()
             }
         return {
             'serial': self.serial_entry.text(),
-            'ip': self.ip_entry.text()
+            'ip': self.ip_entry.text(),
+            'cmd_ldevs': self.cmd_entry.text()
         }
 
-class LUNEntry(QFrame):
-    """Vieno LUN įrašo komponentas"""
-    removed = pyqtSignal(object)
-    
+class InstanceParametersGroup(QGroupBox):
+    """HORCM instancijų porų ir komandų įrenginių skaičiaus parametrai"""
+    overrides_changed = pyqtSignal()
+
     def __init__(self, parent=None):
-        super().__init__(parent)
+        super().__init__("HORCM Instances", parent)
+        self.instance_overrides: Dict[int, dict] = {}
         self.init_ui()
-        
+
     def init_ui(self):
-        self.setStyleSheet("QFrame { background: #f7f9fc; border-radius: 4px; padding: 8px; }")
-        layout = QHBoxLayout()
+        layout = QFormLayout()
         layout.setSpacing(8)
-        layout.setContentsMargins(8, 8, 8, 8)
-        
-        self.fields = {
-            "group": QLineEdit(),
-            "name": QLineEdit(),
-            "ldev": QLineEdit()
-        }
-        
-        self.fields["group"].setPlaceholderText("ORACLE")
-        self.fields["name"].setPlaceholderText("GAD_TEST_DB")
-        self.fields["ldev"].setPlaceholderText("52735")
-        
-        fields_layout = QGridLayout()
-        fields_layout.setSpacing(4)
-        fields_layout.setContentsMargins(0, 0, 0, 0)
-        
-        for col, (key, value) in enumerate(self.fields.items()):
-            fields_layout.addWidget(QLabel(f"{key.title()}:"), 0, col*2)
-            fields_layout.addWidget(value, 0, col*2+1)
-            if key == "group":
-                value.setFixedWidth(60)
-            elif key == "name":
-                value.setFixedWidth(100)
-            elif key == "ldev":
-                value.setFixedWidth(60)
-                
-        layout.addLayout(fields_layout)
-        
-        remove_btn = QPushButton("×")
-        remove_btn.setFixedSize(20, 20)
-        remove_btn.setStyleSheet("""
-            QPushButton {
-                background: #f0f0f0;
-                border: none;
-                border-radius: 10px;
-                color: #666;
-                font-weight: bold;
-                padding: 0;
-                margin: 0;
-            }
-            QPushButton:hover {
-                background: #e0e0e0;
-                color: #333;
-            }
-        """)
-        remove_btn.clicked.connect(self.remove_self)
-        layout.addWidget(remove_btn)
-        
+
+        self.shards_spin = QSpinBox()
+        self.shards_spin.setRange(1, HORCMShardPlan.MAX_SHARDS)
+        self.shards_spin.setToolTip("Groups are spread by LDEV count over instance pairs\n"
+                                    "horcm10/20, horcm11/21, ... with services base+10/base+20, ...")
+        layout.addRow("Instance pairs:", self.shards_spin)
+
+        self.cmd_spin = QSpinBox()
+        self.cmd_spin.setRange(1, HORCMShardPlan.MAX_CMD_PER_INSTANCE)
+        self.cmd_spin.setToolTip("Command devices listed in HORCM_CMD of each instance")
+        layout.addRow("CMD devices per instance:", self.cmd_spin)
+
+        defaults = HORCMSettings()
+        self.poll_spin = QSpinBox()
+        self.poll_spin.setRange(100, 100000)
+        self.poll_spin.setValue(defaults.poll)
+        self.poll_spin.setSuffix(" × 10 ms")
+        layout.addRow("MON poll:", self.poll_spin)
+
+        self.timeout_spin = QSpinBox()
+        self.timeout_spin.setRange(100, 100000)
+        self.timeout_spin.setValue(defaults.timeout)
+        self.timeout_spin.setSuffix(" × 10 ms")
+        layout.addRow("MON timeout:", self.timeout_spin)
+
+        self.service_spin = QSpinBox()
+        self.service_spin.setRange(1024, 65000)
+        self.service_spin.setValue(defaults.service_base)
+        self.service_spin.setToolTip("Service (UDP port) = base + instance number")
+        layout.addRow("Service base:", self.service_spin)
+
+        self.mu_combo = QComboBox()
+        for label, value in (("0", "0"), ("h0", "h0"), ("(none)", "")):
+            self.mu_combo.addItem(label, value)
+        layout.addRow("MU#:", self.mu_combo)
+
+        self.cmd_syntax_combo = QComboBox()
+        self.cmd_syntax_combo.addItem("Windows (\\\\.\\CMD-serial-ldev)", "windows")
+        self.cmd_syntax_combo.addItem("Linux (\\\\.\\CMD-serial-ldev:/dev/sd)", "linux")
+        layout.addRow("CMD syntax:", self.cmd_syntax_combo)
+
+        # Matavimais paremtos instancijų reikšmės turi pirmenybę prieš bendras
+        tuning_layout = QHBoxLayout()
+        self.tuning_label = QLabel()
+        self.tuning_label.setWordWrap(True)
+        self.tuning_label.setStyleSheet("color: #666; font-style: italic;")
+        tuning_layout.addWidget(self.tuning_label, 1)
+        self.clear_tuning_btn = QPushButton("Clear")
+        self.clear_tuning_btn.clicked.connect(lambda: self.set_overrides({}))
+        tuning_layout.addWidget(self.clear_tuning_btn)
+        self.tuning_label.setVisible(False)
+        self.clear_tuning_btn.setVisible(False)
+        layout.addRow(tuning_layout)
+
         self.setLayout(layout)
-    
-    def has_any_input(self) -> bool:
-        """Patikrina ar bent vienas laukas yra užpildytas"""
-        return any(field.text() for field in self.fields.values())
-        
-    def is_empty(self) -> bool:
-        """Patikrina ar visi laukai tušti"""
-        return all(not field.text() for field in self.fields.values())
-    
-    def is_fully_filled(self) -> bool:
-        """Patikrina ar visi laukai užpildyti"""
-        return all(field.text() for field in self.fields.values())
-        
+
     def get_values(self) -> dict:
-        """Grąžina įvestas reikšmes arba placeholder reikšmes"""
-        if self.is_empty():
-            return {k: v.placeholderText() for k, v in self.fields.items()}
-        elif not self.is_fully_filled():
+        return {'shards': self.shards_spin.value(), 'cmd_per_instance': self.cmd_spin.value()}
+
+    def set_settings(self, settings: 'HORCMSettings'):
+        """Užpildo laukus (pvz. iš įkelto conf); nežinomas MU# pridedamas į sąrašą"""
+        self.poll_spin.setValue(settings.poll)
+        self.timeout_spin.setValue(settings.timeout)
+        self.service_spin.setValue(settings.service_base)
+        index = self.mu_combo.findData(settings.mu)
+        if index < 0:
+            self.mu_combo.addItem(settings.mu, settings.mu)
+            index = self.mu_combo.count() - 1
+        self.mu_combo.setCurrentIndex(index)
+        self.cmd_syntax_combo.setCurrentIndex(max(0, self.cmd_syntax_combo.findData(settings.cmd_syntax)))
+
+    def get_settings(self) -> 'HORCMSettings':
+        return HORCMSettings(poll=self.poll_spin.value(), timeout=self.timeout_spin.value(),
+                             service_base=self.service_spin.value(), mu=self.mu_combo.currentData(),
+                             cmd_syntax=self.cmd_syntax_combo.currentData(),
+                             instance_overrides=dict(self.instance_overrides))
+
+    def set_overrides(self, overrides: Dict[int, dict]):
+        """Instancijų poll/timeout reikšmės iš vėlinimo matavimų"""
+        self.instance_overrides = {instance: {'poll': values['poll'], 'timeout': values['timeout']}
+                                   for instance, values in overrides.items()}
+        if self.instance_overrides:
+            tuned = ", ".join(f"horcm{instance} {values['poll']}/{values['timeout']}"
+                              for instance, values in sorted(self.instance_overrides.items()))
+            self.tuning_label.setText(f"Tuned poll/timeout: {tuned}")
+        self.tuning_label.setVisible(bool(self.instance_overrides))
+        self.clear_tuning_btn.setVisible(bool(self.instance_overrides))
+        self.overrides_changed.emit()
+
+    def changed_signals(self) -> list:
+        return [self.shards_spin.valueChanged, self.cmd_spin.valueChanged, self.poll_spin.valueChanged,
+                self.timeout_spin.valueChanged, self.service_spin.valueChanged,
+                self.mu_combo.currentIndexChanged, self.cmd_syntax_combo.currentIndexChanged,
+                self.overrides_changed]
+
+class LUNImporter:
+    """LUN sąrašo importas iš CSV/TSV teksto arba raidcom get ldev išvesties"""
+    HEADER_ALIASES = {
+        'group': 'group', 'devicegroup': 'group', 'dev_group': 'group',
+        'name': 'name', 'devicename': 'name', 'dev_name': 'name',
+        'ldev': 'ldev', 'ldev#': 'ldev', 'ldev_id': 'ldev', 'cu:ldev': 'ldev'
+    }
+
+    @staticmethod
+    def is_raidcom(text: str) -> bool:
+        return re.search(r'^\s*LDEV\s*:', text, re.MULTILINE) is not None
+
+    @classmethod
+    def parse_table(cls, text: str) -> List[dict]:
+        """CSV, TSV, ';' ar tarpais atskirti stulpeliai; antraštė neprivaloma (numatyta: group, name, ldev)"""
+        lines = [line for line in text.splitlines() if line.strip() and not line.lstrip().startswith('#')]
+        if not lines:
+            return []
+        first = lines[0]
+        delimiter = next((d for d in ('\t', ',', ';') if d in first), None)
+        if delimiter:
+            rows = [[cell.strip() for cell in row] for row in csv.reader(lines, delimiter=delimiter)]
+        else:
+            rows = [line.split() for line in lines]
+
+        header = [cls.HEADER_ALIASES.get(cell.lower().replace(' ', '')) for cell in rows[0]]
+        if 'ldev' in header:
+            columns, rows = header, rows[1:]
+        else:
+            columns = ['group', 'name', 'ldev']
+
+        luns = []
+        for row in rows:
+            values = {column: row[i] for i, column in enumerate(columns) if column and i < len(row)}
+            luns.append({key: values.get(key, '') for key in ('group', 'name', 'ldev')})
+        return luns
+
+    @staticmethod
+    def parse_raidcom(text: str, group: str) -> List[dict]:
+        """LDEV iš raidcom get ldev; vardas imamas iš LDEV_NAMING arba sudaromas iš grupės"""
+        ldevs = RaidcomLdevParser().parse(text, require_capacity=False)
+        return [{'group': group, 'name': ldev.get('name') or f"{group}_{ldev['ldev']}", 'ldev': ldev['ldev']}
+                for ldev in ldevs]
+
+class LUNTableModel(QAbstractTableModel):
+    """LUN įrašų lentelės modelis: paprastas eilučių sąrašas"""
+    COLUMNS = [("group", "Group"), ("name", "Name"), ("ldev", "LDEV")]
+    PLACEHOLDERS = {"group": "ORACLE", "name": "GAD_TEST_DB", "ldev": "52735"}
+    ISSUE_COLOR = QColor("#fdecea")
+
+    edited = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows: List[dict] = []
+        self.issues: Dict[int, List[str]] = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
             return None
-        return {k: v.text() for k, v in self.fields.items()}
-        
-    def remove_self(self):
-        """Pašalina šį LUN įrašą"""
-        self.removed.emit(self)
+        key = self.COLUMNS[index.column()][0]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.rows[index.row()][key]
+        if role == Qt.BackgroundRole and index.row() in self.issues:
+            return self.ISSUE_COLOR
+        if role == Qt.ToolTipRole:
+            if index.row() in self.issues:
+                return "\n".join(self.issues[index.row()])
+            if index.row() == 0 and not self.rows[0][key]:
+                return f"e.g. {self.PLACEHOLDERS[key]}"
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return str(section + 1)
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        value = str(value).strip()
+        key = self.COLUMNS[index.column()][0]
+        if self.rows[index.row()][key] == value:
+            return False
+        self.rows[index.row()][key] = value
+        self.dataChanged.emit(index, index, [role])
+        self.edited.emit()
+        return True
+
+    def set_issues(self, issues: Dict[int, List[str]]):
+        """Pažymi eilutes su validacijos problemomis"""
+        changed = [row for row in issues.keys() ^ self.issues.keys()]
+        changed.extend(row for row in issues.keys() & self.issues.keys() if issues[row] != self.issues[row])
+        self.issues = issues
+        if changed:
+            self.dataChanged.emit(self.index(min(changed), 0),
+                                  self.index(max(changed), self.columnCount() - 1),
+                                  [Qt.BackgroundRole, Qt.ToolTipRole])
+
+    def append_rows(self, rows: List[dict]):
+        if not rows:
+            return
+        # Vienintelė tuščia pradinė eilutė pakeičiama importuotomis
+        if len(self.rows) == 1 and not self.has_any_input():
+            self.set_rows(rows)
+            return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def add_empty_row(self):
+        self.append_rows([{key: '' for key, _ in self.COLUMNS}])
+
+    def set_rows(self, rows: List[dict]):
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.issues = {}
+        self.endResetModel()
+
+    def remove_rows(self, row_numbers: set):
+        self.set_rows([row for i, row in enumerate(self.rows) if i not in row_numbers])
+        if not self.rows:
+            self.add_empty_row()
+
+    @staticmethod
+    def row_has_input(row: dict) -> bool:
+        return any(row.values())
+
+    @staticmethod
+    def row_is_complete(row: dict) -> bool:
+        return all(row.values())
+
+    def has_any_input(self) -> bool:
+        return any(self.row_has_input(row) for row in self.rows)
+
+    def validate(self) -> Tuple[bool, str, list]:
+        """Validuoja modelio duomenis (ne valdiklius); klaidose nurodomi eilučių numeriai"""
+        if not self.has_any_input():
+            return True, "", [dict(self.PLACEHOLDERS)]
+
+        partial = [i + 1 for i, row in enumerate(self.rows)
+                   if self.row_has_input(row) and not self.row_is_complete(row)]
+        if partial:
+            shown = ", ".join(str(row) for row in partial[:10])
+            more = f" and {len(partial) - 10} more" if len(partial) > 10 else ""
+            label = "row" if len(partial) == 1 else "rows"
+            return False, (f"LUN {label} {shown}{more} partially filled. "
+                           f"Please fill all fields or leave them empty."), []
+
+        valid_luns = [dict(row) for row in self.rows if self.row_is_complete(row)]
+        if not valid_luns:
+            return False, "No valid LUN entries found. Please fill all required fields.", []
+        return True, "", valid_luns
 
 class LUNConfigurationGroup(QGroupBox):
     """LUN konfigūracijos grupė"""
@@ -1331,72 +3947,118 @@ class LUNConfigurationGroup(QGroupBox):
         layout.setSpacing(8)
         
         header_layout = QHBoxLayout()
-        header_label = QLabel("Configured LUNs")
-        header_label.setStyleSheet("font-weight: bold;")
-        header_layout.addWidget(header_label)
+        self.header_label = QLabel("Configured LUNs")
+        self.header_label.setStyleSheet("font-weight: bold;")
+        header_layout.addWidget(self.header_label)
+        header_layout.addStretch(1)
         
         add_btn = QPushButton("➕ Add LUN")
-        add_btn.setMaximumWidth(100)
         add_btn.clicked.connect(self.add_lun)
-        header_layout.addWidget(add_btn, alignment=Qt.AlignRight)
+        header_layout.addWidget(add_btn)
+
+        remove_btn = QPushButton("Remove")
+        remove_btn.setToolTip("Remove selected rows")
+        remove_btn.clicked.connect(self.remove_selected)
+        header_layout.addWidget(remove_btn)
+
+        paste_btn = QPushButton("📋 Paste")
+        paste_btn.setToolTip("Import CSV/TSV rows or raidcom get ldev output from the clipboard")
+        paste_btn.clicked.connect(self.paste_luns)
+        header_layout.addWidget(paste_btn)
+
+        import_btn = QPushButton("📂 Import...")
+        import_btn.setToolTip("Import a CSV/TSV file (group, name, ldev) or saved raidcom output")
+        import_btn.clicked.connect(self.import_file)
+        header_layout.addWidget(import_btn)
         
         layout.addLayout(header_layout)
-        
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.NoFrame)
-        scroll.setMinimumHeight(300)
-        
-        scroll_widget = QWidget()
-        self.lun_container = QVBoxLayout(scroll_widget)
-        self.lun_container.setSpacing(8)
-        self.lun_container.addStretch()
-        scroll.setWidget(scroll_widget)
-        
-        layout.addWidget(scroll)
+
+        self.validator = HORCMInputValidator()
+        self.model = LUNTableModel(self)
+        self.model.rowsInserted.connect(self.revalidate)
+        self.model.rowsRemoved.connect(self.revalidate)
+        self.model.modelReset.connect(self.revalidate)
+        self.model.edited.connect(self.revalidate)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setMinimumHeight(300)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed |
+                                   QAbstractItemView.AnyKeyPressed)
+        QShortcut(QKeySequence.Paste, self.table, self.paste_luns, context=Qt.WidgetShortcut)
+        QShortcut(QKeySequence.Delete, self.table, self.remove_selected, context=Qt.WidgetShortcut)
+        layout.addWidget(self.table)
+
         self.setLayout(layout)
         
         self.add_lun()
+
+    def revalidate(self):
+        """Validuoja visą lentelę po kiekvieno pakeitimo ir pažymi probleminės eilutes"""
+        issues = self.validator.validate_luns(self.model.rows)
+        self.model.set_issues(issues)
+        text = f"Configured LUNs ({self.model.rowCount()})"
+        if issues:
+            text += f" · {len(issues)} with issues"
+        self.header_label.setText(text)
         
     def add_lun(self):
-        """Prideda naują LUN įrašą"""
-        lun = LUNEntry()
-        lun.removed.connect(self.remove_lun)
-        self.lun_container.insertWidget(self.lun_container.count() - 1, lun)
-        
-    def remove_lun(self, lun):
-        """Pašalina LUN įrašą"""
-        if self.lun_container.count() > 2:  # >2 because of stretch
-            lun.deleteLater()
+        """Prideda naują tuščią LUN eilutę"""
+        self.model.add_empty_row()
+        index = self.model.index(self.model.rowCount() - 1, 0)
+        self.table.setCurrentIndex(index)
+        self.table.scrollTo(index)
+        
+    def remove_selected(self):
+        """Pašalina pažymėtas eilutes"""
+        rows = {index.row() for index in self.table.selectionModel().selectedRows()}
+        if not rows and self.table.currentIndex().isValid():
+            rows = {self.table.currentIndex().row()}
+        if rows:
+            self.model.remove_rows(rows)
+
+    def import_text(self, text: str):
+        """Importuoja LUN iš CSV/TSV ar raidcom teksto"""
+        if LUNImporter.is_raidcom(text):
+            group, ok = QInputDialog.getText(self, "Import raidcom output", "Device group for imported LDEVs:",
+                                             text=LUNTableModel.PLACEHOLDERS["group"])
+            if not ok or not group.strip():
+                return
+            luns = LUNImporter.parse_raidcom(text, group.strip())
         else:
-            QMessageBox.warning(self, "Warning", "Cannot remove the last LUN entry!")
+            luns = LUNImporter.parse_table(text)
+
+        if not luns:
+            QMessageBox.warning(self, "Import", "No LUN rows found in the input")
+            return
+        self.model.append_rows(luns)
+
+    def paste_luns(self):
+        text = QApplication.clipboard().text()
+        if not text or text.isspace():
+            QMessageBox.warning(self, "Error", "Clipboard is empty")
+            return
+        self.import_text(text)
+
+    def import_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import LUN list", "",
+                                              "LUN lists (*.csv *.tsv *.txt);;All files (*)")
+        if not path:
+            return
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to read {path}: {str(e)}")
+            return
+        self.import_text(text)
             
     def validate_luns(self) -> tuple[bool, str, list]:
         """Validuoja visus LUN įrašus"""
-        lun_entries = []
-        has_any_input = False
-        
-        for i in range(self.lun_container.count() - 1):
-            widget = self.lun_container.itemAt(i).widget()
-            if isinstance(widget, LUNEntry):
-                lun_entries.append(widget)
-                if widget.has_any_input():
-                    has_any_input = True
-
-        if not has_any_input:
-            return True, "", [lun_entries[0].get_values()]
-            
-        valid_luns = []
-        for lun in lun_entries:
-            if not lun.is_empty() and not lun.is_fully_filled():
-                return False, "Some LUN entries are partially filled. Please fill all fields or leave them empty.", []
-            if lun.is_fully_filled():
-                valid_luns.append(lun.get_values())
-
-        if not valid_luns:
-            return False, "No valid LUN entries found. Please fill all required fields.", []
-            
-        return True, "", valid_luns
+        return self.model.validate()
             
     def get_lun_values(self) -> list:
         """Grąžina validžių LUN įrašų sąrašą"""
@@ -1408,103 +4070,1195 @@ class LUNConfigurationGroup(QGroupBox):
             
         return valid_luns
 
+class LDEVSpec:
+    """LDEV aprašas: vienas LDEV arba intervalas, dešimtainis ar CU:LDEV (hex) pavidalu"""
+    MAX_LDEV = 0xFFFF
+    CU_PATTERN = re.compile(r'^(?:0x)?([0-9A-Fa-f]{1,2}):(?:0x)?([0-9A-Fa-f]{1,2})$')
+
+    def __init__(self, text: str):
+        self.text = text.strip()
+        first, sep, last = self.text.partition('-')
+        self.start, self.hex_format = self._parse_one(first)
+        if sep:
+            self.stop, stop_hex = self._parse_one(last)
+            if stop_hex != self.hex_format:
+                raise ValueError(f"LDEV range mixes decimal and CU:LDEV notation: {self.text}")
+        else:
+            self.stop = self.start
+        if self.stop < self.start:
+            raise ValueError(f"LDEV range end is lower than its start: {self.text}")
+
+    @classmethod
+    def _parse_one(cls, value: str) -> Tuple[int, bool]:
+        value = value.strip()
+        if value.isdigit():
+            number, hex_format = int(value), False
+        else:
+            match = cls.CU_PATTERN.match(value)
+            if not match:
+                raise ValueError(f"LDEV must be a number, CU:LDEV (0x00:0x1A) or a range of them: {value}")
+            number, hex_format = int(match.group(1), 16) * 256 + int(match.group(2), 16), True
+        if number > cls.MAX_LDEV:
+            raise ValueError(f"LDEV number out of range (0-{cls.MAX_LDEV}): {value}")
+        return number, hex_format
+
+    def __len__(self) -> int:
+        return self.stop - self.start + 1
+
+    def format(self, number: int) -> str:
+        """LDEV tekstas HORCM_LDEV eilutei toje pačioje notacijoje kaip įvestis"""
+        if self.hex_format:
+            return f"{number >> 8:02X}:{number & 0xFF:02X}"
+        return str(number)
+
+    def __iter__(self):
+        """Grąžina (eilės nr. nuo 1, LDEV nr.) poras, nesukuriant sąrašo"""
+        return enumerate(range(self.start, self.stop + 1), 1)
+
+class HORCMInputValidator:
+    """HORCM įvesties validacija vienu perėjimu su maišos aibėmis; grąžina visas klaidas iš karto"""
+    NAME_PATTERN = re.compile(r'^[^\s#\-][^\s#]{0,30}$')
+    SERIAL_PATTERN = re.compile(r'^\d{6}$')
+    MESSAGE_LIMIT = 20
+
+    def validate_endpoints(self, server_ip: str, vsp1: dict, vsp2: dict) -> List[str]:
+        """Tikrina IP adresus ir serijos numerius"""
+        issues = []
+        for label, ip in (("HORCM server", server_ip), ("VSP1", vsp1['ip']), ("VSP2", vsp2['ip'])):
+            try:
+                ipaddress.IPv4Address(ip)
+            except ValueError:
+                issues.append(f"{label}: invalid IP address format: {ip}")
+        for label, vsp in (("VSP1", vsp1), ("VSP2", vsp2)):
+            if not self.SERIAL_PATTERN.match(vsp['serial']):
+                issues.append(f"{label}: serial number must be 6 digits: {vsp['serial']}")
+        if vsp1['serial'] and vsp1['serial'] == vsp2['serial']:
+            issues.append(f"VSP1 and VSP2 have the same serial number {vsp1['serial']}: "
+                          f"groups of both files would address the same array")
+        return issues
+
+    def check_name(self, label: str, value: str, problems: List[str]):
+        if not self.NAME_PATTERN.match(value):
+            problems.append(f"{label} '{value}' must be 1-31 characters without spaces or '#' "
+                            f"and must not start with '-'")
+
+    def validate_luns(self, rows: List[dict]) -> Dict[int, List[str]]:
+        """Tikrina LUN eilutes; grąžina eilutės indeksas → problemos. Tuščios eilutės praleidžiamos."""
+        issues: Dict[int, List[str]] = {}
+        owners = array('I', [0]) * (LDEVSpec.MAX_LDEV + 1)  # LDEV → eilutė + 1
+        devices: Dict[Tuple[str, str], int] = {}
+        groups: Dict[str, Tuple[str, int]] = {}
+
+        for index, row in enumerate(rows):
+            if not any(row.values()):
+                continue
+            problems = []
+            group, name, ldev = row['group'], row['name'], row['ldev']
+            missing = [label for label, value in (("group", group), ("name", name), ("LDEV", ldev)) if not value]
+            if missing:
+                problems.append(f"missing {', '.join(missing)}")
+
+            if group:
+                self.check_name("Group", group, problems)
+                # Grupės, besiskiriančios tik raidžių dydžiu, HORCM_INST sekcijoje susikerta
+                first = groups.setdefault(group.lower(), (group, index))
+                if first[0] != group:
+                    problems.append(f"group '{group}' differs only by case from '{first[0]}' in row {first[1] + 1}")
+
+            if name and not HORCMConfigGenerator.is_template(name):
+                self.check_name("Device name", name, problems)
+
+            spec = None
+            if ldev:
+                try:
+                    spec = LDEVSpec(ldev)
+                    if name:
+                        HORCMConfigGenerator.check_name(name, spec)
+                except ValueError as e:
+                    problems.append(str(e))
+                    spec = None
+
+            if spec is not None and group and name:
+                template = HORCMConfigGenerator.is_template(name)
+                ldev_clashes = []
+                name_clash = None
+                device = name
+                for n, number in spec:
+                    owner = owners[number]
+                    if owner:
+                        ldev_clashes.append((number, owner))
+                    else:
+                        owners[number] = index + 1
+                    if template:
+                        device = name.format(n=n, ldev=number)
+                        if n == 1:
+                            self.check_name("Device name", device, problems)
+                    previous = devices.setdefault((group, device), index)
+                    if previous != index and name_clash is None:
+                        name_clash = (device, previous)
+                if template and len(spec) > 1:
+                    # Paskutinis vardas gali būti ilgesnis už pirmąjį ({n} skaitmenų daugėja)
+                    self.check_name("Device name", device, problems)
+
+                if ldev_clashes:
+                    number, owner = ldev_clashes[0]
+                    more = f" (+{len(ldev_clashes) - 1} more)" if len(ldev_clashes) > 1 else ""
+                    problems.append(f"LDEV {spec.format(number)} already used in row {owner}{more}")
+                if name_clash:
+                    device, previous = name_clash
+                    problems.append(f"device name '{device}' already used in group '{group}' (row {previous + 1})")
+
+            if problems:
+                issues[index] = problems
+        return issues
+
+    def validate(self, server_ip: str, vsp1: dict, vsp2: dict, rows: List[dict]) -> List[str]:
+        """Visos klaidos su eilučių nuorodomis"""
+        issues = self.validate_endpoints(server_ip, vsp1, vsp2)
+        if not any(any(row.values()) for row in rows):
+            issues.append("At least one LUN configuration is required")
+        for index, problems in sorted(self.validate_luns(rows).items()):
+            issues.extend(f"Row {index + 1}: {problem}" for problem in problems)
+        return issues
+
+    def format_issues(self, issues: List[str]) -> str:
+        text = "\n".join(issues[:self.MESSAGE_LIMIT])
+        if len(issues) > self.MESSAGE_LIMIT:
+            text += f"\n... and {len(issues) - self.MESSAGE_LIMIT} more"
+        return text
+
+class HORCMTemplate:
+    """Vieną kartą išnagrinėtas ir patikrintas HORCM teksto šablonas ({laukas} sintaksė)"""
+    # Podėlyje laikomi tik klasių konstantų (nesusietų) šablonai; bind() rezultatai nekaupiami
+    _cache: Dict[str, 'HORCMTemplate'] = {}
+
+    class _KeepMissing(dict):
+        def __missing__(self, key):
+            return "{" + key + "}"
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts = list(string.Formatter().parse(text))
+        self.fields = {name for _, name, _, _ in self.parts if name}
+        # Atvaizdavimas – tiesioginis C lygio str.format
+        self.render = text.format
+        self._functions: Dict[Tuple[str, ...], object] = {}
+
+    @classmethod
+    def compile(cls, text: str) -> 'HORCMTemplate':
+        template = cls._cache.get(text)
+        if template is None:
+            template = cls._cache[text] = cls(text)
+        return template
+
+    def bind(self, **params) -> 'HORCMTemplate':
+        """Įrašo dalį parametrų (pvz. instancijos) ir grąžina likusių laukų šabloną (nekaupiamas)"""
+        values = {key: str(value).replace("{", "{{").replace("}", "}}") for key, value in params.items()}
+        return HORCMTemplate(self.text.format_map(self._KeepMissing(values)))
+
+    def function(self, *names: str):
+        """Grąžina funkciją su poziciniais str argumentais (karštam ciklui).
+
+        Vardiniai laukai perrašomi poziciniais ({0}, {1}, ...), todėl kviečiamas tiesioginis str.format.
+        """
+        function = self._functions.get(names)
+        if function is None:
+            pieces = []
+            for literal, name, spec, conversion in self.parts:
+                pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+                if name is not None:
+                    if name not in names or spec or conversion:
+                        raise ValueError(f"Template field '{name}' cannot be compiled")
+                    pieces.append("{" + str(names.index(name)) + "}")
+            function = self._functions[names] = "".join(pieces).format
+        return function
+
+@dataclass
+class HORCMSettings:
+    """HORCM_MON, servisų, MU# ir komandų įrenginių sintaksės parametrai"""
+    CMD_SYNTAX = {
+        "windows": "\\\\.\\CMD-{serial}-{ldev}",
+        "linux": "\\\\.\\CMD-{serial}-{ldev}:/dev/sd",
+    }
+
+    poll: int = 1000
+    timeout: int = 3000
+    service_base: int = 5000
+    mu: str = "0"
+    cmd_syntax: str = "windows"
+    # Instancijos nr. → {'poll': .., 'timeout': ..} (pvz. iš vėlinimo matavimų)
+    instance_overrides: Dict[int, dict] = field(default_factory=dict)
+
+    def service(self, instance: int) -> int:
+        return self.service_base + instance
+
+    def for_instance(self, instance: int) -> dict:
+        values = {'poll': self.poll, 'timeout': self.timeout, 'cmd_syntax': self.cmd_syntax}
+        values.update(self.instance_overrides.get(instance, {}))
+        return values
+
 class HORCMConfigGenerator:
     """HORCM konfigūracijos generavimo klasė"""
     def __init__(self):
-        self.re = __import__('re')
+        self.validator = HORCMInputValidator()
     
+    @staticmethod
+    def is_template(name: str) -> bool:
+        return '{' in name
+
+    @classmethod
+    def check_name(cls, name: str, spec: LDEVSpec):
+        """Vardo šablonas ({n:03}, {ldev}) privalomas LDEV intervalams"""
+        if cls.is_template(name):
+            try:
+                name.format(n=1, ldev=spec.start)
+            except (KeyError, IndexError, ValueError, AttributeError) as e:
+                raise ValueError(f"Invalid device name template '{name}': use {{n}} or {{ldev}} fields ({e})")
+        elif len(spec) > 1:
+            raise ValueError(f"Device name for LDEV range {spec.text} must be a template, e.g. {name}_{{n:03}}")
+
+    def check_lun(self, lun: dict) -> LDEVSpec:
+        """Validuoja vieną LUN eilutę ir grąžina jos LDEV aprašą"""
+        if not lun["group"]:
+            raise ValueError("Group ID cannot be empty")
+        if not lun["name"]:
+            raise ValueError("Device name cannot be empty")
+        spec = LDEVSpec(lun["ldev"])
+        self.check_name(lun["name"], spec)
+        return spec
+
+    def iter_devices(self, luns: list):
+        """Išskleidžia LUN eilutes į (grupė, įrenginys, LDEV nr., LDEV tekstas) tik pagal poreikį"""
+        for lun in luns:
+            spec = self.check_lun(lun)
+            group, name = lun['group'], lun['name']
+            if not self.is_template(name):
+                yield group, name, spec.start, spec.format(spec.start)
+                continue
+            for n, number in spec:
+                yield group, name.format(n=n, ldev=number), number, spec.format(number)
+
     def validate_inputs(self, server_ip: str, vsp1: dict, vsp2: dict, luns: list) -> bool:
-        """Validuoja įvesties duomenis"""
-        # IP adresų validacija
-        ip_pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-        for ip in [server_ip, vsp1['ip'], vsp2['ip']]:
-            if not self.re.match(ip_pattern, ip):
-                raise ValueError(f"Invalid IP address format: {ip}")
-
-        # Serijos numerių validacija
-        for serial in [vsp1['serial'], vsp2['serial']]:
-            if not serial.isdigit() or len(serial) != 6:
-                raise ValueError(f"Serial number must be 6 digits: {serial}")
-
-        # LUN validacija
+        """Validuoja įvesties duomenis; ValueError praneša visas rastas klaidas"""
+        issues = self.validator.validate(server_ip, vsp1, vsp2, luns)
+        if issues:
+            raise ValueError(self.validator.format_issues(issues))
+        return True
+
+    HEADER_TEMPLATE = (
+        "HORCM_MON\n"
+        "# ip_address service poll(10ms) timeout(10ms)\n"
+        "{server_ip}    {service}    {poll}       {timeout}\n"
+        "\n"
+        "HORCM_CMD\n"
+        "# {label} (Serial No.: {serial})\n"
+        "{cmd_line}\n"
+        "\n"
+        "HORCM_LDEV\n"
+        "# DeviceGroup, DeviceName, Serial#, CU:LDEV(LDEV#), MU#\n"
+    )
+    LDEV_TEMPLATE = "{group}    {device}    {serial}    {ldev}{mu}\n"
+    INST_HEADER = "\nHORCM_INST\n# DeviceGroup         ip_address      service\n"
+    INST_TEMPLATE = "{group}    {server_ip}    {service}\n"
+
+    def conf_header(self, params: dict) -> str:
+        # Keli komandų įrenginiai vienoje eilutėje – alternatyvūs keliai tai pačiai instancijai
+        cmd = HORCMTemplate.compile(HORCMSettings.CMD_SYNTAX[params['cmd_syntax']])
+        cmd_line = " ".join(cmd.render(serial=params['serial'], ldev=ldev) for ldev in params['cmd_ldevs'])
+        return HORCMTemplate.compile(self.HEADER_TEMPLATE).render(cmd_line=cmd_line, **params)
+
+    def conf_footer(self, server_ip: str, groups: list, inst_service: int) -> str:
+        inst = HORCMTemplate.compile(self.INST_TEMPLATE).bind(server_ip=server_ip, service=inst_service)
+        return self.INST_HEADER + "".join(inst.render(group=group) for group in groups)
+
+    def instance_params(self, plan: 'HORCMShardPlan', settings: 'HORCMSettings', server_ip: str,
+                        vsp: dict, label: str, shard: int, side: int) -> dict:
+        """Vienos instancijos šablono parametrai"""
+        instance = plan.instances(shard)[side]
+        return dict(settings.for_instance(instance), server_ip=server_ip, label=label, serial=vsp['serial'],
+                    service=settings.service(instance), cmd_ldevs=plan.cmd_devices(shard, side))
+
+    @staticmethod
+    def plan_shards(luns: list, vsp1: dict, vsp2: dict, shards: int = 1,
+                    cmd_per_instance: int = 1) -> 'HORCMShardPlan':
+        """Sudaro instancijų planą; komandų įrenginiai imami iš vsp['cmd_ldevs'] (jei nurodyti)"""
         if not luns:
             raise ValueError("At least one LUN configuration is required")
+        cmd_ldevs = (HORCMShardPlan.parse_cmd_ldevs(vsp1.get('cmd_ldevs', '')),
+                     HORCMShardPlan.parse_cmd_ldevs(vsp2.get('cmd_ldevs', '')))
+        return HORCMShardPlan(luns, shards, cmd_per_instance, cmd_ldevs)
+
+    def write_confs(self, server_ip: str, vsp1: dict, vsp2: dict, luns: list,
+                    plan: 'HORCMShardPlan', outputs: Dict[str, object],
+                    settings: Optional['HORCMSettings'] = None) -> int:
+        """Vienu LUN perėjimu rašo visų instancijų conf failus (outputs: failo vardas → rašytuvas).
+
+        Grąžina LDEV eilučių skaičių viename masyve. LUN eilutės validuojamos to paties
+        perėjimo metu; klaida nutraukia rašymą.
+        """
+        settings = settings or HORCMSettings()
+        mu = f"    {settings.mu}" if settings.mu else ""
+        ldev_template = HORCMTemplate.compile(self.LDEV_TEMPLATE)
+        sides = ((vsp1, "VSP1"), (vsp2, "VSP2"))
+        shard_outputs = []
+        for shard in range(plan.shards):
+            # Instancijos parametrai įrašomi į eilutės šabloną vieną kartą; liko tik įrenginio laukai
+            writers = []
+            for side, name in enumerate(plan.file_names(shard)):
+                vsp, label = sides[side]
+                outputs[name].write(self.conf_header(
+                    self.instance_params(plan, settings, server_ip, vsp, label, shard, side)))
+                line = ldev_template.bind(serial=vsp['serial'], mu=mu).function("group", "device", "ldev")
+                writers.append((outputs[name].write, line))
+            shard_outputs.append(writers)
+
+        shard_groups = [set() for _ in shard_outputs]
+        count = 0
+        for group, device, _, ldev in self.iter_devices(luns):
+            shard = plan.shard_of(group)
+            shard_groups[shard].add(group)
+            for write, render in shard_outputs[shard]:
+                write(render(group, device, ldev))
+            count += 1
+
+        for shard, writers in enumerate(shard_outputs):
+            primary, secondary = plan.instances(shard)
+            ordered = sorted(shard_groups[shard])
+            writers[0][0](self.conf_footer(server_ip, ordered, settings.service(secondary)))
+            writers[1][0](self.conf_footer(server_ip, ordered, settings.service(primary)))
+        return count
+
+    def save_confs(self, directory: str, server_ip: str, vsp1: dict, vsp2: dict, luns: list,
+                   shards: int = 1, cmd_per_instance: int = 1,
+                   settings: Optional['HORCMSettings'] = None) -> Tuple[int, List[str]]:
+        """Rašo visus failus į laikinus failus tame pačiame kataloge ir pakeičia juos kaip vieną rinkinį"""
+        plan = self.plan_shards(luns, vsp1, vsp2, shards, cmd_per_instance)
+        names = plan.all_file_names()
+        targets = [os.path.join(directory, name) for name in names]
+        temps = []
+        try:
+            for target in targets:
+                fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(target)}.", suffix=".tmp",
+                                                 dir=directory)
+                temps.append((os.fdopen(fd, 'w', buffering=1 << 18), temp_path))
+            count = self.write_confs(server_ip, vsp1, vsp2, luns, plan,
+                                     {name: handle for name, (handle, _) in zip(names, temps)}, settings)
+            for (handle, temp_path), target in zip(temps, targets):
+                handle.flush()
+                os.fsync(handle.fileno())
+                handle.close()
+                # mkstemp sukuria 0600 failą; išlaikome esamo failo teises
+                if os.path.exists(target):
+                    shutil.copymode(target, temp_path)
+                else:
+                    os.chmod(temp_path, 0o644)
+            self.replace_all([temp_path for _, temp_path in temps], targets)
+            return count, names
+        except BaseException:
+            for handle, temp_path in temps:
+                handle.close()
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            raise
 
+    @staticmethod
+    def replace_all(temp_paths: List[str], targets: List[str]):
+        """Pakeičia visus failus; nepavykus bet kuriam, jau pakeisti atstatomi iš atsarginių kopijų.
+
+        Kiekvienas os.replace atominis tik vienam failui, todėl prieš keitimą esami failai
+        nukopijuojami. Klaidos atveju grąžinamas visas ankstesnis rinkinys.
+        """
+        backups: Dict[str, Optional[str]] = {}
+        replaced = []
+        try:
+            for target in targets:
+                backups[target] = None
+                if os.path.exists(target):
+                    fd, backup = tempfile.mkstemp(prefix=f".{os.path.basename(target)}.", suffix=".bak",
+                                                  dir=os.path.dirname(target))
+                    os.close(fd)
+                    backups[target] = backup
+                    shutil.copy2(target, backup)
+            for temp_path, target in zip(temp_paths, targets):
+                os.replace(temp_path, target)
+                replaced.append(target)
+        except BaseException:
+            for target in reversed(replaced):
+                try:
+                    if backups[target]:
+                        os.replace(backups[target], target)
+                        backups[target] = None
+                    else:
+                        os.remove(target)
+                except OSError as e:
+                    logging.error(f"Failed to restore {target}: {str(e)}")
+            raise
+        finally:
+            for backup in backups.values():
+                if backup and os.path.exists(backup):
+                    os.remove(backup)
+
+class HORCMPreviewRenderer:
+    """Peržiūros generavimas darbinėje gijoje: validacija ir conf tekstas, suskaidytas į sekcijas"""
+    SECTION_SPLIT = re.compile(r'^(?=HORCM_)', re.MULTILINE)
+
+    def __init__(self, generator: HORCMConfigGenerator, limit: int):
+        self.generator = generator
+        self.limit = limit
+
+    def render(self, data: dict) -> Tuple[List[Tuple[tuple, str]], List[str]]:
+        """Grąžina ((failas, sekcija), tekstas) sąrašą arba validacijos klaidas"""
+        validator = self.generator.validator
+        issues = validator.validate(data['server_ip'], data['vsp1'], data['vsp2'], data['rows'])
+        if issues:
+            return [], issues
+        try:
+            plan = self.generator.plan_shards(data['luns'], data['vsp1'], data['vsp2'], **data['instances'])
+            sinks = {name: ConfPreviewSink(self.limit) for name in plan.all_file_names()}
+            self.generator.write_confs(data['server_ip'], data['vsp1'], data['vsp2'], data['luns'], plan, sinks,
+                                       data.get('settings'))
+        except ValueError as e:
+            return [], [str(e)]
+
+        sections = []
+        for position, (name, sink) in enumerate(sinks.items()):
+            title = f"=== {name.replace('horcm', 'HORCM')} ===\n"
+            sections.append(((name, ""), title if position == 0 else "\n" + title))
+            for part in self.SECTION_SPLIT.split(sink.text()):
+                if part:
+                    sections.append(((name, part.split("\n", 1)[0]), part))
+        return sections, []
+
+class HORCMShardPlan:
+    """Grupių paskirstymas per HORCM instancijų poras ir komandų įrenginių priskyrimas"""
+    PRIMARY_BASE = 10
+    SECONDARY_BASE = 20
+    MAX_SHARDS = 10
+    MAX_CMD_PER_INSTANCE = 4
+
+    def __init__(self, luns: list, shards: int = 1, cmd_per_instance: int = 1,
+                 cmd_ldevs: Tuple[List[int], List[int]] = ([], [])):
+        if not 1 <= shards <= self.MAX_SHARDS:
+            raise ValueError(f"Instance pairs must be between 1 and {self.MAX_SHARDS}")
+        self.cmd_per_instance = max(1, min(cmd_per_instance, self.MAX_CMD_PER_INSTANCE))
+        self.cmd_ldevs = cmd_ldevs
+        self.group_shard: Dict[str, int] = {}
+        self.loads: List[int] = []
+
+        if shards == 1:
+            self.shards = 1
+            self.first_ldevs = [LDEVSpec(luns[0]['ldev']).start]
+            return
+
+        weights: Dict[str, int] = {}
+        first_ldev: Dict[str, int] = {}
         for lun in luns:
-            if not lun["group"]:
-                raise ValueError("Group ID cannot be empty")
-            if not lun["name"]:
-                raise ValueError("Device name cannot be empty")
-            if not lun["ldev"].isdigit():
-                raise ValueError("LDEV number must be numeric")
+            spec = LDEVSpec(lun['ldev'])
+            weights[lun['group']] = weights.get(lun['group'], 0) + len(spec)
+            first_ldev.setdefault(lun['group'], spec.start)
+
+        # Didžiausios grupės pirmiausia keliauja į mažiausiai apkrautą instanciją
+        self.shards = min(shards, len(weights))
+        heap = [(0, shard) for shard in range(self.shards)]
+        for group in sorted(weights, key=lambda g: (-weights[g], g)):
+            load, shard = heapq.heappop(heap)
+            self.group_shard[group] = shard
+            heapq.heappush(heap, (load + weights[group], shard))
+        self.loads = [load for load, _ in sorted(heap, key=lambda item: item[1])]
+
+        # Be nurodytų komandų įrenginių naudojamas pirmasis instancijos LDEV (kaip anksčiau)
+        self.first_ldevs = [None] * self.shards
+        for group, ldev in first_ldev.items():
+            shard = self.group_shard[group]
+            if self.first_ldevs[shard] is None:
+                self.first_ldevs[shard] = ldev
+
+    @staticmethod
+    def parse_cmd_ldevs(text: str) -> List[int]:
+        """Komandų įrenginių LDEV sąrašas: skaičiai, CU:LDEV ar intervalai, atskirti kableliais/tarpais"""
+        ldevs = []
+        for part in re.split(r'[,\s]+', text.strip()):
+            if part:
+                spec = LDEVSpec(part)
+                ldevs.extend(range(spec.start, spec.stop + 1))
+        return ldevs
+
+    def shard_of(self, group: str) -> int:
+        return self.group_shard.get(group, 0)
+
+    def instances(self, shard: int) -> Tuple[int, int]:
+        return self.PRIMARY_BASE + shard, self.SECONDARY_BASE + shard
+
+    def file_names(self, shard: int) -> Tuple[str, str]:
+        return tuple(f"horcm{instance}.conf" for instance in self.instances(shard))
+
+    def all_file_names(self) -> List[str]:
+        return [name for shard in range(self.shards) for name in self.file_names(shard)]
+
+    @classmethod
+    def stale_file_names(cls, directory: str, names: List[str]) -> List[str]:
+        """Kataloge likę ankstesnių (didesnių) planų horcm1x/2x.conf failai"""
+        current = set(names)
+        stale = []
+        for base in (cls.PRIMARY_BASE, cls.SECONDARY_BASE):
+            for shard in range(cls.MAX_SHARDS):
+                name = f"horcm{base + shard}.conf"
+                if name not in current and os.path.isfile(os.path.join(directory, name)):
+                    stale.append(name)
+        return stale
+
+    def cmd_devices(self, shard: int, side: int) -> List[int]:
+        """Instancijos komandų įrenginiai; bendras sąrašas skirstomas ratu tarp instancijų"""
+        pool = self.cmd_ldevs[side]
+        if not pool:
+            return [self.first_ldevs[shard]]
+        start = shard * self.cmd_per_instance
+        return [pool[(start + i) % len(pool)] for i in range(min(self.cmd_per_instance, len(pool)))]
+
+class ConfPreviewSink:
+    """Peržiūrai kaupia tik pirmas eilutes ir paskutinį įrašą (HORCM_INST sekciją), kitas tik suskaičiuoja"""
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.parts = []
+        self.lines = 0
+        self.hidden = 0
+        self.last = ""
+
+    def write(self, text: str):
+        if self.lines < self.limit:
+            self.parts.append(text)
+            self.lines += text.count("\n")
+            return
+        self.hidden += self.last.count("\n")
+        self.last = text
 
-        return True
+    def text(self) -> str:
+        text = "".join(self.parts)
+        if self.hidden:
+            text += f"... {self.hidden:,} more lines not shown (written in full when saved)\n"
+        return text + self.last
+
+@dataclass
+class HORCMDevice:
+    """Vienas HORCM_LDEV įrašas iš esamo conf failo"""
+    group: str
+    name: str
+    serial: str
+    ldev: int
+    mu: str
+    instance: Optional[int]
+    line: int
+    # LDEV taip, kaip parašyta faile (00:1A arba dešimtainis) - generatoriaus lentelei
+    ldev_text: str = ""
+
+@dataclass
+class HORCMConf:
+    """Išnagrinėtas horcmNN.conf failas"""
+    path: str
+    instance: Optional[int]
+    mon: dict = field(default_factory=dict)
+    cmd_devices: List[str] = field(default_factory=list)
+    devices: List[HORCMDevice] = field(default_factory=list)
+    inst: List[Tuple[str, str, str]] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def serials(self) -> List[str]:
+        return list(dict.fromkeys(device.serial for device in self.devices))
+
+    @property
+    def groups(self) -> List[str]:
+        return list(dict.fromkeys(device.group for device in self.devices))
+
+    def cmd_ldevs(self) -> List[int]:
+        """LDEV numeriai iš Windows formato komandų įrenginių (\\\\.\\CMD-serial-ldev)"""
+        ldevs = []
+        for device in self.cmd_devices:
+            match = HORCMConfParser.CMD_LDEV_PATTERN.search(device)
+            if match:
+                ldevs.append(int(match.group(1)))
+        return ldevs
+
+    def settings(self, defaults: Optional['HORCMSettings'] = None) -> 'HORCMSettings':
+        """Generatoriaus parametrai iš HORCM_MON, HORCM_CMD ir HORCM_LDEV; nerasti lieka numatytieji"""
+        settings = replace(defaults or HORCMSettings(), instance_overrides={})
+        for key in ('poll', 'timeout'):
+            value = self.mon.get(key, '')
+            if value.isdigit():
+                setattr(settings, key, int(value))
+        service = self.mon.get('service', '')
+        if service.isdigit() and self.instance is not None:
+            settings.service_base = int(service) - self.instance
+        if self.devices:
+            settings.mu = self.devices[0].mu
+        if self.cmd_devices:
+            settings.cmd_syntax = "linux" if self.cmd_devices[0].lower().endswith(":/dev/sd") else "windows"
+        return settings
+
+class HORCMConfParser:
+    """Esamų horcm*.conf failų nagrinėjimas: HORCM_MON, HORCM_CMD, HORCM_LDEV ir HORCM_INST(P)"""
+    SECTION_PATTERN = re.compile(r'^HORCM_[A-Z_]+$')
+    FILE_PATTERN = re.compile(r'^horcm(\d+)\.conf$', re.IGNORECASE)
+    CMD_LDEV_PATTERN = re.compile(r'CMD-\d+-(\d+)', re.IGNORECASE)
+
+    @classmethod
+    def instance_of(cls, path: str) -> Optional[int]:
+        match = cls.FILE_PATTERN.match(os.path.basename(path))
+        return int(match.group(1)) if match else None
+
+    @staticmethod
+    def parse_ldev(token: str) -> int:
+        """LDEV: dešimtainis, CU:LDEV (00:1A) arba 0x1A3F"""
+        if token.lower().startswith('0x') and ':' not in token:
+            return int(token, 16)
+        return LDEVSpec(token).start
+
+    @staticmethod
+    def ldev_text(token: str, ldev: int) -> str:
+        """LDEV tekstas generatoriui: CU:LDEV ir dešimtainis lieka, 0x1A3F rašomas kaip 1A:3F"""
+        if token.lower().startswith('0x') and ':' not in token:
+            return f"{ldev >> 8:02X}:{ldev & 0xFF:02X}"
+        return token
+
+    def parse_file(self, path: str) -> HORCMConf:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return self.parse(f.read(), path)
+
+    def parse(self, text: str, path: str = "") -> HORCMConf:
+        instance = self.instance_of(path) if path else None
+        conf = HORCMConf(path=path, instance=instance)
+        section = None
+        for number, raw in enumerate(text.splitlines(), 1):
+            line = raw.split('#', 1)[0].strip()
+            if not line:
+                continue
+            if self.SECTION_PATTERN.match(line):
+                section = line
+                continue
+            fields = line.split()
+            try:
+                if section == 'HORCM_MON':
+                    if len(fields) < 4:
+                        raise ValueError("expected ip_address service poll timeout")
+                    conf.mon = {'ip': fields[0], 'service': fields[1], 'poll': fields[2], 'timeout': fields[3]}
+                elif section == 'HORCM_CMD':
+                    conf.cmd_devices.extend(fields)
+                elif section == 'HORCM_LDEV':
+                    if len(fields) < 4:
+                        raise ValueError("expected group name serial ldev [MU#]")
+                    ldev = self.parse_ldev(fields[3])
+                    conf.devices.append(HORCMDevice(fields[0], fields[1], fields[2], ldev,
+                                                    fields[4] if len(fields) > 4 else "", instance, number,
+                                                    self.ldev_text(fields[3], ldev)))
+                elif section in ('HORCM_INST', 'HORCM_INSTP'):
+                    # HORCM_INSTP turi papildomą pathID stulpelį
+                    if len(fields) < 3:
+                        raise ValueError("expected group ip_address service")
+                    conf.inst.append((fields[0], fields[1], fields[2]))
+            except ValueError as e:
+                conf.errors.append(f"line {number}: {e}")
+        return conf
+
+class HORCMConfIndex:
+    """Esamų HORCM konfigūracijų indeksas pagal grupę, serijos nr. ir LDEV"""
+    def __init__(self):
+        self.confs: List[HORCMConf] = []
+        self.by_group: Dict[str, List[HORCMDevice]] = {}
+        self.by_device: Dict[Tuple[str, int], List[HORCMDevice]] = {}
+        self.by_serial: Dict[str, List[HORCMDevice]] = {}
+        self.group_instances: Dict[str, List[int]] = {}
+
+    @classmethod
+    def load_directory(cls, directory: str, executor: ThreadPoolExecutor) -> 'HORCMConfIndex':
+        """Įkelia visus horcm*.conf iš katalogo lygiagrečiai pateiktame fonde.
+        Negalima kviesti iš to paties fondo gijos - laukiant savo užduočių fondas gali užsiblokuoti"""
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                       if HORCMConfParser.FILE_PATTERN.match(name))
+        parser = HORCMConfParser()
+        confs = list(executor.map(parser.parse_file, paths))
+        index = cls()
+        for conf in confs:
+            index.add(conf)
+        return index
+
+    def add(self, conf: HORCMConf):
+        self.confs.append(conf)
+        for device in conf.devices:
+            self.by_group.setdefault(device.group, []).append(device)
+            self.by_device.setdefault((device.serial, device.ldev), []).append(device)
+            self.by_serial.setdefault(device.serial, []).append(device)
+            if conf.instance is not None:
+                instances = self.group_instances.setdefault(device.group, [])
+                if conf.instance not in instances:
+                    instances.append(conf.instance)
+
+    def groups(self) -> List[str]:
+        """Autoritetingas grupių sąrašas"""
+        return sorted(self.by_group)
+
+    def lookup(self, serial: str, ldev: int) -> List[HORCMDevice]:
+        return self.by_device.get((serial, ldev), [])
+
+    def devices_in_group(self, group: str) -> List[HORCMDevice]:
+        return self.by_group.get(group, [])
+
+    def instance_pair(self, group: str) -> Optional[Tuple[int, int]]:
+        """Grupės (VSP1, VSP2) instancijos: mažesnė ją aprašanti instancija ir jos partneris"""
+        instances = sorted(self.group_instances.get(group, []))
+        if not instances:
+            return None
+        if len(instances) > 1:
+            return instances[0], instances[-1]
+        conf = next(c for c in self.confs if c.instance == instances[0])
+        partner = self.partner_of(conf)
+        if partner is None or partner.instance is None:
+            return None
+        return tuple(sorted((instances[0], partner.instance)))
+
+    def poll_targets(self, default: Tuple[str, str]) -> List[Tuple[str, Tuple[str, str]]]:
+        """(grupė, instancijos) kiekvienai grupei per ją aprašančią instancijų porą"""
+        targets = []
+        for group in self.groups():
+            pair = self.instance_pair(group)
+            targets.append((group, (f"-IH{pair[0]}", f"-IH{pair[1]}") if pair else default))
+        return targets
+
+    def partner_of(self, conf: HORCMConf) -> Optional[HORCMConf]:
+        """Instancija, į kurią rodo HORCM_INST (pagal servisą)"""
+        services = {service for _, _, service in conf.inst}
+        for other in self.confs:
+            if other is not conf and other.mon.get('service') in services:
+                return other
+        return None
+
+    @property
+    def error_count(self) -> int:
+        return sum(len(conf.errors) for conf in self.confs)
+
+class HORCMPairCrossCheck:
+    """Generatoriaus LUN ir gyvų porų sugretinimas maišos jungtimi pagal (serial, LDEV)"""
+    NOT_PAIRED = "Configured, not paired"
+    NOT_CONFIGURED = "Paired, missing from conf"
+    MISMATCH = "Mismatch"
+
+    def __init__(self, generator: HORCMConfigGenerator):
+        self.generator = generator
+        self.device_count = 0
+
+    def run(self, luns: list, serials: Tuple[str, str], pairs: List[GADPair]) -> List[tuple]:
+        """Grąžina (problema, serial, LDEV, conf įrenginys, pora, aprašas) eilutes; O(LDEV + porų)"""
+        index: Dict[Tuple[str, int], GADPair] = {}
+        for pair in pairs:
+            for storage in (pair.left_storage, pair.right_storage):
+                if storage.ldev_number.isdigit():
+                    index[(storage.serial_number, int(storage.ldev_number))] = pair
+
+        results = []
+        matched = set()
+        self.device_count = 0
+        for group, device, number, ldev in self.generator.iter_devices(luns):
+            self.device_count += 1
+            conf_device = f"{group}/{device}"
+            hits = [index.get((serial, number)) for serial in serials]
+            if hits[0] is None and hits[1] is None:
+                results.append((self.NOT_PAIRED, f"{serials[0]}/{serials[1]}", ldev, conf_device, "",
+                                "LDEV not found in any pair on either array"))
+                continue
+
+            for pair in {id(pair): pair for pair in hits if pair is not None}.values():
+                matched.add(pair.pair_id)
+                if pair.group != group or pair.name != device:
+                    field_name = "group and name" if pair.group != group and pair.name != device else \
+                        "group" if pair.group != group else "name"
+                    results.append((self.MISMATCH, self.serial_of(pair, number, serials), ldev, conf_device,
+                                    pair.pair_id, f"{field_name} differs"))
+
+            # Conf naudoja tą patį LDEV abiejuose masyvuose; pora gali būti sukurta su kitu
+            for side, hit in enumerate(hits):
+                other = hits[1 - side]
+                if hit is not None and other is None:
+                    partner = self.partner_ldev(hit, serials[1 - side])
+                    if partner is not None:
+                        results.append((self.MISMATCH, serials[1 - side], ldev, conf_device, hit.pair_id,
+                                        f"pair uses LDEV {partner} on {serials[1 - side]}"))
+
+        configured_serials = set(serials)
+        for pair in pairs:
+            if pair.pair_id in matched:
+                continue
+            for storage in (pair.left_storage, pair.right_storage):
+                if storage.serial_number in configured_serials:
+                    results.append((self.NOT_CONFIGURED, storage.serial_number, storage.ldev_number, "",
+                                    pair.pair_id, f"{pair.left_storage.status}/{pair.right_storage.status}"))
+                    break
+        return results
+
+    @staticmethod
+    def serial_of(pair: GADPair, number: int, serials: Tuple[str, str]) -> str:
+        for storage in (pair.left_storage, pair.right_storage):
+            if storage.serial_number in serials and storage.ldev_number == str(number):
+                return storage.serial_number
+        return ""
+
+    @staticmethod
+    def partner_ldev(pair: GADPair, serial: str) -> Optional[str]:
+        for storage in (pair.left_storage, pair.right_storage):
+            if storage.serial_number == serial:
+                return storage.ldev_number
+        return None
+
+class CrossCheckModel(QAbstractTableModel):
+    """Sugretinimo rezultatų lentelė su filtru pagal problemos tipą"""
+    HEADERS = ["Issue", "Serial", "LDEV", "Conf device", "Pair", "Detail"]
+
+    def __init__(self, results: list, parent=None):
+        super().__init__(parent)
+        self.results = results
+        self.rows = results
+
+    def set_kind(self, kind: Optional[str]):
+        self.beginResetModel()
+        self.rows = self.results if kind is None else [row for row in self.results if row[0] == kind]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if index.isValid() and role == Qt.DisplayRole:
+            return self.rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
 
-    def generate_horcm10(self, server_ip: str, vsp1: dict, luns: list) -> str:
-        """Generuoja HORCM10.conf turinį"""
-        # LDEV sekcija
-        ldev_lines = []
-        for lun in luns:
-            ldev_lines.append(f"{lun['group']}    {lun['name']}    "
-                            f"{vsp1['serial']}    {lun['ldev']}    0")
-
-        # INST sekcija
-        unique_groups = {lun["group"] for lun in luns}
-        inst_lines = []
-        for group in sorted(unique_groups):
-            inst_lines.append(f"{group}    {server_ip}    5020")
-
-        return f"""HORCM_MON
-# ip_address service poll(10ms) timeout(10ms)
-{server_ip}    5010    1000       3000
-
-HORCM_CMD
-# VSP1 (Serial No.: {vsp1['serial']})
-\\\\.\\CMD-{vsp1['serial']}-{luns[0]['ldev']}
-
-HORCM_LDEV
-# DeviceGroup, DeviceName, Serial#, CU:LDEV(LDEV#), MU#
-{chr(10).join(ldev_lines)}
-
-HORCM_INST
-# DeviceGroup         ip_address      service
-{chr(10).join(inst_lines)}"""
-
-    def generate_horcm20(self, server_ip: str, vsp2: dict, luns: list) -> str:
-        """Generuoja HORCM20.conf turinį"""
-        # LDEV sekcija
-        ldev_lines = []
-        for lun in luns:
-            ldev_lines.append(f"{lun['group']}    {lun['name']}    "
-                            f"{vsp2['serial']}    {lun['ldev']}    0")
+class CrossCheckDialog(QDialog):
+    """HORCM generatoriaus ir GAD porų sugretinimo rezultatai"""
+    def __init__(self, results: list, device_count: int, pair_count: int, elapsed_ms: float, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("HORCM vs Pairs Cross-check")
+        self.setMinimumSize(1000, 500)
+        self.model = CrossCheckModel(results, self)
 
-        # INST sekcija
-        unique_groups = {lun["group"] for lun in luns}
-        inst_lines = []
-        for group in sorted(unique_groups):
-            inst_lines.append(f"{group}    {server_ip}    5010")
+        layout = QVBoxLayout(self)
+        counts = {kind: 0 for kind in (HORCMPairCrossCheck.NOT_PAIRED, HORCMPairCrossCheck.NOT_CONFIGURED,
+                                       HORCMPairCrossCheck.MISMATCH)}
+        for row in results:
+            counts[row[0]] += 1
+        summary = ", ".join(f"{kind}: {count:,}" for kind, count in counts.items())
+        layout.addWidget(QLabel(f"{device_count:,} configured devices vs {pair_count:,} pairs "
+                                f"({elapsed_ms:.0f} ms) - {summary}"))
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Show:"))
+        self.kind_combo = QComboBox()
+        self.kind_combo.addItem(f"All issues ({len(results):,})", None)
+        for kind, count in counts.items():
+            self.kind_combo.addItem(f"{kind} ({count:,})", kind)
+        self.kind_combo.currentIndexChanged.connect(lambda: self.model.set_kind(self.kind_combo.currentData()))
+        filter_layout.addWidget(self.kind_combo)
+        filter_layout.addStretch(1)
+        layout.addLayout(filter_layout)
+
+        table = QTableView()
+        table.setModel(self.model)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.verticalHeader().setDefaultSectionSize(22)
+        table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(table)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn, alignment=Qt.AlignRight)
+
+class LatencyHistogram:
+    """Logaritminių intervalų vėlinimo histograma (ms): pastovi atmintis, procentiliai be rūšiavimo"""
+    BUCKETS_PER_DOUBLING = 4
+    MIN_MS = 1.0
+    BUCKET_COUNT = 80
 
-        return f"""HORCM_MON
-# ip_address service poll(10ms) timeout(10ms)
-{server_ip}    5020    1000       3000
+    def __init__(self):
+        self.counts = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @classmethod
+    def bucket(cls, ms: float) -> int:
+        if ms <= cls.MIN_MS:
+            return 0
+        return min(int(math.log2(ms / cls.MIN_MS) * cls.BUCKETS_PER_DOUBLING) + 1, cls.BUCKET_COUNT - 1)
+
+    @classmethod
+    def upper_bound(cls, index: int) -> float:
+        return cls.MIN_MS * 2 ** (index / cls.BUCKETS_PER_DOUBLING)
+
+    def record(self, ms: float):
+        self.counts[self.bucket(ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Intervalo viršutinė riba (ne didesnė už maksimumą), kurioje pasiekiama dalis matavimų"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def sparkline(self) -> str:
+        """Užimtų intervalų histograma tekstu"""
+        used = [index for index, count in enumerate(self.counts) if count]
+        if not used:
+            return ""
+        counts = self.counts[used[0]:used[-1] + 1]
+        peak = max(counts)
+        blocks = " ▁▂▃▄▅▆▇█"
+        return "".join(blocks[math.ceil(count / peak * 8)] for count in counts)
+
+class MonTuningAdvisor:
+    """HORCM_MON poll/timeout rekomendacijos (10 ms vienetais) iš išmatuotų CCI vėlinimų"""
+    MIN_SAMPLES = 5
+    MIN_POLL, MAX_POLL = 500, 6000
+    MIN_TIMEOUT, MAX_TIMEOUT = 1000, 60000
+    # Stebėjimas turi užimti ne daugiau ~5 % laiko
+    POLL_FACTOR = 20
+    # p99 atsarga apkrovos pikams; be to, ne mažiau nei dvigubas didžiausias matavimas
+    TIMEOUT_FACTOR = 5
+
+    @staticmethod
+    def round_up(value_10ms: float, step: int = 100) -> int:
+        return int(math.ceil(value_10ms / step) * step)
+
+    def recommend(self, histogram: LatencyHistogram) -> Optional[dict]:
+        if histogram.count < self.MIN_SAMPLES:
+            return None
+        p50 = histogram.percentile(0.5)
+        p99 = histogram.percentile(0.99)
+        poll = self.round_up(self.POLL_FACTOR * p50 / 10)
+        poll = max(self.MIN_POLL, min(self.MAX_POLL, poll))
+        timeout = self.round_up(max(self.TIMEOUT_FACTOR * p99, 2 * histogram.max) / 10)
+        timeout = max(self.MIN_TIMEOUT, min(self.MAX_TIMEOUT, timeout))
+        return {'poll': poll, 'timeout': timeout}
+
+class CCILatencyProbe(QObject):
+    """Matuoja raidqry (vietinė ir nutolusi instancija) atsako laiką kiekvienai instancijai lygiagrečiai"""
+    sample_done = pyqtSignal(int)
+    probe_finished = pyqtSignal()
+    # Matavimas vyksta atskirame nedideliame fonde su trumpu komandos laiku, kad neužimtų stebėjimo gijų
+    COMMAND_TIMEOUT = 5
+
+    def __init__(self, runner, targets: List[Tuple[int, str]], samples: int, executor: ThreadPoolExecutor,
+                 parent=None):
+        super().__init__(parent)
+        self.runner = runner
+        self.targets = targets
+        self.samples = samples
+        self.executor = executor
+        self.futures = []
+        self.histograms = {instance: LatencyHistogram() for instance, _ in targets}
+        self.lock = threading.Lock()
+        self.remaining = len(targets)
+        self.cancelled = False
+
+    @staticmethod
+    def commands(instance: int, group: str) -> List[str]:
+        return [f"raidqry -l -IH{instance}", f"raidqry -r {group} -IH{instance}"]
+
+    def start(self):
+        self.futures = [self.executor.submit(self.probe_instance, instance, group)
+                        for instance, group in self.targets]
+
+    def cancel(self):
+        """Laukiančios instancijos atšaukiamos; vykdoma komanda baigiasi per COMMAND_TIMEOUT"""
+        self.cancelled = True
+        for future in self.futures:
+            future.cancel()
+
+    @staticmethod
+    def emit(signal, *args):
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            # Dialogas uždarytas ir sunaikintas, kol komanda dar vykdėsi
+            pass
 
-HORCM_CMD
-# VSP2 (Serial No.: {vsp2['serial']})
-\\\\.\\CMD-{vsp2['serial']}-{luns[0]['ldev']}
+    def probe_instance(self, instance: int, group: str):
+        histogram = self.histograms[instance]
+        try:
+            for _ in range(self.samples):
+                for command in self.commands(instance, group):
+                    if self.cancelled:
+                        return
+                    started = time.perf_counter()
+                    code, _ = self.runner.run(command)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    with self.lock:
+                        if code == 0:
+                            histogram.record(elapsed_ms)
+                        else:
+                            histogram.failures += 1
+                self.emit(self.sample_done, instance)
+        finally:
+            with self.lock:
+                self.remaining -= 1
+                done = self.remaining == 0
+            if done:
+                self.emit(self.probe_finished)
+
+class LatencyProbeDialog(QDialog):
+    """CCI vėlinimo matavimas ir HORCM_MON poll/timeout rekomendacijos generuojamoms instancijoms"""
+    COLUMNS = ["Instance", "Group probed", "Samples", "Failures", "p50 ms", "p90 ms", "p99 ms", "Max ms",
+               "Histogram", "Poll", "Timeout"]
+
+    recommendations_applied = pyqtSignal(dict)
+
+    def __init__(self, targets: List[Tuple[int, str]], settings: HORCMSettings, executor: ThreadPoolExecutor,
+                 parent=None):
+        super().__init__(parent)
+        self.targets = targets
+        self.settings = settings
+        self.executor = executor
+        self.advisor = MonTuningAdvisor()
+        self.probe = None
+        self.rows = {instance: row for row, (instance, _) in enumerate(targets)}
+        self.setWindowTitle("HORCM MON Tuning")
+        self.setMinimumSize(1000, 450)
+        self.init_ui()
 
-HORCM_LDEV
-# DeviceGroup, DeviceName, Serial#, CU:LDEV(LDEV#), MU#
-{chr(10).join(ldev_lines)}
+    def init_ui(self):
+        layout = QVBoxLayout(self)
 
-HORCM_INST
-# DeviceGroup         ip_address      service
-{chr(10).join(inst_lines)}"""
+        options = QHBoxLayout()
+        options.addWidget(QLabel("Samples per instance:"))
+        self.samples_spin = QSpinBox()
+        self.samples_spin.setRange(5, 1000)
+        self.samples_spin.setValue(20)
+        options.addWidget(self.samples_spin)
+        self.simulate_check = QCheckBox("Simulate (fake CCI)")
+        self.simulate_check.setChecked(True)
+        options.addWidget(self.simulate_check)
+        options.addStretch(1)
+        layout.addLayout(options)
+
+        self.table = QTableWidget(len(self.targets), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        for row, (instance, group) in enumerate(self.targets):
+            current = self.settings.for_instance(instance)
+            values = [f"horcm{instance}", group, "0", "0", "", "", "", "", "",
+                      str(current['poll']), str(current['timeout'])]
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+        self.table.resizeColumnsToContents()
+        layout.addWidget(self.table)
+
+        self.info_label = QLabel("Poll and timeout are in 10 ms units. The current values are shown until "
+                                 "an instance has enough samples.")
+        self.info_label.setStyleSheet("color: #666; font-style: italic;")
+        layout.addWidget(self.info_label)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch(1)
+        self.start_btn = QPushButton("Start Probe")
+        self.start_btn.setProperty("class", "primary")
+        self.start_btn.clicked.connect(self.start_probe)
+        buttons.addWidget(self.start_btn)
+        self.apply_btn = QPushButton("Apply to Generator")
+        self.apply_btn.setEnabled(False)
+        self.apply_btn.clicked.connect(self.apply_recommendations)
+        buttons.addWidget(self.apply_btn)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.reject)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+    def start_probe(self):
+        simulate = self.simulate_check.isChecked()
+        runner = (FakeCCI([], latency=0.02, jitter=0.08) if simulate
+                  else CCIRunner(timeout=CCILatencyProbe.COMMAND_TIMEOUT))
+        self.probe = CCILatencyProbe(runner, self.targets, self.samples_spin.value(), self.executor, self)
+        self.probe.sample_done.connect(self.update_instance)
+        self.probe.probe_finished.connect(self.probe_finished)
+        self.start_btn.setEnabled(False)
+        self.apply_btn.setEnabled(False)
+        self.info_label.setText(f"Probing {len(self.targets)} instances with raidqry -l / raidqry -r ...")
+        self.probe.start()
+
+    def update_instance(self, instance: int):
+        """Atnaujina instancijos eilutę iš jos histogramos"""
+        histogram = self.probe.histograms[instance]
+        with self.probe.lock:
+            values = {2: str(histogram.count), 3: str(histogram.failures),
+                      4: f"{histogram.percentile(0.5):.0f}", 5: f"{histogram.percentile(0.9):.0f}",
+                      6: f"{histogram.percentile(0.99):.0f}", 7: f"{histogram.max:.0f}", 8: histogram.sparkline()}
+            recommendation = self.advisor.recommend(histogram)
+        if recommendation:
+            values[9] = str(recommendation['poll'])
+            values[10] = str(recommendation['timeout'])
+        row = self.rows[instance]
+        for col, value in values.items():
+            self.table.item(row, col).setText(value)
+
+    def probe_finished(self):
+        self.start_btn.setEnabled(True)
+        self.apply_btn.setEnabled(any(self.advisor.recommend(h) for h in self.probe.histograms.values()))
+        failures = sum(h.failures for h in self.probe.histograms.values())
+        text = "Probe finished."
+        if failures:
+            text += f" {failures} commands failed; failed round-trips are not counted in the percentiles."
+        self.info_label.setText(text)
+
+    def recommendations(self) -> Dict[int, dict]:
+        result = {}
+        for instance, histogram in self.probe.histograms.items():
+            recommendation = self.advisor.recommend(histogram)
+            if recommendation:
+                result[instance] = recommendation
+        return result
+
+    def apply_recommendations(self):
+        self.recommendations_applied.emit(self.recommendations())
+        self.accept()
+
+    def reject(self):
+        if self.probe is not None:
+            self.probe.cancel()
+        super().reject()
 
 class HORCMConfigFrame(QFrame):
-    def __init__(self, parent=None):
+    PREVIEW_LINES = 1000
+    # Peržiūra generuojama kai vartotojas trumpam sustoja redaguoti
+    PREVIEW_DELAY_MS = 300
+
+    preview_ready = pyqtSignal(int, object, object, float)
+
+    def __init__(self, services: 'SharedServices', parent=None):
         super().__init__(parent)
+        self.services = services
         self.generator = HORCMConfigGenerator()
+        self.renderer = HORCMPreviewRenderer(self.generator, self.PREVIEW_LINES)
+        self.preview_sections: List[Tuple[tuple, str]] = []
+        self.preview_generation = 0
+        self.preview_busy = False
+        self.preview_dirty = False
+        self.preview_ready.connect(self.apply_preview)
         self.init_ui()
+        self.connect_live_preview()
+        self.schedule_preview()
     
     def init_ui(self):
         main_layout = QHBoxLayout(self)
@@ -1516,10 +5270,12 @@ class HORCMConfigFrame(QFrame):
         self.server_params = ServerParametersGroup()
         self.vsp1_params = VSPParametersGroup(1)
         self.vsp2_params = VSPParametersGroup(2)
+        self.instance_params = InstanceParametersGroup()
         
         left_column.addWidget(self.server_params)
         left_column.addWidget(self.vsp1_params)
         left_column.addWidget(self.vsp2_params)
+        left_column.addWidget(self.instance_params)
 
         # Mygtukai
         buttons_group = QGroupBox("Actions")
@@ -1535,6 +5291,22 @@ class HORCMConfigFrame(QFrame):
         save_btn.clicked.connect(self.save_files)
         buttons_layout.addWidget(save_btn)
 
+        load_btn = QPushButton("Load Existing...")
+        load_btn.setToolTip("Load an existing horcmNN.conf (and its partner instance) for editing")
+        load_btn.clicked.connect(self.load_existing)
+        buttons_layout.addWidget(load_btn)
+
+        tune_btn = QPushButton("Tune MON...")
+        tune_btn.setToolTip("Measure CCI round-trips per instance and recommend HORCM_MON poll/timeout")
+        tune_btn.clicked.connect(self.show_latency_probe)
+        buttons_layout.addWidget(tune_btn)
+
+        self.live_preview_check = QCheckBox("Live preview")
+        self.live_preview_check.setChecked(True)
+        self.live_preview_check.setToolTip("Regenerate the preview in the background shortly after each edit")
+        self.live_preview_check.toggled.connect(lambda checked: checked and self.schedule_preview())
+        buttons_layout.addWidget(self.live_preview_check)
+
         buttons_group.setLayout(buttons_layout)
         left_column.addWidget(buttons_group)
         left_column.addStretch()
@@ -1552,6 +5324,11 @@ class HORCMConfigFrame(QFrame):
         self.preview_text.setFont(QFont("Consolas", 9))
         self.preview_text.setMinimumWidth(300)
         preview_layout.addWidget(self.preview_text)
+
+        self.preview_status = QLabel()
+        self.preview_status.setStyleSheet("color: #666; font-style: italic;")
+        self.preview_status.setWordWrap(True)
+        preview_layout.addWidget(self.preview_status)
         
         preview_group.setLayout(preview_layout)
         right_column.addWidget(preview_group)
@@ -1566,6 +5343,28 @@ class HORCMConfigFrame(QFrame):
         main_layout.setStretch(1, 3)  # Middle column
         main_layout.setStretch(2, 2)  # Right column
 
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(self.PREVIEW_DELAY_MS)
+        self.preview_timer.timeout.connect(self.start_preview)
+
+    def connect_live_preview(self):
+        """Bet koks laukų ar LUN lentelės pakeitimas perkrauna peržiūros laikmatį"""
+        entries = [self.server_params.ip_entry]
+        for params in (self.vsp1_params, self.vsp2_params):
+            entries.extend((params.serial_entry, params.ip_entry, params.cmd_entry))
+        for entry in entries:
+            entry.textChanged.connect(self.schedule_preview)
+        for signal in self.instance_params.changed_signals():
+            signal.connect(self.schedule_preview)
+        model = self.lun_config.model
+        for signal in (model.edited, model.rowsInserted, model.rowsRemoved, model.modelReset):
+            signal.connect(self.schedule_preview)
+
+    def schedule_preview(self):
+        if self.live_preview_check.isChecked():
+            self.preview_timer.start()
+
     def all_fields_empty(self) -> bool:
         """Patikrina ar visi laukai tušti"""
         return (
@@ -1576,6 +5375,15 @@ class HORCMConfigFrame(QFrame):
 
     def validate_inputs(self) -> bool:
         """Validuoja įvesties laukus"""
+        message = self.missing_fields_message()
+        if message:
+            QMessageBox.warning(self, "Validation Error", message)
+            return False
+        # LUN konfigūracijos tikrinamos collect_data metu (get_lun_values turi savo pranešimus)
+        return True
+
+    def missing_fields_message(self) -> str:
+        """Trūkstamų privalomų laukų pranešimas arba tuščia eilutė"""
         # Jei bent vienas laukas užpildytas, visi laukai turi būti užpildyti
         server_ip_filled = bool(self.server_params.ip_entry.text())
         vsp1_filled = bool(self.vsp1_params.serial_entry.text()) or bool(self.vsp1_params.ip_entry.text())
@@ -1585,26 +5393,20 @@ class HORCMConfigFrame(QFrame):
         
         if any_field_filled:
             if not server_ip_filled:
-                QMessageBox.warning(self, "Validation Error", "HORCM server IP address is required!")
-                return False
+                return "HORCM server IP address is required!"
                 
             if not (self.vsp1_params.serial_entry.text() and self.vsp1_params.ip_entry.text()):
-                QMessageBox.warning(self, "Validation Error", "VSP1 serial number and IP address are required!")
-                return False
+                return "VSP1 serial number and IP address are required!"
                 
             if not (self.vsp2_params.serial_entry.text() and self.vsp2_params.ip_entry.text()):
-                QMessageBox.warning(self, "Validation Error", "VSP2 serial number and IP address are required!")
-                return False
-                
-            # Tikriname LUN konfigūracijas (ši funkcija jau turi savo pranešimus)
-            luns = self.lun_config.get_lun_values()
-            if not luns:
-                return False
+                return "VSP2 serial number and IP address are required!"
         
-        return True
+        return ""
 
-    def collect_data(self) -> dict:
+    def collect_data(self, luns: Optional[list] = None) -> dict:
         """Surenka visus reikiamus duomenis iš UI"""
+        if luns is None:
+            luns = self.lun_config.get_lun_values()
         use_placeholders = self.all_fields_empty()
         
         if use_placeholders:
@@ -1612,72 +5414,148 @@ class HORCMConfigFrame(QFrame):
                 'server_ip': self.server_params.get_ip(),
                 'vsp1': self.vsp1_params.get_values(),
                 'vsp2': self.vsp2_params.get_values(),
-                'luns': self.lun_config.get_lun_values()
+                'luns': luns
             }
         else:
             return {
                 'server_ip': self.server_params.ip_entry.text(),
                 'vsp1': {
                     'serial': self.vsp1_params.serial_entry.text(),
-                    'ip': self.vsp1_params.ip_entry.text()
+                    'ip': self.vsp1_params.ip_entry.text(),
+                    'cmd_ldevs': self.vsp1_params.cmd_entry.text()
                 },
                 'vsp2': {
                     'serial': self.vsp2_params.serial_entry.text(),
-                    'ip': self.vsp2_params.ip_entry.text()
+                    'ip': self.vsp2_params.ip_entry.text(),
+                    'cmd_ldevs': self.vsp2_params.cmd_entry.text()
                 },
-                'luns': self.lun_config.get_lun_values()
+                'luns': luns
             }
 
+    def collect_valid_data(self) -> Optional[dict]:
+        """Surenka ir visapusiškai validuoja duomenis"""
+        if not self.validate_inputs():
+            return None
+        data = self.collect_data()
+        if not data['luns']:
+            return None
+        # Eilučių numeriai atitinka lentelę, todėl tikriname modelio eilutes
+        rows = self.lun_config.model.rows if self.lun_config.model.has_any_input() else data['luns']
+        issues = self.generator.validator.validate(data['server_ip'], data['vsp1'], data['vsp2'], rows)
+        if issues:
+            QMessageBox.warning(self, "Validation Error", self.generator.validator.format_issues(issues))
+            return None
+        return data
+
     def update_preview(self):
-        """Atnaujina konfigūracijos peržiūrą"""
+        """Atnaujina konfigūracijos peržiūrą (klaidos rodomos dialoge)"""
         try:
-            if not self.validate_inputs():
+            if self.collect_valid_data() is None:
                 return
-                
-            data = self.collect_data()
-            
-            # Validuojame surinktus duomenis
-            self.generator.validate_inputs(
-                server_ip=data['server_ip'],
-                vsp1=data['vsp1'],
-                vsp2=data['vsp2'],
-                luns=data['luns']
-            )
-            
-            # Generuojame peržiūrą
-            preview = "=== HORCM10.conf ===\n"
-            preview += self.generator.generate_horcm10(
-                server_ip=data['server_ip'],
-                vsp1=data['vsp1'],
-                luns=data['luns']
-            )
-            preview += "\n\n=== HORCM20.conf ===\n"
-            preview += self.generator.generate_horcm20(
-                server_ip=data['server_ip'],
-                vsp2=data['vsp2'],
-                luns=data['luns']
-            )
-            
-            self.preview_text.setPlainText(preview)
-            
+            self.preview_timer.stop()
+            self.start_preview()
         except Exception as e:
             QMessageBox.critical(self, "Klaida", str(e))
 
+    def preview_snapshot(self) -> Tuple[Optional[dict], str]:
+        """Nukopijuoja įvestis darbinei gijai be dialogų; grąžina (duomenys, problema)"""
+        message = self.missing_fields_message()
+        if message:
+            return None, message
+        is_valid, message, luns = self.lun_config.validate_luns()
+        if not is_valid:
+            return None, message
+        data = self.collect_data(luns)
+        model = self.lun_config.model
+        data['rows'] = [dict(row) for row in model.rows] if model.has_any_input() else luns
+        data['instances'] = self.instance_params.get_values()
+        data['settings'] = self.instance_params.get_settings()
+        return data, ""
+
+    def start_preview(self):
+        """Paleidžia peržiūros generavimą darbinėje gijoje; vienu metu vykdoma tik viena užduotis"""
+        if self.preview_busy:
+            self.preview_dirty = True
+            return
+        data, message = self.preview_snapshot()
+        if data is None:
+            self.preview_status.setText(f"Preview paused: {message}")
+            return
+        self.preview_generation += 1
+        self.preview_busy = True
+        self.preview_dirty = False
+        self.services.preview_executor.submit(self.render_preview, self.preview_generation, data)
+
+    def render_preview(self, generation: int, data: dict):
+        started = time.perf_counter()
+        try:
+            sections, issues = self.renderer.render(data)
+        except Exception as e:
+            sections, issues = [], [str(e)]
+        # Signalas iš darbinės gijos pristatomas UI gijai per eilę
+        self.preview_ready.emit(generation, sections, issues, (time.perf_counter() - started) * 1000)
+
+    def apply_preview(self, generation: int, sections: list, issues: list, elapsed_ms: float):
+        """Pritaiko tik pasikeitusias peržiūros sekcijas"""
+        self.preview_busy = False
+        try:
+            if generation == self.preview_generation:
+                self.show_preview(sections, issues, elapsed_ms)
+        finally:
+            # Redaguota generavimo metu – paleidžiame dar kartą su naujausiomis įvestimis
+            if self.preview_dirty:
+                self.start_preview()
+
+    def show_preview(self, sections: list, issues: list, elapsed_ms: float):
+        if issues:
+            more = f" (+{len(issues) - 1} more)" if len(issues) > 1 else ""
+            self.preview_status.setText(f"Preview paused: {issues[0]}{more}")
+            return
+
+        old_keys = [key for key, _ in self.preview_sections]
+        new_keys = [key for key, _ in sections]
+        if old_keys != new_keys:
+            self.preview_text.setPlainText("".join(text for _, text in sections))
+            changed = len(sections)
+        else:
+            changed = self.replace_sections(sections)
+        self.preview_sections = sections
+        self.preview_status.setText(f"Preview updated in {elapsed_ms:.0f} ms · "
+                                    f"{changed} of {len(sections)} sections changed")
+
+    @staticmethod
+    def text_length(text: str) -> int:
+        """Ilgis QTextDocument pozicijomis (UTF-16 vienetais)"""
+        return len(text.encode('utf-16-le')) // 2
+
+    def replace_sections(self, sections: list) -> int:
+        """Pakeičia dokumente tik besiskiriančias sekcijas, nuo galo, kad pozicijos nepasislinktų"""
+        starts = []
+        position = 0
+        for _, text in self.preview_sections:
+            starts.append(position)
+            position += self.text_length(text)
+
+        changed = [i for i, (_, text) in enumerate(sections) if text != self.preview_sections[i][1]]
+        if not changed:
+            return 0
+        scroll = self.preview_text.verticalScrollBar().value()
+        cursor = QTextCursor(self.preview_text.document())
+        cursor.beginEditBlock()
+        for i in reversed(changed):
+            cursor.setPosition(starts[i])
+            cursor.setPosition(starts[i] + self.text_length(self.preview_sections[i][1]), QTextCursor.KeepAnchor)
+            cursor.insertText(sections[i][1])
+        cursor.endEditBlock()
+        self.preview_text.verticalScrollBar().setValue(scroll)
+        return len(changed)
+
     def save_files(self):
         """Išsaugo konfigūracijos failus"""
         try:
-            if not self.validate_inputs():
+            data = self.collect_valid_data()
+            if data is None:
                 return
-
-            data = self.collect_data()
-            
-            # Validuojame
-            self.generator.validate_inputs(
-                server_ip=data['server_ip'],
-                vsp1=data['vsp1'],
-                vsp2=data['vsp2'],
-                luns=data['luns']
-            )
             
             # Pasirenkame išsaugojimo direktoriją
             save_dir = QFileDialog.getExistingDirectory(
@@ -1688,30 +5566,118 @@ class HORCMConfigFrame(QFrame):
             )
             
             if save_dir:
-                # Išsaugome failus
-                with open(f"{save_dir}/horcm10.conf", 'w') as f:
-                    f.write(self.generator.generate_horcm10(
-                        server_ip=data['server_ip'],
-                        vsp1=data['vsp1'],
-                        luns=data['luns']
-                    ))
-                    
-                with open(f"{save_dir}/horcm20.conf", 'w') as f:
-                    f.write(self.generator.generate_horcm20(
-                        server_ip=data['server_ip'],
-                        vsp2=data['vsp2'],
-                        luns=data['luns']
-                    ))
+                count, names = self.generator.save_confs(save_dir, data['server_ip'], data['vsp1'], data['vsp2'],
+                                                         data['luns'], **self.instance_params.get_values(),
+                                                         settings=self.instance_params.get_settings())
                     
                 QMessageBox.information(
                     self,
                     "Success",
-                    f"Configuration files saved successfully to:\n{save_dir}"
+                    f"Configuration files saved successfully to:\n{save_dir}\n\n"
+                    f"{', '.join(names)}\n{count:,} LDEV entries per array"
                 )
+                self.remove_stale_confs(save_dir, names)
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
 
+    def remove_stale_confs(self, directory: str, names: List[str]):
+        """Pasiūlo pašalinti ankstesnių instancijų porų failus, kurių naujas planas nebeaprašo"""
+        stale = HORCMShardPlan.stale_file_names(directory, names)
+        if not stale:
+            return
+        answer = QMessageBox.question(
+            self, "Stale Configuration Files",
+            f"{directory} still contains configuration files for instances that are no longer generated:\n\n"
+            f"{', '.join(stale)}\n\nHORCM would keep starting these instances with old groups. Remove them?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if answer != QMessageBox.Yes:
+            return
+        failed = []
+        for name in stale:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError as e:
+                failed.append(f"{name}: {str(e)}")
+        if failed:
+            QMessageBox.warning(self, "Error", "Failed to remove:\n" + "\n".join(failed))
+
+    def probe_targets(self, data: dict) -> List[Tuple[int, str]]:
+        """Generuojamos instancijos ir po vieną jų grupę nutolusios instancijos užklausai"""
+        plan = self.generator.plan_shards(data['luns'], data['vsp1'], data['vsp2'], **data['instances'])
+        first_groups: Dict[int, str] = {}
+        for lun in data['luns']:
+            first_groups.setdefault(plan.shard_of(lun['group']), lun['group'])
+        targets = []
+        for side in (0, 1):
+            for shard in range(plan.shards):
+                targets.append((plan.instances(shard)[side], first_groups[shard]))
+        return targets
+
+    def show_latency_probe(self):
+        """Atidaro vėlinimo matavimą; rekomendacijos perduodamos generatoriui"""
+        data, message = self.preview_snapshot()
+        if data is None:
+            QMessageBox.warning(self, "Tune MON", message)
+            return
+        try:
+            targets = self.probe_targets(data)
+        except ValueError as e:
+            QMessageBox.warning(self, "Tune MON", str(e))
+            return
+        dialog = LatencyProbeDialog(targets, data['settings'], self.services.probe_executor, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.recommendations_applied.connect(self.instance_params.set_overrides)
+        dialog.exec_()
+
+    def load_existing(self):
+        """Įkelia esamą horcm conf ir jo partnerio instanciją į redaktorių"""
+        path, _ = QFileDialog.getOpenFileName(self, "Load HORCM Configuration", "",
+                                              "HORCM configs (horcm*.conf);;All files (*)")
+        if not path:
+            return
+        try:
+            index = HORCMConfIndex.load_directory(os.path.dirname(path), self.services.load_executor)
+            conf = next((c for c in index.confs if os.path.normcase(c.path) == os.path.normcase(path)), None)
+            if conf is None:
+                conf = HORCMConfParser().parse_file(path)
+                index.add(conf)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to load {path}: {str(e)}")
+            return
+        self.apply_conf(conf, index.partner_of(conf))
+
+    def apply_conf(self, conf: HORCMConf, partner: Optional[HORCMConf] = None):
+        """Užpildo laukus ir LUN lentelę; mažesnio numerio instancija laikoma VSP1"""
+        if not conf.devices:
+            QMessageBox.warning(self, "Load", f"No HORCM_LDEV entries found in {conf.path}")
+            return
+        primary, secondary = conf, partner
+        if partner is not None and None not in (conf.instance, partner.instance) and partner.instance < conf.instance:
+            primary, secondary = partner, conf
+
+        if primary.mon.get('ip'):
+            self.server_params.ip_entry.setText(primary.mon['ip'])
+        for params, source in ((self.vsp1_params, primary), (self.vsp2_params, secondary)):
+            if source is None:
+                continue
+            if source.serials:
+                params.serial_entry.setText(source.serials[0])
+            params.cmd_entry.setText(", ".join(str(ldev) for ldev in source.cmd_ldevs()))
+        self.instance_params.shards_spin.setValue(1)
+        self.instance_params.set_settings(primary.settings(self.instance_params.get_settings()))
+        self.lun_config.model.set_rows([{'group': device.group, 'name': device.name,
+                                         'ldev': device.ldev_text or str(device.ldev)}
+                                        for device in primary.devices])
+
+        message = f"Loaded {len(primary.devices):,} devices from {os.path.basename(primary.path)}"
+        if secondary is not None:
+            message += f" (partner {os.path.basename(secondary.path)})"
+        errors = primary.errors + (secondary.errors if secondary is not None else [])
+        if errors:
+            message += "\n\nSkipped lines:\n" + "\n".join(errors[:10])
+        QMessageBox.information(self, "Load", message)
+
     def keyPressEvent(self, event):
         """Apdoroja klavišų paspaudimus"""
         if event.modifiers() & Qt.ControlModifier:
@@ -1784,7 +5750,8 @@ class ProStyle:
         'SSUS': '#ff8800',
         'SSWS': '#ff8800',
         'PSUE': '#de350b',
-        'COPY': '#0052cc'
+        'COPY': '#0052cc',
+        'INIT': '#0052cc'
     }
 
     RW_STATUS_COLORS = {
@@ -1792,6 +5759,84 @@ class ProStyle:
         'L/L': '#0052cc',
         'B/B': '#de350b'
     }
+
+    # Komponentų taisyklės, kurias valdo dinaminės savybės (role, state, active)
+    COMPONENT_STYLE = """
+    QLabel[role="title"] {
+        font-size: 14px;
+        font-weight: bold;
+        color: #1a1f36;
+    }
+    QLabel[role="subtitle"] {
+        font-size: 13px;
+        font-weight: bold;
+        color: #1a1f36;
+    }
+    QLabel[role="muted"] {
+        color: #666;
+    }
+    QLabel[role="value"] {
+        color: #1a1f36;
+        font-weight: 500;
+    }
+    QLabel[role="latest"] {
+        font-weight: bold;
+        color: #00875a;
+    }
+    QLabel[role="status"], QLabel[role="rw"] {
+        color: #666;
+        font-weight: 500;
+    }
+    QPushButton[role="action"] {
+        background-color: #f7f9fc;
+        border: 1px solid #d0d5dd;
+        color: #344054;
+    }
+    QPushButton[role="action"]:hover {
+        background-color: #ffffff;
+        border-color: #9da5b4;
+    }
+    QPushButton[role="action"][active="true"] {
+        background-color: #0052cc;
+        border: 1px solid #0052cc;
+        color: white;
+    }
+    QPushButton[role="action"][active="true"]:hover,
+    QPushButton[role="action"][active="true"]:pressed {
+        background-color: #0747a6;
+        border-color: #0747a6;
+    }
+    """
+
+    _stylesheet = None
+
+    @classmethod
+    def stylesheet(cls) -> str:
+        """Sukompiliuoja (vieną kartą) visos aplikacijos stilių"""
+        if cls._stylesheet is None:
+            state_rules = [
+                f'QLabel[role="status"][state="{state}"] {{ color: {color}; }}'
+                for state, color in cls.STATUS_COLORS.items()
+            ] + [
+                f'QLabel[role="rw"][state="{state}"] {{ color: {color}; }}'
+                for state, color in cls.RW_STATUS_COLORS.items()
+            ]
+            cls._stylesheet = cls.STYLE + cls.COMPONENT_STYLE + "\n".join(state_rules)
+        return cls._stylesheet
+
+    @staticmethod
+    def set_state(widget: QWidget, **properties):
+        """Nustato dinamines savybes ir perpiešia stilių tik jei kuri nors pasikeitė"""
+        changed = False
+        for name, value in properties.items():
+            if widget.property(name) != value:
+                widget.setProperty(name, value)
+                changed = True
+        if changed:
+            style = widget.style()
+            style.unpolish(widget)
+            style.polish(widget)
+        return changed
 class UpdateController:
     """Atnaujinimų valdymo kontroleris"""
     def __init__(self, parent_window):
@@ -1841,6 +5886,627 @@ class UpdateController:
             )
             return False
         
+class SharedServices:
+    """Visiems site bendri resursai: visi riboti darbinių gijų fondai ir LDEV talpų podėlis"""
+    def __init__(self, max_workers: int = 8, cci_workers: int = 8, load_workers: int = 8,
+                 probe_workers: int = 4):
+        # Trumpos užduotys: pairdisplay stebėjimas, istorija ir įkėlimo užduotys
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gad-worker")
+        # Ilgai blokuojančios CCI operacijos (failover) atskirai, kad neužimtų stebėjimo gijų
+        self.cci_workers = cci_workers
+        self.cci_executor = ThreadPoolExecutor(max_workers=cci_workers, thread_name_prefix="gad-cci")
+        # horcm*.conf skaitymas: užduotis jo laukia iš bendro fondo, todėl failai skaitomi kitame fonde
+        self.load_executor = ThreadPoolExecutor(max_workers=load_workers, thread_name_prefix="horcm-load")
+        # CCI vėlinimo matavimas su trumpu komandos laiku
+        self.probe_executor = ThreadPoolExecutor(max_workers=probe_workers, thread_name_prefix="cci-probe")
+        # Peržiūra generuojama vienos gijos eilėje: naujesnė užklausa nelenkia senesnės
+        self.preview_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="horcm-preview")
+        self.capacity_cache = LdevCapacityCache(
+            os.path.join(os.path.expanduser("~"), ".gadmanager", "ldev_capacity.json"))
+
+    def shutdown(self):
+        for executor in (self.executor, self.cci_executor, self.load_executor, self.probe_executor,
+                         self.preview_executor):
+            executor.shutdown(wait=False, cancel_futures=True)
+
+class SiteSettingsDialog(QDialog):
+    """Site pavadinimas, HORCM serveris ir instancijos"""
+    def __init__(self, title: str, name: str, connection: SiteConnection, validate=None, parent=None):
+        super().__init__(parent)
+        self.validate = validate
+        self.setWindowTitle(title)
+        layout = QFormLayout(self)
+
+        self.name_edit = QLineEdit(name)
+        layout.addRow("Site name:", self.name_edit)
+        self.host_edit = QLineEdit(connection.host)
+        self.host_edit.setPlaceholderText("empty - local; user@horcm-server - run CCI over ssh")
+        layout.addRow("HORCM server:", self.host_edit)
+        self.primary_spin = QSpinBox()
+        self.primary_spin.setRange(0, 2047)
+        self.primary_spin.setValue(connection.primary_instance)
+        layout.addRow("VSP1 instance:", self.primary_spin)
+        self.secondary_spin = QSpinBox()
+        self.secondary_spin.setRange(0, 2047)
+        self.secondary_spin.setValue(connection.secondary_instance)
+        layout.addRow("VSP2 instance:", self.secondary_spin)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def values(self) -> Tuple[str, SiteConnection]:
+        return self.name_edit.text().strip(), SiteConnection(self.host_edit.text().strip(),
+                                                             self.primary_spin.value(),
+                                                             self.secondary_spin.value())
+
+    def accept(self):
+        name, connection = self.values()
+        if not name:
+            error = "Site name is required"
+        elif connection.primary_instance == connection.secondary_instance:
+            error = "VSP1 and VSP2 instances must differ"
+        else:
+            error = self.validate(connection) if self.validate else None
+        if error:
+            QMessageBox.warning(self, "Error", error)
+            return
+        super().accept()
+
+class SiteWorkspace(QWidget):
+    """Vieno site (HORCM serverio ir masyvų poros) GAD porų darbo sritis"""
+    # Virš šios ribos porų panelių kūrimas tampa per lėtas
+    PANEL_VIEW_LIMIT = 200
+    # Kiek kopijuojamų grupių rodyti būsenos juostoje
+    STATUS_GROUP_LIMIT = 3
+
+    status_message = pyqtSignal(str)
+    # Fone įkeltas HORCM konfigūracijų indeksas arba įkėlimo klaida
+    configs_loaded = pyqtSignal(object)
+    configs_failed = pyqtSignal(str)
+
+    def __init__(self, name: str, services: SharedServices, connection: Optional[SiteConnection] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.services = services
+        self.connection = connection or SiteConnection()
+        self.init_gad_controller()
+        self.init_ui()
+        self.configs_loaded.connect(self.apply_horcm_configs)
+        self.configs_failed.connect(
+            lambda message: QMessageBox.critical(self, "Error", f"Failed to load HORCM configs: {message}"))
+
+    def init_gad_controller(self):
+        """Inicializuoja šio site GAD porų valdiklį (LDEV talpų podėlis bendras)"""
+        self.gad_controller = GADController(capacity_cache=self.services.capacity_cache,
+                                            snapshot_store=self.snapshot_store())
+        self.pair_panels: Dict[str, GadPairPanel] = {}
+        self.ctg_panels: Dict[str, CTGSummaryPanel] = {}
+        self.list_ctg_panels: Dict[str, CTGSummaryPanel] = {}
+        self.group_panels: Dict[str, GroupSummaryPanel] = {}
+        self.expanded_groups = set()
+        self.last_refresh_ms = 0.0
+        self.visible_count = 0
+        self.update_batcher = PairUpdateBatcher(parent=self)
+        self.update_batcher.batch_ready.connect(self.apply_pair_batch)
+        self.poller = None
+        self.conf_index: Optional[HORCMConfIndex] = None
+
+    def init_ui(self):
+        pairs_layout = QVBoxLayout(self)
+        pairs_layout.setSpacing(0)
+        pairs_layout.setContentsMargins(4, 4, 4, 4)
+
+        # Sukuriame konteinerį viršutinei daliai
+        top_container = QWidget()
+        top_container.setContentsMargins(0, 0, 0, 0)
+        top_layout = QVBoxLayout(top_container)
+        top_layout.setSpacing(0)
+        top_layout.setContentsMargins(0, 0, 0, 0)
+
+        # Inicializuojame komponentus
+        self.parser = OutputParserFrame(callback=self.update_from_parser,
+                                        capacity_callback=self.update_capacities)
+        self.parser.set_instances(self.connection.instances)
+        self.cmd_output = CommandOutput()
+
+        # Įdedame į konteinerį
+        top_layout.addWidget(self.parser)
+        top_layout.addWidget(self.cmd_output)
+
+        # Įdedame konteinerį į pagrindinį išdėstymą
+        pairs_layout.addWidget(top_container)
+
+        # Paieška ir rūšiavimas
+        filter_layout = QHBoxLayout()
+        filter_layout.setContentsMargins(8, 4, 8, 0)
+        filter_layout.addWidget(QLabel("Filter:"))
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("name prefix or field:value - group, name, serial, ldev, "
+                                            "status, rw, port, ctg (e.g. status:PSUE serial:8111)")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(lambda: self.filter_timer.start())
+        filter_layout.addWidget(self.filter_edit, 1)
+        filter_layout.addWidget(QLabel("Sort:"))
+        self.sort_combo = QComboBox()
+        for column, label in GADController.SORT_COLUMNS:
+            self.sort_combo.addItem(label, column)
+        self.sort_combo.currentIndexChanged.connect(lambda: self.refresh_pairs_display())
+        filter_layout.addWidget(self.sort_combo)
+        pairs_layout.addLayout(filter_layout)
+
+        # Filtras pritaikomas kai vartotojas trumpam sustoja rašyti
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.refresh_pairs_display)
+
+        # Vaizdo pasirinkimas
+        view_layout = QHBoxLayout()
+        view_layout.setContentsMargins(8, 4, 8, 0)
+        view_layout.addWidget(QLabel("View:"))
+        self.view_mode_combo = QComboBox()
+        self.view_mode_combo.addItem(f"Auto (list above {self.PANEL_VIEW_LIMIT} pairs)", "auto")
+        self.view_mode_combo.addItem("Panels", "panels")
+        self.view_mode_combo.addItem("List", "list")
+        self.view_mode_combo.addItem("Groups", "groups")
+        self.view_mode_combo.addItem("Heat map", "heatmap")
+        self.view_mode_combo.currentIndexChanged.connect(lambda: self.refresh_pairs_display())
+        view_layout.addWidget(self.view_mode_combo)
+        view_layout.addStretch(1)
+
+        # Tiesioginis pairdisplay stebėjimas
+        self.poll_check = QCheckBox("Live poll every")
+        self.poll_check.setToolTip("Periodically run pairdisplay for the loaded groups")
+        self.poll_check.toggled.connect(self.toggle_polling)
+        view_layout.addWidget(self.poll_check)
+        self.poll_interval_spin = QSpinBox()
+        self.poll_interval_spin.setRange(1, 3600)
+        self.poll_interval_spin.setValue(5)
+        self.poll_interval_spin.setSuffix(" s")
+        view_layout.addWidget(self.poll_interval_spin)
+        view_layout.addWidget(QLabel("Max refresh:"))
+        self.refresh_rate_spin = QSpinBox()
+        self.refresh_rate_spin.setRange(1, 30)
+        self.refresh_rate_spin.setValue(5)
+        self.refresh_rate_spin.setSuffix(" /s")
+        self.refresh_rate_spin.valueChanged.connect(self.update_batcher.set_max_rate)
+        view_layout.addWidget(self.refresh_rate_spin)
+        pairs_layout.addLayout(view_layout)
+
+        self.pairs_stack = QStackedWidget()
+        pairs_layout.addWidget(self.pairs_stack)
+
+        # Sukuriame scroll area GAD poroms
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setFrameShape(QFrame.NoFrame)
+        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        
+        # Scroll widget su container
+        scroll_widget = QWidget()
+        self.pairs_container = QVBoxLayout(scroll_widget)
+        self.pairs_container.setSpacing(4)
+        self.pairs_container.setContentsMargins(8, 8, 8, 8)
+        
+        scroll_area.setWidget(scroll_widget)
+        self.pairs_stack.addWidget(scroll_area)
+
+        # Virtualizuotas sąrašas dideliam porų kiekiui su CTG suvestinėmis viršuje
+        list_page = QWidget()
+        list_layout = QVBoxLayout(list_page)
+        list_layout.setSpacing(4)
+        list_layout.setContentsMargins(0, 0, 0, 0)
+        self.list_ctg_area = QScrollArea()
+        self.list_ctg_area.setWidgetResizable(True)
+        self.list_ctg_area.setFrameShape(QFrame.NoFrame)
+        self.list_ctg_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.list_ctg_area.setMaximumHeight(240)
+        self.list_ctg_area.setVisible(False)
+        list_ctg_widget = QWidget()
+        self.list_ctg_container = QVBoxLayout(list_ctg_widget)
+        self.list_ctg_container.setSpacing(4)
+        self.list_ctg_container.setContentsMargins(8, 8, 8, 0)
+        self.list_ctg_area.setWidget(list_ctg_widget)
+        list_layout.addWidget(self.list_ctg_area)
+        self.pairs_list = PairListView(self.gad_controller)
+        self.pairs_list.delegate.operation_clicked.connect(self.handle_command)
+        list_layout.addWidget(self.pairs_list, 1)
+        self.pairs_stack.addWidget(list_page)
+
+        # Grupių suvestinė su išskleidžiamomis poromis
+        groups_area = QScrollArea()
+        groups_area.setWidgetResizable(True)
+        groups_area.setFrameShape(QFrame.NoFrame)
+        groups_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        groups_widget = QWidget()
+        self.groups_container = QVBoxLayout(groups_widget)
+        self.groups_container.setSpacing(4)
+        self.groups_container.setContentsMargins(8, 8, 8, 8)
+        self.groups_container.addStretch(1)
+        groups_area.setWidget(groups_widget)
+        self.pairs_stack.addWidget(groups_area)
+
+        # Visų porų būsenų žemėlapis
+        heat_map_page = QWidget()
+        heat_map_layout = QVBoxLayout(heat_map_page)
+        heat_map_layout.setContentsMargins(8, 4, 8, 0)
+        legend_layout = QHBoxLayout()
+        legend_layout.addWidget(QLabel("Group by:"))
+        self.heat_map_grouping = QComboBox()
+        self.heat_map_grouping.addItem("Group", "group")
+        self.heat_map_grouping.addItem("P-VOL array", "array")
+        legend_layout.addWidget(self.heat_map_grouping)
+        for status in ProStyle.STATUS_COLORS:
+            legend = QLabel(f"■ {status}")
+            ProStyle.set_state(legend, role="status", state=status)
+            legend_layout.addWidget(legend)
+        legend_layout.addStretch(1)
+        heat_map_layout.addLayout(legend_layout)
+
+        self.heat_map = PairHeatMap(self.gad_controller)
+        self.heat_map.pair_clicked.connect(self.jump_to_pair)
+        self.heat_map_grouping.currentIndexChanged.connect(
+            lambda: self.heat_map.set_grouping(self.heat_map_grouping.currentData()))
+        heat_map_area = QScrollArea()
+        heat_map_area.setWidgetResizable(True)
+        heat_map_area.setFrameShape(QFrame.NoFrame)
+        heat_map_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        heat_map_area.setWidget(self.heat_map)
+        heat_map_layout.addWidget(heat_map_area)
+        self.pairs_stack.addWidget(heat_map_page)
+
+    def snapshot_store(self) -> SnapshotStore:
+        """Istorija saugoma pagal site ryšį (unikalus tarp atidarytų site), ne pagal pavadinimą"""
+        return SnapshotStore(os.path.join(os.path.expanduser("~"), ".gadmanager", "history",
+                                          f"{self.connection.site_id}.log"))
+
+    def set_connection(self, connection: SiteConnection):
+        """Pakeičia site HORCM serverį ar instancijas; stebėjimas paleidžiamas iš naujo"""
+        self.connection = connection
+        self.gad_controller.snapshot_store = self.snapshot_store()
+        self.parser.set_instances(connection.instances)
+        if self.poller is not None:
+            self.toggle_polling(True)
+
+    def route_pairs(self, pairs: List[GADPair]) -> List[GADPair]:
+        """Priskiria poroms jų grupę aprašančias instancijas iš įkeltų HORCM konfigūracijų"""
+        if self.conf_index is None:
+            return pairs
+        routes: Dict[str, Optional[Tuple[int, int]]] = {}
+        for pair in pairs:
+            if pair.group not in routes:
+                routes[pair.group] = self.conf_index.instance_pair(pair.group)
+            route = routes[pair.group]
+            if route:
+                pair.left_storage.instance, pair.right_storage.instance = f"-IH{route[0]}", f"-IH{route[1]}"
+        return pairs
+
+    def update_from_parser(self, new_pairs: List[GADPair]):
+        """Atnaujina porų informaciją iš parserio"""
+        self.gad_controller.update_pairs(self.route_pairs(new_pairs))
+        self.refresh_pairs_display()
+
+    def apply_pair_batch(self, batch: Dict[str, List[GADPair]]):
+        """Pritaiko sujungtą grupių paketą vienu perpiešimu"""
+        if not self.gad_controller.merge_groups(batch):
+            return
+        self.pairs_stack.setUpdatesEnabled(False)
+        try:
+            self.refresh_pairs_display()
+        finally:
+            self.pairs_stack.setUpdatesEnabled(True)
+
+    def toggle_polling(self, enabled: bool):
+        """Paleidžia arba sustabdo periodinį pairdisplay vykdymą"""
+        self.stop_polling()
+        if not enabled:
+            return
+
+        # Įkeltos HORCM konfigūracijos yra autoritetingas grupių sąrašas
+        if self.conf_index is not None and self.conf_index.by_group:
+            targets = self.conf_index.poll_targets(self.connection.instances)
+        else:
+            groups = list(dict.fromkeys(pair.group for pair in self.gad_controller.pairs))
+            if not groups:
+                QMessageBox.warning(self, "Error", "Parse pairdisplay output or load HORCM configs first "
+                                                   "to select groups to poll")
+                self.poll_check.setChecked(False)
+                return
+            targets = [(group, self.connection.instances) for group in groups]
+        self.poller = PairdisplayPoller(self.connection.runner(timeout=60), targets, self.update_batcher,
+                                        self.services.executor, interval=self.poll_interval_spin.value(),
+                                        parent=self)
+        self.poller.failed.connect(lambda message: self.status_message.emit(f"Poll failed: {message}"))
+        self.poller.start()
+
+    def load_horcm_configs(self, directory: str):
+        """Įkelia site horcm*.conf failus fone; indeksas grąžinamas signalu į UI giją"""
+        self.status_message.emit(f"Loading HORCM configs from {directory}...")
+        self.services.executor.submit(self.read_horcm_configs, directory)
+
+    def read_horcm_configs(self, directory: str):
+        # Failai skaitomi įkėlimo fonde: laukti bendro fondo užduočių iš jo paties gijos negalima
+        try:
+            try:
+                index = HORCMConfIndex.load_directory(directory, self.services.load_executor)
+            except OSError as e:
+                self.configs_failed.emit(str(e))
+                return
+            self.configs_loaded.emit(index)
+        except RuntimeError:
+            # Site uždarytas, kol failai buvo skaitomi
+            pass
+
+    def apply_horcm_configs(self, index: HORCMConfIndex):
+        self.conf_index = index
+        self.poll_check.setToolTip(f"Periodically run pairdisplay for {len(index.by_group)} groups "
+                                   f"from {len(index.confs)} HORCM configs")
+        message = (f"Loaded {len(index.confs)} HORCM configs: {len(index.by_group)} groups, "
+                   f"{len(index.by_device):,} devices")
+        if index.error_count:
+            message += f" ({index.error_count} lines skipped)"
+        self.status_message.emit(message)
+
+    def stop_polling(self):
+        """Sustabdo stebėjimą (uždarant site ar programą)"""
+        if self.poller is not None:
+            self.poller.stop()
+            self.poller = None
+
+    def update_from_failover(self, verified_pairs: List[GADPair]):
+        """Pakeičia patikrintų grupių poras naujausia būsena"""
+        self.gad_controller.replace_groups(verified_pairs)
+        self.refresh_pairs_display()
+
+    def current_view_mode(self, pair_count: int) -> str:
+        """Nustato ar rodyti panelius, ar virtualizuotą sąrašą"""
+        mode = self.view_mode_combo.currentData()
+        if mode == "auto":
+            return "list" if pair_count > self.PANEL_VIEW_LIMIT else "panels"
+        return mode
+
+    def visible_pairs(self) -> List[GADPair]:
+        """Filtruotos ir surūšiuotos poros rodymui"""
+        pairs = self.gad_controller.filter_pairs(self.filter_edit.text())
+        return self.gad_controller.sort_pairs(pairs, self.sort_combo.currentData())
+
+    def clear_panels(self):
+        """Pašalina visus porų ir CTG panelius"""
+        while self.pairs_container.count():
+            child = self.pairs_container.takeAt(0)
+            if child.widget():
+                child.widget().deleteLater()
+        self.pair_panels = {}
+        self.ctg_panels = {}
+
+    def clear_group_panels(self):
+        """Pašalina grupių suvestines kartu su jų porų paneliais"""
+        for panel in self.group_panels.values():
+            self.groups_container.removeWidget(panel)
+            panel.deleteLater()
+        self.group_panels = {}
+
+    def refresh_pairs_display(self):
+        """Atnaujina porų atvaizdavimą"""
+        started = time.perf_counter()
+        pairs = self.visible_pairs()
+        self.visible_count = len(pairs)
+        mode = self.current_view_mode(len(pairs))
+        if mode != "heatmap":
+            self.heat_map.set_pairs([])
+        if mode != "list":
+            self.clear_list_ctg_panels()
+        if mode == "list":
+            self.clear_panels()
+            self.clear_group_panels()
+            self.reconcile_list_ctg_panels(pairs)
+            self.pairs_list.set_pairs(pairs)
+            self.pairs_stack.setCurrentIndex(1)
+        elif mode == "groups":
+            self.clear_panels()
+            self.pairs_list.set_pairs([])
+            self.pairs_stack.setCurrentIndex(2)
+            self.reconcile_group_panels(pairs)
+        elif mode == "heatmap":
+            self.clear_panels()
+            self.clear_group_panels()
+            self.pairs_list.set_pairs([])
+            self.pairs_stack.setCurrentIndex(3)
+            self.heat_map.set_pairs(pairs)
+        else:
+            self.clear_group_panels()
+            self.pairs_list.set_pairs([])
+            self.pairs_stack.setCurrentIndex(0)
+            self.reconcile_panels(pairs)
+
+        self.last_refresh_ms = (time.perf_counter() - started) * 1000
+        logging.debug(f"Pairs display refreshed: {len(pairs)} of {len(self.gad_controller.pairs)} pairs "
+                      f"in {self.last_refresh_ms:.1f} ms")
+        self.show_copy_summary()
+
+    def sync_ctg_panels(self, panels: Dict[str, CTGSummaryPanel], pairs: List[GADPair]) -> Dict[str, CTGSummaryPanel]:
+        """CTG suvestinės tik CTG, kurių poros matomos; panaudoti paneliai išimami iš panels"""
+        controller = self.gad_controller
+        ctg_panels = {}
+        for ctg in sorted({pair.ctg for pair in pairs if pair.ctg is not None}):
+            summary = controller.get_ctg_summary(ctg)
+            operations = controller.get_ctg_operations(ctg)
+            panel = panels.pop(ctg, None)
+            if panel is None:
+                panel = CTGSummaryPanel(summary, operations)
+                for btn_id, btn in panel.buttons.items():
+                    btn.clicked.connect(lambda checked, c=ctg, cmd=btn_id:
+                                        self.handle_ctg_command(c, cmd))
+            else:
+                panel.update_summary(summary, operations)
+            ctg_panels[ctg] = panel
+        return ctg_panels
+
+    def reconcile_list_ctg_panels(self, pairs: List[GADPair]):
+        """CTG suvestinės virš virtualizuoto sąrašo"""
+        ctg_panels = self.sync_ctg_panels(self.list_ctg_panels, pairs)
+        removed = list(self.list_ctg_panels.values())
+        self.list_ctg_panels = ctg_panels
+        self.place_widgets(self.list_ctg_container, list(ctg_panels.values()), removed)
+        self.list_ctg_area.setVisible(bool(ctg_panels))
+
+    def clear_list_ctg_panels(self):
+        if self.list_ctg_panels:
+            self.place_widgets(self.list_ctg_container, [], list(self.list_ctg_panels.values()))
+            self.list_ctg_panels = {}
+            self.list_ctg_area.setVisible(False)
+
+    def reconcile_panels(self, pairs: List[GADPair]):
+        """Sulygina panelius su poromis pagal raktą: keičiami tik pasikeitę"""
+        ctg_panels = self.sync_ctg_panels(self.ctg_panels, pairs)
+        pair_panels = self.sync_pair_panels(self.pair_panels, pairs)
+        desired = list(ctg_panels.values()) + list(pair_panels.values())
+
+        # Dingę paneliai pašalinami, nauji ar perkelti įterpiami į savo vietą
+        removed = list(self.ctg_panels.values()) + list(self.pair_panels.values())
+        self.ctg_panels = ctg_panels
+        self.pair_panels = pair_panels
+        self.place_widgets(self.pairs_container, desired, removed)
+
+    def sync_pair_panels(self, panels: Dict[str, GadPairPanel], pairs: List[GADPair]) -> Dict[str, GadPairPanel]:
+        """Sukuria trūkstamus ir atnaujina pasikeitusius porų panelius.
+
+        Panaudoti paneliai išimami iš panels, todėl ten lieka tik nebereikalingi.
+        """
+        controller = self.gad_controller
+        copy_controller = controller.copy_controller
+        pair_panels = {}
+        for pair in pairs:
+            panel = panels.pop(pair.pair_id, None)
+            if panel is None:
+                panel = GadPairPanel(pair)
+                panel.set_history(controller.history)
+                # Mygtukai prijungiami vieną kartą - komanda imama iš esamos panelio poros
+                for btn_id, btn in panel.buttons.items():
+                    btn.clicked.connect(lambda checked, pp=panel, cmd=btn_id:
+                                        self.handle_command(pp.pair, cmd))
+                panel.set_copy_status(copy_controller.get_copy_status(pair.pair_id))
+            elif panel.pair != pair:
+                panel.update_pair(pair)
+                panel.set_history(controller.history)
+                panel.set_copy_status(copy_controller.get_copy_status(pair.pair_id))
+            elif pair.pair_id in copy_controller.progress:
+                panel.set_copy_status(copy_controller.get_copy_status(pair.pair_id))
+            pair_panels[pair.pair_id] = panel
+        return pair_panels
+
+    @staticmethod
+    def place_widgets(layout: QVBoxLayout, widgets: List[QWidget], removed: List[QWidget]):
+        """Pašalina nebereikalingus valdiklius ir sudeda likusius nurodyta tvarka"""
+        for widget in removed:
+            layout.removeWidget(widget)
+            widget.deleteLater()
+        for position, widget in enumerate(widgets):
+            item = layout.itemAt(position)
+            if item is None or item.widget() is not widget:
+                layout.removeWidget(widget)
+                layout.insertWidget(position, widget)
+
+    def reconcile_group_panels(self, pairs: List[GADPair]):
+        """Sulygina grupių suvestines; porų paneliai laikomi tik išskleistoms grupėms"""
+        controller = self.gad_controller
+        summaries = controller.get_group_summaries(pairs)
+        group_pairs = {}
+        for pair in pairs:
+            if pair.group in self.expanded_groups:
+                group_pairs.setdefault(pair.group, []).append(pair)
+
+        group_panels = {}
+        for group, summary in summaries.items():
+            panel = self.group_panels.pop(group, None)
+            if panel is None:
+                panel = GroupSummaryPanel(summary, expanded=group in self.expanded_groups)
+                panel.toggled.connect(self.toggle_group)
+            else:
+                panel.update_summary(summary)
+
+            if panel.is_expanded():
+                removed = panel.pair_panels
+                panel.pair_panels = self.sync_pair_panels(removed, group_pairs.get(group, []))
+                self.place_widgets(panel.pairs_layout, list(panel.pair_panels.values()), list(removed.values()))
+            elif panel.pair_panels:
+                panel.clear_pairs()
+            group_panels[group] = panel
+
+        removed = list(self.group_panels.values())
+        self.group_panels = group_panels
+        self.place_widgets(self.groups_container, list(group_panels.values()), removed)
+
+    def jump_to_pair(self, pair: GADPair):
+        """Perjungia į porų sąrašą ir parodo pasirinktą porą"""
+        self.view_mode_combo.setCurrentIndex(self.view_mode_combo.findData("list"))
+        self.pairs_list.scroll_to_pair(pair.pair_id)
+
+    def toggle_group(self, group: str, expanded: bool):
+        """Išskleidžia (sukuria porų panelius) arba suskleidžia (atlaisvina) grupę"""
+        if expanded:
+            self.expanded_groups.add(group)
+        else:
+            self.expanded_groups.discard(group)
+        self.refresh_pairs_display()
+
+    def show_copy_summary(self):
+        """Rodo kopijuojamų grupių ETA būsenos juostoje"""
+        copy_controller = self.gad_controller.copy_controller
+        groups = copy_controller.get_copying_groups()
+        if not groups:
+            total = len(self.gad_controller.pairs)
+            shown = f", {self.visible_count} shown" if self.visible_count != total else ""
+            self.status_message.emit(f"{total} pairs loaded{shown} "
+                                         f"(refresh {self.last_refresh_ms:.0f} ms)")
+            return
+
+        def describe(estimate: dict) -> str:
+            eta = estimate['estimated_end_time']
+            text = f"ETA {eta.strftime('%H:%M') if eta else '?'}"
+            if estimate['weighted']:
+                text += (f", {estimate['remaining_bytes'] / 1024 ** 3:.1f} GB left"
+                         f" @ {estimate['throughput_mbps']:.1f} MB/s")
+            return text
+
+        # Rodomos vėliausiai pasibaigsiančios grupės
+        estimates = copy_controller.get_group_estimates()
+        latest = sorted(estimates.items(),
+                        key=lambda item: item[1]['estimated_end_time'] or datetime.max,
+                        reverse=True)
+        parts = [f"{group} {describe(estimate)}" for group, estimate in latest[:self.STATUS_GROUP_LIMIT]]
+        if len(latest) > self.STATUS_GROUP_LIMIT:
+            parts.append(f"+{len(latest) - self.STATUS_GROUP_LIMIT} more")
+        message = f"Copying: {'; '.join(parts)}"
+        if len(groups) > 1:
+            message += f" | Site: {describe(copy_controller.get_site_estimate())}"
+        self.status_message.emit(message)
+
+    def update_capacities(self, text: str):
+        """Įkelia LDEV talpas iš raidcom get ldev išvesties"""
+        count = self.gad_controller.capacity_cache.update_from_text(text)
+        if not count:
+            QMessageBox.warning(self, "Error", "No LDEV capacity found in raidcom get ldev output")
+            return
+
+        missing = self.gad_controller.capacity_cache.missing_commands(self.gad_controller.pairs)
+        if missing:
+            self.cmd_output.set_command("# LDEVs with unknown capacity:\n" + "\n".join(missing))
+        self.show_copy_summary()
+
+    def handle_command(self, pair: GADPair, command: str):
+        """Apdoroja mygtukų paspaudimus"""
+        cmd_text = self.gad_controller.get_command_for_operation(pair, command)
+        self.cmd_output.set_command(cmd_text)
+
+    def handle_ctg_command(self, ctg: str, command: str):
+        """Apdoroja CTG lygio operacijų mygtukus"""
+        cmd_text = self.gad_controller.get_ctg_command(ctg, command)
+        self.cmd_output.set_command(cmd_text)
+
 class MainWindow(QMainWindow):
     def show_help(self):
         """Rodo pagalbos dialogą"""
@@ -1852,10 +6518,52 @@ class MainWindow(QMainWindow):
         about_dialog = AboutDialog(self)
         about_dialog.exec_()
 
+    def show_failover(self):
+        """Rodo site failover orkestravimo langą"""
+        site = self.current_site()
+        dialog = FailoverDialog(site.gad_controller, self, executor=self.services.cci_executor,
+                                max_parallel=self.services.cci_workers, connection=site.connection)
+        dialog.pairs_verified.connect(site.update_from_failover)
+        dialog.exec_()
+
+    def show_timeline(self):
+        """Rodo aktyvaus site būsenų istorijos laiko juostą"""
+        dialog = TimelineDialog(self.current_site().gad_controller, self, executor=self.services.executor)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.exec_()
+
+    def show_cross_check(self):
+        """Sugretina HORCM generatoriaus LUN su aktyvaus site poromis"""
+        data, message = self.horcm_generator.preview_snapshot()
+        if data is None:
+            QMessageBox.warning(self, "Cross-check", f"HORCM Generator input is incomplete: {message}")
+            return
+        pairs = self.current_site().gad_controller.pairs
+        if not pairs:
+            QMessageBox.warning(self, "Cross-check", "Parse pairdisplay output in the GAD Pairs tab first")
+            return
+        checker = HORCMPairCrossCheck(self.horcm_generator.generator)
+        started = time.perf_counter()
+        try:
+            results = checker.run(data['luns'], (data['vsp1']['serial'], data['vsp2']['serial']), pairs)
+        except ValueError as e:
+            QMessageBox.warning(self, "Cross-check", str(e))
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        CrossCheckDialog(results, checker.device_count, len(pairs), elapsed_ms, self).exec_()
+
+    def load_horcm_configs(self):
+        """Įkelia aktyvaus site horcm*.conf katalogą"""
+        directory = QFileDialog.getExistingDirectory(self, "Select HORCM Configuration Directory", "",
+                                                     QFileDialog.ShowDirsOnly)
+        if directory:
+            self.current_site().load_horcm_configs(directory)
+
     def __init__(self):
         super().__init__()
         self.init_update_controller()
-        self.init_gad_controller()
+        # Visiems site bendras darbinių gijų fondas ir podėlis
+        self.services = SharedServices()
         self.init_ui()
         QTimer.singleShot(1000, lambda: self.update_controller.check_for_updates())  # Pašalintas auto_check argumentas
 
@@ -1863,14 +6571,9 @@ class MainWindow(QMainWindow):
         """Inicializuoja atnaujinimų valdiklį"""
         self.update_controller = UpdateController(self)
 
-    def init_gad_controller(self):
-        """Inicializuoja GAD porų valdiklį"""
-        self.gad_controller = GADController()
-
     def init_ui(self):
         self.setWindowTitle(f"GAD Manager {APP_VERSION}")
         self.setMinimumSize(1400, 750)
-        self.setStyleSheet(ProStyle.STYLE)
 
         # Nustatome programos ikoną
         try:
@@ -1892,6 +6595,33 @@ class MainWindow(QMainWindow):
         # Sukuriame meniu juostą
         menubar = self.menuBar()
 
+        # Operations meniu
+        operations_menu = menubar.addMenu('Operations')
+        failover_action = QAction('Site Failover...', self)
+        failover_action.triggered.connect(self.show_failover)
+        operations_menu.addAction(failover_action)
+        timeline_action = QAction('State Timeline...', self)
+        timeline_action.triggered.connect(self.show_timeline)
+        operations_menu.addAction(timeline_action)
+        load_confs_action = QAction('Load HORCM Configs...', self)
+        load_confs_action.triggered.connect(self.load_horcm_configs)
+        operations_menu.addAction(load_confs_action)
+        cross_check_action = QAction('Cross-check HORCM vs Pairs...', self)
+        cross_check_action.triggered.connect(self.show_cross_check)
+        operations_menu.addAction(cross_check_action)
+
+        # Sites meniu
+        sites_menu = menubar.addMenu('Sites')
+        add_site_action = QAction('Add Site...', self)
+        add_site_action.triggered.connect(self.prompt_add_site)
+        sites_menu.addAction(add_site_action)
+        rename_site_action = QAction('Site Settings...', self)
+        rename_site_action.triggered.connect(self.rename_site)
+        sites_menu.addAction(rename_site_action)
+        close_site_action = QAction('Close Site', self)
+        close_site_action.triggered.connect(lambda: self.close_site(self.site_tabs.currentIndex()))
+        sites_menu.addAction(close_site_action)
+
         # Help meniu
         help_menu = menubar.addMenu('Update / Help')
         
@@ -1921,53 +6651,23 @@ class MainWindow(QMainWindow):
         # Tab widget
         self.tab_widget = QTabWidget()
 
-        # GAD Pairs tab
-        self.pairs_tab = QWidget()
-        pairs_layout = QVBoxLayout(self.pairs_tab)
-        pairs_layout.setSpacing(0)
-        pairs_layout.setContentsMargins(4, 4, 4, 4)
-
-        # Sukuriame konteinerį viršutinei daliai
-        top_container = QWidget()
-        top_container.setContentsMargins(0, 0, 0, 0)
-        top_layout = QVBoxLayout(top_container)
-        top_layout.setSpacing(0)
-        top_layout.setContentsMargins(0, 0, 0, 0)
-
-        # Inicializuojame komponentus
-        self.parser = OutputParserFrame(callback=self.update_from_parser)
-        self.cmd_output = CommandOutput()
-
-        # Įdedame į konteinerį
-        top_layout.addWidget(self.parser)
-        top_layout.addWidget(self.cmd_output)
-
-        # Įdedame konteinerį į pagrindinį išdėstymą
-        pairs_layout.addWidget(top_container)
-
-        # Sukuriame scroll area GAD poroms
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setFrameShape(QFrame.NoFrame)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        # Scroll widget su container
-        scroll_widget = QWidget()
-        self.pairs_container = QVBoxLayout(scroll_widget)
-        self.pairs_container.setSpacing(4)
-        self.pairs_container.setContentsMargins(8, 8, 8, 8)
-        
-        scroll_area.setWidget(scroll_widget)
-        pairs_layout.addWidget(scroll_area)
+        # GAD Pairs tab: po vieną darbo sritį kiekvienam site
+        self.site_tabs = QTabWidget()
+        self.site_tabs.setTabBarAutoHide(True)
+        self.site_tabs.setTabsClosable(True)
+        self.site_tabs.setMovable(True)
+        self.site_tabs.tabCloseRequested.connect(self.close_site)
+        self.site_tabs.currentChanged.connect(self.site_changed)
+        self.add_site("Site 1")
 
         # HORCM tab
         self.horcm_tab = QWidget()
         horcm_layout = QVBoxLayout(self.horcm_tab)
-        self.horcm_generator = HORCMConfigFrame()
+        self.horcm_generator = HORCMConfigFrame(self.services)
         horcm_layout.addWidget(self.horcm_generator)
 
         # Add tabs
-        self.tab_widget.addTab(self.pairs_tab, "GAD Pairs")
+        self.tab_widget.addTab(self.site_tabs, "GAD Pairs")
         self.tab_widget.addTab(self.horcm_tab, "HORCM Generator")
 
         # Add tab widget to main layout
@@ -1976,33 +6676,78 @@ class MainWindow(QMainWindow):
         # Status bar
         self.statusBar().showMessage("Ready")
 
-    def update_from_parser(self, new_pairs: List[GADPair]):
-        """Atnaujina porų informaciją iš parserio"""
-        self.gad_controller.update_pairs(new_pairs)
-        self.refresh_pairs_display()
-
-    def refresh_pairs_display(self):
-        """Atnaujina porų atvaizdavimą"""
-        # Išvalo senus widgets
-        while self.pairs_container.count():
-            child = self.pairs_container.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        # Prideda naujas poras
-        for pair in self.gad_controller.pairs:
-            pair_panel = GadPairPanel(pair)
-            self.pairs_container.addWidget(pair_panel)
-
-            # Prijungia mygtukų signalus
-            for btn_id, btn in pair_panel.buttons.items():
-                btn.clicked.connect(lambda checked, p=pair, cmd=btn_id:
-                                    self.handle_command(p, cmd))
+    def current_site(self) -> SiteWorkspace:
+        return self.site_tabs.currentWidget()
+
+    def add_site(self, name: str, connection: Optional[SiteConnection] = None) -> SiteWorkspace:
+        """Prideda naują site darbo sritį"""
+        site = SiteWorkspace(name, self.services, connection)
+        site.status_message.connect(lambda message, s=site: self.show_site_message(s, message))
+        index = self.site_tabs.addTab(site, name)
+        self.site_tabs.setTabToolTip(index, site.connection.describe())
+        self.site_tabs.setCurrentIndex(index)
+        return site
+
+    def sites(self) -> List[SiteWorkspace]:
+        return [self.site_tabs.widget(index) for index in range(self.site_tabs.count())]
+
+    def connection_conflict(self, connection: SiteConnection, current: Optional[SiteWorkspace] = None) -> Optional[str]:
+        """Du site negali stebėti tos pačios HORCM instancijos"""
+        for site in self.sites():
+            if site is not current and connection.conflicts_with(site.connection):
+                return f"Site '{site.name}' already uses {site.connection.describe()}"
+        return None
 
-    def handle_command(self, pair: GADPair, command: str):
-        """Apdoroja mygtukų paspaudimus"""
-        cmd_text = self.gad_controller.get_command_for_operation(pair, command)
-        self.cmd_output.set_command(cmd_text)
+    def prompt_add_site(self):
+        # Siūloma pirma laisva instancijų pora
+        connection = SiteConnection()
+        while self.connection_conflict(connection):
+            connection = SiteConnection(primary_instance=connection.primary_instance + 100,
+                                        secondary_instance=connection.secondary_instance + 100)
+        dialog = SiteSettingsDialog("Add Site", f"Site {self.site_tabs.count() + 1}", connection,
+                                    validate=self.connection_conflict, parent=self)
+        if dialog.exec_() == QDialog.Accepted:
+            self.add_site(*dialog.values())
+
+    def rename_site(self):
+        site = self.current_site()
+        dialog = SiteSettingsDialog("Site Settings", site.name, site.connection,
+                                    validate=lambda connection: self.connection_conflict(connection, site),
+                                    parent=self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        site.name, connection = dialog.values()
+        index = self.site_tabs.currentIndex()
+        self.site_tabs.setTabText(index, site.name)
+        self.site_tabs.setTabToolTip(index, connection.describe())
+        if connection != site.connection:
+            site.set_connection(connection)
+
+    def close_site(self, index: int):
+        """Uždaro site (paskutinis site visada lieka)"""
+        if self.site_tabs.count() <= 1:
+            QMessageBox.warning(self, "Error", "At least one site must remain open")
+            return
+        site = self.site_tabs.widget(index)
+        site.stop_polling()
+        self.site_tabs.removeTab(index)
+        site.deleteLater()
+
+    def site_changed(self, index: int):
+        site = self.site_tabs.widget(index)
+        if site is not None:
+            site.show_copy_summary()
+
+    def show_site_message(self, site: SiteWorkspace, message: str):
+        """Būsenos juostoje rodomi tik aktyvaus site pranešimai"""
+        if site is self.current_site():
+            self.statusBar().showMessage(message)
+
+    def closeEvent(self, event):
+        for index in range(self.site_tabs.count()):
+            self.site_tabs.widget(index).stop_polling()
+        self.services.shutdown()
+        super().closeEvent(event)
 
     def check_for_updates(self):
         """Checks for and performs update if available"""
@@ -2024,6 +6769,9 @@ def main():
     palette.setColor(QPalette.WindowText, QColor("#1a1f36"))
     app.setPalette(palette)
 
+    # Vienas sukompiliuotas stilius visai aplikacijai
+    app.setStyleSheet(ProStyle.stylesheet())
+
     window = MainWindow()
     window.show()
     sys.exit(app.exec_())
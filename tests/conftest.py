@@ -0,0 +1,47 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app_module():
+    """GAD manager.py turi tarpą pavadinime, todėl įkeliamas per importlib"""
+    if "gad_manager" in sys.modules:
+        return sys.modules["gad_manager"]
+    spec = importlib.util.spec_from_file_location("gad_manager", os.path.join(ROOT, "GAD manager.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["gad_manager"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def gad():
+    return load_app_module()
+
+
+@pytest.fixture(scope="session")
+def qapp(gad):
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+PAIRDISPLAY = """\
+Group   PairVol(L/R) (Port#,TID, LU),Seq#,LDEV#.P/S,Status,Fence,   %,P-LDEV# M CTG JID AP EM       E-Seq# E-LDEV# R/W QM DM P PR CS D_Status ST ELV PGID           CT(s) LUT
+HDID    GAD_TEST_HA(L) (CL8-F-8, 0,   5)811111  6001.P-VOL PSUS NEVER ,  100  6001 -   -   0  4  -            -       - B/B -  D  N D   3 -         - -      -               - -
+HDID    GAD_TEST_HA(R) (CL8-F-12, 0,   5)822222  6001.S-VOL SSWS NEVER ,  100  6001 -   -   0  4  -            -       - L/L -  D  N D   3 -         - -      -               - -
+HDID2    GAD_TEST_HA2(L) (CL8-F-8, 0,   5)811111  6002.P-VOL PAIR NEVER ,  100  6002 -   3   0  4  -            -       - L/L -  D  N D   3 -         - -      -               - -
+HDID2    GAD_TEST_HA2(R) (CL8-F-12, 0,   5)822222  6002.S-VOL PAIR NEVER ,  100  6002 -   3   0  4  -            -       - L/L -  D  N D   3 -         - -      -               - -
+HDID3    GAD_TEST_HA3(L) (CL8-F-8, 0,   5)811111  6003.P-VOL COPY NEVER ,  42  6003 -   3   0  4  -            -       - L/L -  D  N D   3 -         - -      -               - -
+HDID3    GAD_TEST_HA3(R) (CL8-F-12, 0,   5)822222  6003.S-VOL COPY NEVER ,  42  6003 -   3   0  4  -            -       - B/B -  D  N D   3 -         - -      -               - -
+"""
+
+
+@pytest.fixture
+def pairdisplay_text():
+    return PAIRDISPLAY
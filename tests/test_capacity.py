@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+RAIDCOM = """\
+Serial#  :  811111
+LDEV : 6001
+VOL_Capacity(BLK) : 0
+Serial#  :  811111
+LDEV : 00:1A
+VOL_Capacity(BLK) : 2097152
+Serial#  :  811111
+LDEV : 6003
+"""
+
+
+def test_raidcom_parser_keeps_zero_capacity_and_skips_unknown(gad):
+    ldevs = gad.RaidcomLdevParser().parse(RAIDCOM)
+
+    assert [(ldev['ldev'], ldev['capacity_bytes']) for ldev in ldevs] == [('6001', 0), ('26', 2097152 * 512)]
+
+
+def test_zero_capacity_is_cached_and_not_requested_again(gad, pairdisplay_text):
+    cache = gad.LdevCapacityCache()
+    cache.update_from_text(RAIDCOM)
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text)
+
+    assert cache.get('811111', '6001') == 0
+    assert cache.get('811111', '6003') is None
+    missing = cache.missing_commands(pairs)
+    assert not any(command.endswith("-ldev_id 6001 -IH10") for command in missing)
+    assert any(command.endswith("-ldev_id 6003 -IH10") for command in missing)
+
+
+def test_estimate_weights_by_bytes_when_a_capacity_is_zero(gad):
+    cache = gad.LdevCapacityCache()
+    cache.capacities = {('811111', '1'): 0, ('811111', '2'): 100 * 1024 ** 2}
+    progress = gad.CopyProgress(capacity_cache=cache)
+    start = datetime(2026, 1, 1)
+    for pair_id, ldev in (("G/A", '1'), ("G/B", '2')):
+        progress.update_progress(pair_id, 0, group="G", now=start)
+        progress.update_progress(pair_id, 50, group="G", now=start + timedelta(seconds=50))
+        progress.progress[pair_id]['capacity_key'] = ('811111', ldev)
+
+    estimate = progress.get_group_estimate("G")
+
+    assert estimate['weighted']
+    assert estimate['remaining_bytes'] == 50 * 1024 ** 2
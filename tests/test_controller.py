@@ -0,0 +1,53 @@
+import dataclasses
+
+
+def test_merge_groups_replaces_each_polled_group(gad, pairdisplay_text):
+    controller = gad.GADController()
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text)
+    controller.update_pairs(pairs)
+    changed_pair = dataclasses.replace(
+        pairs[1], left_storage=dataclasses.replace(pairs[1].left_storage, status='PSUE'))
+
+    changed = controller.merge_groups({'HDID': [], 'HDID2': [changed_pair], 'HDID3': [pairs[2]]})
+
+    assert changed == ['HDID', 'HDID2']
+    assert [pair.group for pair in controller.pairs] == ['HDID2', 'HDID3']
+    assert controller.pairs[0].left_storage.status == 'PSUE'
+
+
+def test_merge_groups_without_changes_keeps_pairs(gad, pairdisplay_text):
+    controller = gad.GADController()
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text)
+    controller.update_pairs(pairs)
+
+    assert controller.merge_groups({'HDID2': [pairs[1]]}) == []
+    assert controller.pairs is pairs
+
+
+def test_parser_skips_deleted_smpl_pairs(gad, pairdisplay_text):
+    smpl = ("HDID4    GAD_TEST_HA4(L) (CL8-F-8, 0,   6)811111  6004.SMPL ---- ------,----- ----  -\n"
+            "HDID4    GAD_TEST_HA4(R) (CL8-F-12, 0,   6)822222  6004.SMPL ---- ------,----- ----  -\n")
+
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text + smpl)
+
+    assert [pair.group for pair in pairs] == ['HDID', 'HDID2', 'HDID3']
+
+
+def test_resync_command_uses_the_instances_of_the_pair(gad, pairdisplay_text):
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text, ('-IH11', '-IH21'))
+    controller = gad.GADController()
+
+    assert controller.get_resync_command(pairs[0]) == ("pairresync -g HDID -swaps -IH21\n"
+                                                       "pairresync -g HDID -swaps -IH11")
+
+
+def test_ctg_command_runs_one_command_per_group(gad, pairdisplay_text):
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text)
+    controller = gad.GADController()
+    controller.update_pairs([pairs[1], dataclasses.replace(pairs[1], group='HDID3')])
+
+    lines = controller.get_ctg_command('3', 'split_vsp1').splitlines()
+
+    assert lines[0] == "# CTG 3: 2 pairs in 2 group(s)"
+    assert lines[1].startswith("# CCI has no single command for a CTG")
+    assert [line.split()[2] for line in lines[2:]] == ['HDID2', 'HDID3']
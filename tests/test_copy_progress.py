@@ -0,0 +1,44 @@
+import dataclasses
+from datetime import datetime, timedelta
+
+
+def copying_pair(template, group, percent):
+    sides = {side: dataclasses.replace(getattr(template, side), copy_percent=percent)
+             for side in ('left_storage', 'right_storage')}
+    return dataclasses.replace(template, group=group, name=f"{group}_VOL", **sides)
+
+
+def test_interleaved_group_batches_keep_the_true_rate(gad, pairdisplay_text):
+    template = gad.PairdisplayParser().parse(pairdisplay_text)[2]
+    progress = gad.CopyProgress()
+    start = datetime(2026, 1, 1)
+    percents = {'A': 10, 'B': 10}
+    pairs = {group: copying_pair(template, group, 10) for group in percents}
+    progress.update_from_pairs(list(pairs.values()), now=start)
+
+    # Grupės apklausiamos pakaitomis kas 5 s; kiekviena kopijuoja 1 %/s
+    for step in range(1, 9):
+        group = 'A' if step % 2 else 'B'
+        now = start + timedelta(seconds=5 * step)
+        percents[group] = 10 + 5 * step
+        pairs[group] = copying_pair(template, group, percents[group])
+        progress.update_from_pairs(list(pairs.values()), now=now, groups={group})
+
+    assert progress.get_rate('A/A_VOL') == progress.get_rate('B/B_VOL') == 1.0
+    assert len(progress.progress['A/A_VOL']['samples']) == 5
+
+
+def test_controller_samples_only_the_replaced_groups(gad, pairdisplay_text):
+    template = gad.PairdisplayParser().parse(pairdisplay_text)[2]
+    controller = gad.GADController()
+    controller.update_pairs([copying_pair(template, 'A', 10), copying_pair(template, 'B', 10)])
+
+    controller.merge_groups({'A': [copying_pair(template, 'A', 20)]})
+
+    assert len(controller.copy_controller.progress['A/A_VOL']['samples']) == 2
+    assert len(controller.copy_controller.progress['B/B_VOL']['samples']) == 1
+
+    controller.merge_groups({'B': []})
+
+    assert 'B/B_VOL' not in controller.copy_controller.progress
+    assert 'A/A_VOL' in controller.copy_controller.progress
@@ -0,0 +1,104 @@
+def pair_group(pairs, group):
+    return [pair for pair in pairs if pair.group == group]
+
+
+def controller_with(gad, pairs):
+    controller = gad.GADController()
+    controller.pairs = pairs
+    return controller
+
+
+def test_fake_pairdisplay_via_secondary_instance_lists_local_side_first(gad, pairdisplay_text):
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text)
+    fake = gad.FakeCCI(pairs)
+
+    code, output = fake.run("pairdisplay -g HDID2 -CLI -IH20")
+
+    assert code == 0
+    first_row = output.splitlines()[1]
+    assert "(L)" in first_row and "822222" in first_row
+
+
+def test_parser_orients_output_from_secondary_instance(gad, pairdisplay_text):
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text)
+    output = gad.FakeCCI(pairs).run("pairdisplay -g HDID -CLI -IH20")[1]
+
+    parsed = gad.PairdisplayParser().parse(output, ('-IH10', '-IH20'), reversed_sides=True)
+
+    assert parsed[0].left_storage.serial_number == "811111"
+    assert parsed[0].left_storage.instance == "-IH10"
+    assert parsed[0].right_storage.status == "SSWS"
+    assert parsed[0].right_storage.instance == "-IH20"
+
+
+def test_planner_picks_operation_per_group_state(gad, pairdisplay_text):
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text)
+    steps = gad.FailoverPlanner(controller_with(gad, pairs)).plan('VSP2', 'planned', [])
+
+    operations = {step.group: step.operation for step in steps}
+    assert operations == {'HDID': 'skip', 'HDID2': 'swap', 'HDID3': 'blocked'}
+    swap = next(step for step in steps if step.group == 'HDID2')
+    assert swap.commands == ["pairresync -g HDID2 -swaps -IH20"]
+    assert swap.verify_command == "pairdisplay -g HDID2 -CLI -IH20"
+
+
+def test_swap_to_secondary_is_verified_with_sides_in_place(gad, pairdisplay_text):
+    pairs = pair_group(gad.PairdisplayParser().parse(pairdisplay_text), 'HDID2')
+    steps = gad.FailoverPlanner(controller_with(gad, pairs)).plan('VSP2', 'planned', [])
+    orchestrator = gad.FailoverOrchestrator(gad.FakeCCI(pairs), verify_timeout=2, verify_interval=0.01)
+
+    assert orchestrator.execute(steps)
+
+    verified = steps[0].verified_pairs
+    assert steps[0].status == "done"
+    assert verified[0].left_storage.serial_number == "811111"
+    assert verified[0].right_storage.serial_number == "822222"
+    assert verified[0].right_storage.role == "P-VOL"
+
+
+def test_emergency_split_to_primary(gad, pairdisplay_text):
+    pairs = pair_group(gad.PairdisplayParser().parse(pairdisplay_text), 'HDID2')
+    steps = gad.FailoverPlanner(controller_with(gad, pairs)).plan('VSP2', 'emergency', [])
+    fake = gad.FakeCCI(pairs)
+
+    assert gad.FailoverOrchestrator(fake, verify_timeout=2, verify_interval=0.01).execute(steps)
+
+    assert steps[0].operation == "split"
+    assert "pairsplit -g HDID2 -RS -IH20" in fake.history
+    assert steps[0].verified_pairs[0].right_storage.status == "SSWS"
+
+
+def test_failed_stage_cancels_later_stages(gad, pairdisplay_text):
+    parsed = gad.PairdisplayParser().parse(pairdisplay_text)
+    second = gad.GADPair(group="OTHER", name="OTHER_1",
+                         left_storage=gad.StorageSystem(**vars(parsed[1].left_storage)),
+                         right_storage=gad.StorageSystem(**vars(parsed[1].right_storage)))
+    pairs = [parsed[1], second]
+    steps = gad.FailoverPlanner(controller_with(gad, pairs)).plan('VSP2', 'planned', [['HDID2'], ['OTHER']])
+    progress = []
+
+    result = gad.FailoverOrchestrator(gad.FakeCCI(pairs, fail_groups={'HDID2'}),
+                                      verify_timeout=2, verify_interval=0.01).execute(
+        steps, lambda row, status, message: progress.append((steps[row].group, status)))
+
+    assert not result
+    assert steps[0].status == "failed" and "EX_CMDRJE" in steps[0].message
+    assert steps[1].status == "cancelled"
+    assert ('OTHER', 'running') not in progress
+
+
+def test_cancel_stops_verification(gad, pairdisplay_text):
+    pairs = pair_group(gad.PairdisplayParser().parse(pairdisplay_text), 'HDID2')
+    steps = gad.FailoverPlanner(controller_with(gad, pairs)).plan('VSP2', 'planned', [])
+    orchestrator = gad.FailoverOrchestrator(gad.FakeCCI(pairs), verify_timeout=30, verify_interval=0.01)
+
+    def cancel_on_verify(row, status, message):
+        if status == "verifying":
+            orchestrator.cancel()
+
+    # Tuščia pairdisplay išvestis: patikrinimas laukia, kol bus atšauktas
+    fake_run = orchestrator.runner.run
+    orchestrator.runner.run = lambda command: (0, "") if command.startswith("pairdisplay") else fake_run(command)
+
+    assert not orchestrator.execute(steps, cancel_on_verify)
+    assert steps[0].status == "cancelled"
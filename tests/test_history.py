@@ -0,0 +1,48 @@
+def test_site_ids_do_not_collide_after_sanitizing(gad):
+    first = gad.SiteConnection(host="DC 1")
+    second = gad.SiteConnection(host="DC_1")
+
+    assert first.site_id != second.site_id
+    assert gad.SiteConnection(host="DC 1").site_id == first.site_id
+    assert gad.SiteConnection(host="DC 1", primary_instance=11, secondary_instance=21).site_id != first.site_id
+
+
+def test_snapshot_store_starts_each_series_with_state_at_since(gad, tmp_path):
+    store = gad.SnapshotStore(str(tmp_path / "site.log"))
+    store.append([(100, "G/A", "L", "COPY", 10),
+                  (200, "G/A", "L", "PAIR", 100),
+                  (150, "G/B", "L", "PSUS", -1)])
+
+    series = store.load({"G/A"}, since=150)
+
+    assert store.known_pairs() == ["G/A", "G/B"]
+    assert series == {"G/A:L": [(150, "COPY", 10), (200, "PAIR", 100)]}
+
+
+def test_pair_series_grows_lazily_and_keeps_the_newest_points(gad):
+    series = gad.PairSeries(capacity=6)
+    assert len(series.times) == gad.PairSeries.INITIAL_SIZE
+
+    for step in range(10):
+        series.append(float(step), step * 10, "COPY")
+
+    assert len(series.times) == 6
+    assert len(series) == 6
+    assert [point[0] for point in series] == [4.0, 5.0, 6.0, 7.0, 8.0, 9.0]
+    assert series.last()[:2] == (9.0, 90)
+
+
+def test_pair_history_records_only_changes_and_forgets_removed_pairs(gad, pairdisplay_text):
+    history = gad.PairHistory()
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text)
+
+    first = history.record(pairs, timestamp=100)
+    again = history.record(pairs, timestamp=110)
+    pairs[2].left_storage.copy_percent = 57
+    moved = history.record(pairs[1:], timestamp=120)
+
+    assert len(first) == 6
+    assert again == []
+    assert moved == [(120, 'HDID3/GAD_TEST_HA3', 'L', 'COPY', 57)]
+    assert history.get(pairs[0], 'L') is None
+    assert len(history.get(pairs[2], 'L')) == 2
@@ -0,0 +1,176 @@
+import io
+import os
+
+import pytest
+
+VSP1 = {'serial': '811111', 'ip': '10.0.0.1', 'cmd_ldevs': ''}
+VSP2 = {'serial': '822222', 'ip': '10.0.0.2', 'cmd_ldevs': ''}
+LUNS = [{'group': 'APP', 'name': 'app_{n:02}', 'ldev': '00:10-00:13'},
+        {'group': 'DB', 'name': 'db', 'ldev': '00:20'}]
+
+
+def test_save_confs_writes_every_instance_file(gad, tmp_path):
+    count, names = gad.HORCMConfigGenerator().save_confs(str(tmp_path), '10.0.0.9', VSP1, VSP2, LUNS)
+
+    assert count == 5
+    assert sorted(os.listdir(tmp_path)) == sorted(names) == ['horcm10.conf', 'horcm20.conf']
+    assert 'APP    app_01' in (tmp_path / 'horcm10.conf').read_text()
+
+
+def test_save_confs_restores_previous_set_when_a_replace_fails(gad, tmp_path, monkeypatch):
+    for name in ('horcm10.conf', 'horcm20.conf'):
+        (tmp_path / name).write_text(f"old {name}\n")
+    real_replace = os.replace
+
+    def failing_replace(source, target):
+        if target.endswith('horcm20.conf'):
+            raise OSError("disk full")
+        real_replace(source, target)
+
+    monkeypatch.setattr(os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        gad.HORCMConfigGenerator().save_confs(str(tmp_path), '10.0.0.9', VSP1, VSP2, LUNS)
+
+    monkeypatch.setattr(os, 'replace', real_replace)
+    assert sorted(os.listdir(tmp_path)) == ['horcm10.conf', 'horcm20.conf']
+    assert (tmp_path / 'horcm10.conf').read_text() == "old horcm10.conf\n"
+    assert (tmp_path / 'horcm20.conf').read_text() == "old horcm20.conf\n"
+
+
+def test_stale_file_names_lists_instances_no_longer_generated(gad, tmp_path):
+    generator = gad.HORCMConfigGenerator()
+    _, wide = generator.save_confs(str(tmp_path), '10.0.0.9', VSP1, VSP2, LUNS, shards=2)
+    _, narrow = generator.save_confs(str(tmp_path), '10.0.0.9', VSP1, VSP2, LUNS, shards=1)
+
+    assert sorted(wide) == ['horcm10.conf', 'horcm11.conf', 'horcm20.conf', 'horcm21.conf']
+    assert gad.HORCMShardPlan.stale_file_names(str(tmp_path), narrow) == ['horcm11.conf', 'horcm21.conf']
+
+
+CONF = """\
+HORCM_MON
+10.0.0.9    5010    1000    3000
+
+HORCM_CMD
+\\\\.\\CMD-811111-100
+
+HORCM_LDEV
+APP    app_01    811111    00:1A    h0
+APP    app_02    811111    0x1A3F
+DB     db        811111    300
+
+HORCM_INSTP
+APP    10.0.0.9    5020    1
+"""
+
+
+def test_conf_parser_reads_instp_and_keeps_ldev_text(gad):
+    conf = gad.HORCMConfParser().parse(CONF, "/etc/horcm10.conf")
+
+    assert conf.instance == 10
+    assert conf.errors == []
+    assert conf.mon['poll'] == '1000'
+    assert conf.cmd_ldevs() == [100]
+    assert [(device.ldev, device.ldev_text, device.mu) for device in conf.devices] == [
+        (0x1A, '00:1A', 'h0'), (0x1A3F, '1A:3F', ''), (300, '300', '')]
+    assert conf.inst == [('APP', '10.0.0.9', '5020')]
+
+
+def test_conf_settings_follow_mon_cmd_and_mu(gad):
+    text = CONF.replace("5010    1000    3000", "5110    1500    4500").replace("CMD-811111-100", "CMD-811111-100:/dev/sd")
+    settings = gad.HORCMConfParser().parse(text, "/etc/horcm10.conf").settings()
+
+    assert (settings.poll, settings.timeout, settings.service_base) == (1500, 4500, 5100)
+    assert (settings.mu, settings.cmd_syntax) == ('h0', 'linux')
+
+
+def test_bound_template_functions_are_not_cached_per_value(gad):
+    template = gad.HORCMTemplate.compile(gad.HORCMConfigGenerator.LDEV_TEMPLATE)
+    cached = len(gad.HORCMTemplate._cache)
+
+    for serial in ('811111', '822222', '833333'):
+        render = template.bind(serial=serial, mu="    h0").function("group", "device", "ldev")
+        assert render("APP", "app_{1}", "00:1A").split() == ["APP", "app_{1}", serial, "00:1A", "h0"]
+
+    assert len(gad.HORCMTemplate._cache) == cached
+
+
+def test_ldev_spec_parses_decimal_and_cu_ldev_ranges(gad):
+    decimal = gad.LDEVSpec("52735-52737")
+    cu = gad.LDEVSpec("0x00:0xFE-01:01")
+
+    assert [number for _, number in decimal] == [52735, 52736, 52737]
+    assert (cu.start, cu.stop, len(cu)) == (0xFE, 0x101, 4)
+    assert [cu.format(number) for _, number in cu] == ['00:FE', '00:FF', '01:00', '01:01']
+    for text in ("10-00:20", "20-10", "70000", "abc"):
+        with pytest.raises(ValueError):
+            gad.LDEVSpec(text)
+
+
+def test_validator_reports_every_problem_with_its_row(gad):
+    rows = [{'group': 'APP', 'name': 'app_{n}', 'ldev': '10-12'},
+            {'group': 'app', 'name': 'other', 'ldev': '11'},
+            {'group': '', 'name': '', 'ldev': ''},
+            {'group': 'APP', 'name': 'app_1', 'ldev': '20'},
+            {'group': 'DB', 'name': 'bad name', 'ldev': '30'}]
+    bad_vsp2 = dict(VSP2, serial='811111')
+
+    issues = gad.HORCMInputValidator().validate('10.0.0.300', VSP1, bad_vsp2, rows)
+
+    assert issues[0] == "HORCM server: invalid IP address format: 10.0.0.300"
+    assert any(issue.startswith("VSP1 and VSP2 have the same serial number") for issue in issues)
+    assert "Row 2: group 'app' differs only by case from 'APP' in row 1" in issues
+    assert "Row 2: LDEV 11 already used in row 1" in issues
+    assert "Row 4: device name 'app_1' already used in group 'APP' (row 1)" in issues
+    assert any(issue.startswith("Row 5: Device name 'bad name'") for issue in issues)
+    assert not any(issue.startswith("Row 3") for issue in issues)
+
+
+def test_shard_plan_balances_groups_by_ldev_count(gad):
+    luns = [{'group': 'BIG', 'name': 'b_{n}', 'ldev': '1-100'},
+            {'group': 'MID', 'name': 'm_{n}', 'ldev': '200-259'},
+            {'group': 'SMALL', 'name': 's_{n}', 'ldev': '300-339'}]
+
+    plan = gad.HORCMShardPlan(luns, shards=2, cmd_per_instance=2, cmd_ldevs=([900, 901, 902], []))
+
+    assert (plan.shard_of('BIG'), plan.shard_of('MID'), plan.shard_of('SMALL')) == (0, 1, 1)
+    assert plan.loads == [100, 100]
+    assert plan.instances(1) == (11, 21)
+    assert plan.cmd_devices(0, 0) == [900, 901]
+    assert plan.cmd_devices(1, 0) == [902, 900]
+    assert plan.cmd_devices(1, 1) == [200]
+    assert gad.HORCMShardPlan(luns[:1], shards=4).shards == 1
+    with pytest.raises(ValueError):
+        gad.HORCMShardPlan(luns, shards=0)
+
+
+def test_write_confs_splits_groups_over_instance_files(gad):
+    generator = gad.HORCMConfigGenerator()
+    luns = LUNS + [{'group': 'WEB', 'name': 'web_{n}', 'ldev': '00:30-00:35'}]
+    plan = generator.plan_shards(luns, VSP1, VSP2, shards=2)
+    sinks = {name: io.StringIO() for name in plan.all_file_names()}
+
+    count = generator.write_confs('10.0.0.9', VSP1, VSP2, luns, plan, sinks)
+
+    assert count == 11
+    horcm10, horcm11 = sinks['horcm10.conf'].getvalue(), sinks['horcm11.conf'].getvalue()
+    assert 'WEB    web_1    811111    00:30' in horcm10 and 'APP' not in horcm10
+    assert 'APP    app_04    811111    00:13' in horcm11 and 'DB    db    811111    00:20' in horcm11
+    assert 'WEB    web_1    822222    00:30' in sinks['horcm20.conf'].getvalue()
+    assert 'HORCM_INST' in horcm11 and '10.0.0.9    5021' in horcm11
+
+
+def test_cross_check_reports_unpaired_missing_and_mismatched_devices(gad, pairdisplay_text):
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text)
+    luns = [{'group': 'HDID', 'name': 'GAD_TEST_HA', 'ldev': '6001'},
+            {'group': 'HDID2', 'name': 'renamed', 'ldev': '6002'},
+            {'group': 'NEW', 'name': 'new', 'ldev': '7000'}]
+    checker = gad.HORCMPairCrossCheck(gad.HORCMConfigGenerator())
+
+    results = checker.run(luns, ('811111', '822222'), pairs)
+
+    assert checker.device_count == 3
+    assert [(kind, ldev, pair_id, detail) for kind, _, ldev, _, pair_id, detail in results] == [
+        (checker.MISMATCH, '6002', 'HDID2/GAD_TEST_HA2', 'name differs'),
+        (checker.NOT_PAIRED, '7000', '', 'LDEV not found in any pair on either array'),
+        (checker.NOT_CONFIGURED, '6003', 'HDID3/GAD_TEST_HA3', 'COPY/COPY'),
+    ]
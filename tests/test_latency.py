@@ -0,0 +1,75 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SlowRunner:
+    def __init__(self, delay):
+        self.delay = delay
+        self.commands = []
+        self.lock = threading.Lock()
+
+    def run(self, command):
+        with self.lock:
+            self.commands.append(command)
+        time.sleep(self.delay)
+        return (1, "timeout") if "-r" in command else (0, "")
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_probe_records_failures_and_finishes(gad, qapp):
+    runner = SlowRunner(0)
+    services = gad.SharedServices()
+    probe = gad.CCILatencyProbe(runner, [(10, "APP"), (20, "APP")], samples=3, executor=services.probe_executor)
+    finished = []
+    probe.probe_finished.connect(lambda: finished.append(True), gad.Qt.DirectConnection)
+
+    probe.start()
+
+    assert wait_for(lambda: finished)
+    services.shutdown()
+    assert services.probe_executor._max_workers == 4
+    assert {instance: (h.count, h.failures) for instance, h in probe.histograms.items()} == {10: (3, 3), 20: (3, 3)}
+
+
+def test_cancel_drops_queued_instances(gad, qapp):
+    runner = SlowRunner(0.05)
+    targets = [(10 + shard, "APP") for shard in range(8)]
+    executor = ThreadPoolExecutor(max_workers=4)
+    probe = gad.CCILatencyProbe(runner, targets, samples=50, executor=executor)
+
+    probe.start()
+    assert wait_for(lambda: runner.commands)
+    probe.cancel()
+    time.sleep(0.2)
+    count = len(runner.commands)
+    time.sleep(0.2)
+
+    executor.shutdown()
+    assert len(runner.commands) == count
+    assert {command.split()[-1] for command in runner.commands} <= {f"-IH{10 + shard}" for shard in range(4)}
+
+
+def test_advisor_recommends_from_percentiles(gad):
+    histogram = gad.LatencyHistogram()
+    for elapsed_ms in [300] * 95 + [2000] * 5:
+        histogram.record(elapsed_ms)
+
+    assert 290 <= histogram.percentile(0.5) <= 310
+    assert histogram.percentile(0.99) == histogram.max == 2000
+    # poll = 20 x p50 ir timeout = 5 x p99 (10 ms vienetais), suapvalinti iki 100 ir apriboti
+    assert gad.MonTuningAdvisor().recommend(histogram) == {'poll': 700, 'timeout': 1000}
+
+
+def test_advisor_needs_enough_samples(gad):
+    histogram = gad.LatencyHistogram()
+    for _ in range(gad.MonTuningAdvisor.MIN_SAMPLES - 1):
+        histogram.record(20)
+
+    assert gad.MonTuningAdvisor().recommend(histogram) is None
@@ -0,0 +1,41 @@
+def test_parser_reads_both_sides_of_each_pair(gad, pairdisplay_text):
+    pairs = gad.PairdisplayParser().parse(pairdisplay_text, ('-IH11', '-IH21'))
+
+    assert [pair.pair_id for pair in pairs] == ['HDID/GAD_TEST_HA', 'HDID2/GAD_TEST_HA2', 'HDID3/GAD_TEST_HA3']
+    first = pairs[0]
+    assert (first.left_storage.serial_number, first.left_storage.role, first.left_storage.status) == \
+        ('811111', 'P-VOL', 'PSUS')
+    assert (first.right_storage.serial_number, first.right_storage.role, first.right_storage.status) == \
+        ('822222', 'S-VOL', 'SSWS')
+    assert (first.left_storage.instance, first.right_storage.instance) == ('-IH11', '-IH21')
+    assert [pair.ctg for pair in pairs] == [None, '3', '3']
+    assert pairs[2].left_storage.copy_percent == 42
+
+
+def test_parser_skips_deleted_pairs(gad, pairdisplay_text):
+    lines = pairdisplay_text.splitlines()
+    lines[1] = lines[1].replace("6001.P-VOL PSUS", "6001.SMPL ----")
+    lines[2] = lines[2].replace("6001.S-VOL SSWS", "6001.SMPL ----")
+
+    pairs = gad.PairdisplayParser().parse("\n".join(lines))
+
+    assert [pair.group for pair in pairs] == ['HDID2', 'HDID3']
+
+
+def test_format_pairs_round_trips(gad, pairdisplay_text):
+    parser = gad.PairdisplayParser()
+    pairs = parser.parse(pairdisplay_text)
+
+    assert parser.parse(parser.format_pairs(pairs)) == pairs
+
+
+def test_pair_index_matches_field_prefixes(gad, pairdisplay_text):
+    index = gad.PairIndex(gad.PairdisplayParser().parse(pairdisplay_text))
+
+    assert index.search("") is None
+    assert index.search("st:ssw") == [0]
+    assert index.search("g:HDID") == [0, 1, 2]
+    assert index.search("ctg:3 status:copy") == [2]
+    assert index.search("gad_test_ha2") == [1]
+    assert index.search("port:CL8-F-12 ldev:6003") == [2]
+    assert index.search("serial:9") == []